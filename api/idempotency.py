@@ -0,0 +1,143 @@
+"""
+Idempotency-Key support for POST endpoints that spend credits or payments.
+
+A client that retries a request with the same ``Idempotency-Key`` header gets
+the stored response back without the view (and its DAP / DCPE / facilitator
+calls) running again. Keys are scoped per user and per view, fingerprinted
+against the request, and kept in the shared cache for IDEMPOTENCY_KEY_TTL.
+
+Only 2xx responses are stored: a 402 payment challenge or an upstream error
+must stay retryable under the same key.
+
+Usage (function view or ViewSet method):
+
+    @api_view(['POST'])
+    @permission_classes([IsAuthenticated])
+    @idempotent()
+    def dap_deduct(request): ...
+"""
+import hashlib
+import json
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+# Response headers carried over on replay
+STORED_HEADERS = ('payment-response',)
+
+
+def _find_request(args):
+    """Return the request from (request, ...) or (self, request, ...)."""
+    for arg in args[:2]:
+        if hasattr(arg, 'META'):
+            return arg
+    return None
+
+
+def _fingerprint(request):
+    """Hash of method, path and body. Multipart bodies hash field values and file names/sizes."""
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(request.get_full_path().encode())
+
+    content_type = request.META.get('CONTENT_TYPE', '')
+    if content_type.startswith('multipart/'):
+        fields = sorted((k, v) for k, values in request.data.lists() for v in values if isinstance(v, str))
+        files = sorted((k, f.name, f.size) for k, values in request.FILES.lists() for f in values)
+        digest.update(json.dumps([fields, files]).encode())
+    else:
+        # Reading .body first caches it, so views can still json.loads(request.body)
+        digest.update(request.body or b'')
+    return digest.hexdigest()
+
+
+def _serialize_response(response):
+    entry = {
+        'status': response.status_code,
+        'headers': {h: response[h] for h in STORED_HEADERS if response.has_header(h)},
+    }
+    if isinstance(response, Response) and not getattr(response, 'is_rendered', True):
+        entry['data'] = response.data
+    else:
+        entry['content'] = bytes(response.content)
+        entry['content_type'] = response.get('Content-Type', 'application/json')
+    return entry
+
+
+def _replay_response(entry):
+    if 'data' in entry:
+        response = Response(entry['data'], status=entry['status'])
+    else:
+        response = HttpResponse(entry['content'], status=entry['status'], content_type=entry['content_type'])
+    for header, value in entry['headers'].items():
+        response[header] = value
+    response[REPLAYED_HEADER] = 'true'
+    return response
+
+
+def idempotent(ttl=None, lock_timeout=300):
+    """
+    Decorator adding Idempotency-Key replay to a view.
+
+    ttl: seconds a stored response is kept (default settings.IDEMPOTENCY_KEY_TTL)
+    lock_timeout: seconds a key stays locked while its first request runs
+    """
+    def decorator(view_func):
+        scope = f"{view_func.__module__}.{view_func.__qualname__}"
+
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            request = _find_request(args)
+            key = request.headers.get(IDEMPOTENCY_HEADER, '').strip() if request is not None else ''
+            if not key:
+                return view_func(*args, **kwargs)
+
+            if len(key) > MAX_KEY_LENGTH:
+                return JsonResponse({'error': f'{IDEMPOTENCY_HEADER} is too long'}, status=400)
+
+            user_part = request.user.pk if request.user.is_authenticated else 'anon'
+            key_hash = hashlib.sha256(f"{scope}:{user_part}:{key}".encode()).hexdigest()
+            cache_key = f"idempotency:{key_hash}"
+            lock_key = f"{cache_key}:lock"
+            fingerprint = _fingerprint(request)
+
+            stored = cache.get(cache_key)
+            if stored is not None:
+                if stored['fingerprint'] != fingerprint:
+                    return JsonResponse(
+                        {'error': f'{IDEMPOTENCY_HEADER} was already used for a different request'},
+                        status=422,
+                    )
+                return _replay_response(stored['response'])
+
+            if not cache.add(lock_key, 1, timeout=lock_timeout):
+                return JsonResponse(
+                    {'error': f'A request with this {IDEMPOTENCY_HEADER} is already in progress'},
+                    status=409,
+                )
+
+            try:
+                response = view_func(*args, **kwargs)
+                if 200 <= response.status_code < 300:
+                    try:
+                        cache.set(
+                            cache_key,
+                            {'fingerprint': fingerprint, 'response': _serialize_response(response)},
+                            timeout=ttl or settings.IDEMPOTENCY_KEY_TTL,
+                        )
+                    except Exception as e:
+                        logger.warning(f"[idempotency] failed to store response for {scope}: {e}")
+                return response
+            finally:
+                cache.delete(lock_key)
+        return wrapper
+    return decorator
@@ -0,0 +1,150 @@
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.pagination import BasePagination, Cursor, CursorPagination, PageNumberPagination
+from rest_framework.utils.encoders import JSONEncoder
+
+# ?pagination=legacy (or any ?page=N) keeps an endpoint's pre-cursor behaviour
+LEGACY_PAGINATION_PARAM = 'pagination'
+# Hard ceiling on ?page_size= for every paginator here
+MAX_PAGE_SIZE = 100
+# ?export=json streams the whole result set instead of one page
+EXPORT_PARAM = 'export'
+EXPORT_CHUNK_SIZE = 500
+
+
+class BoundedPageNumberPagination(PageNumberPagination):
+    """Default paginator: PAGE_SIZE rows, ?page_size= up to MAX_PAGE_SIZE."""
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Newest-first cursor pagination on (created_at, id).
+
+    Pages are found with a created_at comparison on an indexed column instead
+    of OFFSET, so deep pages cost the same as the first and rows inserted
+    while a client scrolls do not shift what it sees.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+    ordering = ('-created_at', '-id')
+
+    def get_ordering(self, request, queryset, view):
+        # Fixed so every page is an index range scan; ?ordering= does not apply
+        return self.ordering
+
+    def next_link_after(self, url, items):
+        """
+        Cursor link into ``url`` for the rows that follow ``items``, which must
+        already be in this ordering (e.g. a preview rendered without the
+        paginator).
+        """
+        self.base_url = url
+        # Same marker rule as get_next_link(): the last position that differs
+        # from the final item's, with an offset past the rows that tie with it
+        last = self._get_position_from_instance(items[-1], self.ordering)
+        position, offset = None, 0
+        for item in reversed(items):
+            current = self._get_position_from_instance(item, self.ordering)
+            if current != last:
+                position = current
+                break
+            offset += 1
+        return self.encode_cursor(Cursor(offset=offset, reverse=False, position=position))
+
+
+class KeysetPagination(BasePagination):
+    """
+    CreatedAtCursorPagination by default, with an opt-out for existing clients.
+
+    Requests with ?pagination=legacy or ?page=N get ``legacy_class`` instead:
+    page numbers for endpoints that were page-numbered, or None for actions
+    that used to return the whole list unpaginated.
+    """
+    cursor_class = CreatedAtCursorPagination
+    legacy_class = BoundedPageNumberPagination
+
+    def __init__(self):
+        self.paginator = None
+
+    def wants_legacy(self, request):
+        return (
+            request.query_params.get(LEGACY_PAGINATION_PARAM) == 'legacy'
+            or 'page' in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        paginator_class = self.legacy_class if self.wants_legacy(request) else self.cursor_class
+        if paginator_class is None:
+            return None
+        self.paginator = paginator_class()
+        return self.paginator.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.cursor_class().get_paginated_response_schema(schema)
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+
+class KeysetOrListPagination(KeysetPagination):
+    """KeysetPagination whose legacy mode is the full, unpaginated list."""
+    legacy_class = None
+
+
+def wants_export(request):
+    return request.query_params.get(EXPORT_PARAM) == 'json'
+
+
+def stream_json(queryset, serializer_class, context=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    StreamingHttpResponse rendering all of ``queryset`` as one JSON array.
+
+    Rows are read with a server-side iterator and serialized ``chunk_size``
+    at a time, so memory stays flat however large the export is. List
+    serializers that batch per call (prefetches, viewer state) batch per
+    chunk.
+    """
+    def encode(batch):
+        data = serializer_class(batch, many=True, context=context or {}).data
+        return ','.join(json.dumps(row, cls=JSONEncoder) for row in data)
+
+    def chunks():
+        yield '['
+        batch, first = [], True
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            batch.append(obj)
+            if len(batch) == chunk_size:
+                yield ('' if first else ',') + encode(batch)
+                batch, first = [], False
+        if batch:
+            yield ('' if first else ',') + encode(batch)
+        yield ']'
+
+    return StreamingHttpResponse(chunks(), content_type='application/json')
+
+
+def paginated_response(view, queryset, serializer_class=None, exportable=False):
+    """
+    Response for a list-style custom action: one page through the view's
+    paginator (never more than MAX_PAGE_SIZE rows), or, when ``exportable``
+    and the request asks for ?export=json, the whole queryset streamed.
+    """
+    serializer_class = serializer_class or view.get_serializer_class()
+    context = view.get_serializer_context()
+    if exportable and wants_export(view.request):
+        return stream_json(queryset, serializer_class, context)
+
+    paginator = view.paginator or BoundedPageNumberPagination()
+    page = paginator.paginate_queryset(queryset, view.request, view=view)
+    return paginator.get_paginated_response(serializer_class(page, many=True, context=context).data)
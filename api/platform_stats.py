@@ -0,0 +1,140 @@
+"""
+Platform overview numbers for the admin dashboards, as a cached snapshot.
+
+    GET /api/users/admin-stats/          snapshot['users']
+    GET /api/communities/admin_stats/    snapshot['communities']
+
+Both read only the snapshot in the shared cache. api.tasks.refresh_platform_stats
+recomputes it every minute via Celery Beat; a cold cache (first deploy, beat
+down for longer than SNAPSHOT_TTL) is filled inline on the next read.
+
+Each table is counted once, with its role / date / status buckets folded in
+as conditional aggregates. On Postgres, plain totals of tables whose planner
+estimate exceeds PLATFORM_STATS_ESTIMATE_ABOVE rows come from
+pg_class.reltuples instead of a COUNT(*); those keys are listed under
+``estimated`` so the dashboard can mark them as approximate.
+"""
+import os
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Q
+from django.utils import timezone
+
+SNAPSHOT_CACHE_KEY = 'platform_stats:snapshot'
+SNAPSHOT_TTL = 5 * 60
+# 0 disables estimates
+PLATFORM_STATS_ESTIMATE_ABOVE = lambda: int(os.environ.get('PLATFORM_STATS_ESTIMATE_ABOVE', 0))
+
+
+def _estimates(models):
+    """{model: reltuples} for ``models`` whose estimate is over the threshold (Postgres only)."""
+    threshold = PLATFORM_STATS_ESTIMATE_ABOVE()
+    if not threshold or connection.vendor != 'postgresql':
+        return {}
+    by_table = {model._meta.db_table: model for model in models}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT relname, reltuples FROM pg_class WHERE relname = ANY(%s)', [list(by_table)]
+        )
+        rows = cursor.fetchall()
+    return {by_table[name]: int(estimate) for name, estimate in rows if estimate >= threshold}
+
+
+def _totals(models, estimated):
+    """COUNT(*) per model, or its reltuples estimate when one is over the threshold."""
+    estimates = _estimates(models)
+    totals = {}
+    for model in models:
+        if model in estimates:
+            totals[model] = estimates[model]
+            estimated.append(model._meta.db_table)
+        else:
+            totals[model] = model.objects.count()
+    return totals
+
+
+def compute_snapshot():
+    from django.contrib.auth import get_user_model
+    from api.models import Feedback
+    from communities.models import Community, Membership
+    from events.models import Event
+    from news.models import News
+    from shows.models import Show
+    from users.models import Like, Comment, Follow
+    from users.serializers import UserListSerializer
+
+    User = get_user_model()
+    now = timezone.now()
+    seven_days_ago = now - timedelta(days=7)
+    thirty_days_ago = now - timedelta(days=30)
+    estimated = []
+
+    users = User.objects.aggregate(
+        total=Count('pk'),
+        creators=Count('pk', filter=Q(role='creator')),
+        regular=Count('pk', filter=Q(role='user')),
+        new_7d=Count('pk', filter=Q(date_joined__gte=seven_days_ago)),
+        new_30d=Count('pk', filter=Q(date_joined__gte=thirty_days_ago)),
+    )
+    feedback = Feedback.objects.aggregate(
+        total=Count('pk'), unresolved=Count('pk', filter=Q(resolved=False)),
+    )
+    communities = Community.objects.aggregate(
+        total=Count('pk'), this_week=Count('pk', filter=Q(created_at__gte=seven_days_ago)),
+    )
+    totals = _totals([Show, Event, News, Like, Comment, Follow, Membership], estimated)
+
+    most_active = (
+        Community.objects
+        .annotate(post_count=Count('posts', distinct=True))
+        .order_by('-post_count')
+        .values('name', 'slug', 'post_count')
+        .first()
+    )
+    recent_users = list(UserListSerializer(User.objects.order_by('-date_joined')[:10], many=True).data)
+
+    return {
+        'generated_at': now.isoformat(),
+        'estimated': estimated,
+        'users': {
+            'overview': {
+                'total_users': users['total'],
+                'total_creators': users['creators'],
+                'total_regular_users': users['regular'],
+                'total_shows': totals[Show],
+                'total_events': totals[Event],
+                'total_news': totals[News],
+            },
+            'activity': {
+                'new_users_7d': users['new_7d'],
+                'new_users_30d': users['new_30d'],
+                'total_likes': totals[Like],
+                'total_comments': totals[Comment],
+                'total_follows': totals[Follow],
+            },
+            'feedback': {
+                'total': feedback['total'],
+                'unresolved': feedback['unresolved'],
+            },
+            'recent_users': recent_users,
+        },
+        'communities': {
+            'total_communities': communities['total'],
+            'total_memberships': totals[Membership],
+            'communities_this_week': communities['this_week'],
+            'most_active': most_active if most_active and most_active['post_count'] > 0 else None,
+        },
+    }
+
+
+def refresh_snapshot():
+    snapshot = compute_snapshot()
+    cache.set(SNAPSHOT_CACHE_KEY, snapshot, SNAPSHOT_TTL)
+    return snapshot
+
+
+def get_snapshot():
+    """The cached snapshot, computed inline only when the cache is cold."""
+    return cache.get(SNAPSHOT_CACHE_KEY) or refresh_snapshot()
@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from .platform_stats import refresh_snapshot
+
+
+@shared_task
+def refresh_platform_stats():
+    """
+    Recompute the admin dashboard snapshot (api.platform_stats).
+    Runs every minute via Celery Beat.
+    """
+    refresh_snapshot()
@@ -1,3 +1,182 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from users.models import User
+
+
+class IdempotencyKeyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='alice', stacks_address='SP000ALICE')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.body = {'stacks_address': 'SP000ALICE', 'amount': 5, 'service_name': 'test'}
+
+    def _deduct(self, key, body=None):
+        return self.client.post(
+            '/api/dap/deduct/', body or self.body, format='json', HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    @mock.patch('api.views_ops.http_requests.post')
+    def test_retry_replays_stored_response(self, post):
+        post.return_value = mock.Mock(status_code=200, json=lambda: {'new_balance': 95})
+
+        first = self._deduct('k1')
+        second = self._deduct('k1')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), {'new_balance': 95})
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(post.call_count, 1)
+
+    @mock.patch('api.views_ops.http_requests.post')
+    def test_reused_key_with_different_body_is_rejected(self, post):
+        post.return_value = mock.Mock(status_code=200, json=lambda: {'new_balance': 95})
+
+        self._deduct('k2')
+        response = self._deduct('k2', {**self.body, 'amount': 50})
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(post.call_count, 1)
+
+    @mock.patch('api.views_ops.http_requests.post')
+    def test_failed_response_is_not_stored(self, post):
+        post.return_value = mock.Mock(status_code=402, json=lambda: {'balance': 0})
+
+        self._deduct('k3')
+        self._deduct('k3')
+
+        self.assertEqual(post.call_count, 2)
+
+
+class ViewerStateTests(TestCase):
+    def setUp(self):
+        from shows.models import Show
+        from users.follows import follow_user
+        from users.models import Like
+
+        self.viewer = User.objects.create(username='viewer')
+        self.alice = User.objects.create(username='alice', role='creator')
+        self.bob = User.objects.create(username='bob', role='creator')
+        self.shows = {}
+        for i, creator in enumerate([self.alice, self.bob] * 3):
+            self.shows[i] = Show.objects.create(
+                title=f'Show {i}', slug=f'show-{i}', creator=creator, status='published'
+            )
+        Like.objects.create(user=self.viewer, content_object=self.shows[1])
+        follow_user(self.viewer, self.alice.pk)
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def _list(self, page_size):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get('/api/shows/', {'page_size': page_size})
+        self.assertEqual(resp.status_code, 200)
+        return {row['slug']: row for row in resp.data['results']}, len(ctx.captured_queries)
+
+    def test_flags_are_batched_per_page(self):
+        rows, small = self._list(2)
+        rows, large = self._list(6)
+        self.assertEqual(small, large)
+
+        self.assertTrue(rows['show-1']['user_has_liked'])
+        self.assertFalse(rows['show-0']['user_has_liked'])
+        self.assertTrue(rows['show-0']['user_is_following_owner'])
+        self.assertFalse(rows['show-1']['user_is_following_owner'])
+
+    def test_my_communities_batches_viewer_state(self):
+        from communities.models import Community, CommunityFollow, Membership
+
+        def my_communities():
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get('/api/communities/my_communities/')
+            self.assertEqual(resp.status_code, 200)
+            return {row['community']['slug']: row['community'] for row in resp.data}, len(ctx.captured_queries)
+
+        def join(i):
+            community = Community.objects.create(name=f'C{i}', slug=f'c-{i}', created_by=self.alice)
+            Membership.objects.create(user=self.viewer, community=community, role='member')
+            return community
+
+        CommunityFollow.objects.create(user=self.viewer, community=join(0))
+        _, one = my_communities()
+        join(1), join(2)
+        rows, three = my_communities()
+        self.assertEqual(one, three)
+        self.assertEqual(rows['c-0']['user_membership']['role'], 'member')
+        self.assertTrue(rows['c-0']['user_is_following'])
+        self.assertFalse(rows['c-2']['user_is_following'])
+
+    def test_anonymous_viewer_gets_defaults(self):
+        self.client.force_authenticate(None)
+        with CaptureQueriesContext(connection) as ctx:
+            rows = self.client.get('/api/shows/').data['results']
+        self.assertFalse(any(row['user_has_liked'] or row['user_is_following_owner'] for row in rows))
+        self.assertFalse(any('users_like' in q['sql'] for q in ctx.captured_queries))
+
+    def test_community_membership_and_follow(self):
+        from communities.models import Community, CommunityFollow, Membership
+        from communities.serializers import CommunitySerializer
+        from rest_framework.test import APIRequestFactory
+
+        joined, followed = (
+            Community.objects.create(name=name, slug=name, created_by=self.alice)
+            for name in ('joined', 'followed')
+        )
+        membership = Membership.objects.create(user=self.viewer, community=joined, role='member')
+        CommunityFollow.objects.create(user=self.viewer, community=followed)
+
+        request = APIRequestFactory().get('/')
+        request.user = self.viewer
+        data = CommunitySerializer(
+            Community.objects.filter(pk__in=[joined.pk, followed.pk]).order_by('slug'),
+            many=True, context={'request': request},
+        ).data
+        followed_row, joined_row = data
+        self.assertEqual(joined_row['user_membership']['id'], membership.pk)
+        self.assertIsNone(followed_row['user_membership'])
+        self.assertTrue(followed_row['user_is_following'])
+        self.assertFalse(joined_row['user_is_following'])
+
+
+class PlatformStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create(username='admin', is_staff=True, role='creator')
+        User.objects.create(username='bob')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_dashboards_read_the_cached_snapshot(self):
+        from communities.models import Community
+
+        resp = self.client.get('/api/users/admin-stats/')
+        self.assertEqual(resp.data['overview']['total_users'], 2)
+        self.assertEqual(resp.data['overview']['total_creators'], 1)
+        self.assertEqual(resp.data['activity']['new_users_7d'], 2)
+        self.assertEqual(len(resp.data['recent_users']), 2)
+
+        User.objects.create(username='carol')
+        Community.objects.create(name='C', slug='c', created_by=self.admin)
+        with CaptureQueriesContext(connection) as ctx:
+            users = self.client.get('/api/users/admin-stats/').data
+            communities = self.client.get('/api/communities/admin_stats/').data
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(users['overview']['total_users'], 2)
+        self.assertEqual(communities['total_communities'], 0)
+
+    def test_beat_task_refreshes_snapshot(self):
+        from .tasks import refresh_platform_stats
 
-# Create your tests here.
+        self.client.get('/api/communities/admin_stats/')
+        User.objects.create(username='carol')
+        refresh_platform_stats()
+        resp = self.client.get('/api/users/admin-stats/')
+        self.assertEqual(resp.data['overview']['total_users'], 3)
+        self.assertEqual(resp.data['estimated'], [])
@@ -0,0 +1,127 @@
+"""
+Viewer-specific flags for list payloads, one query per relation per page.
+
+A serializer opts in by listing the relations it renders and using
+ViewerStateListSerializer as its list serializer:
+
+    class ShowListSerializer(serializers.ModelSerializer):
+        viewer_relations = (LIKED, FOLLOWING_OWNER)
+        viewer_owner_field = 'creator_id'
+        user_has_liked = ViewerStateField(LIKED)
+        ...
+        class Meta:
+            list_serializer_class = ViewerStateListSerializer
+
+The list serializer fills ``obj._viewer_state`` for the whole page before any
+row is rendered; a lone object (retrieve, nested single use) is filled on
+first access with the same queries. Anonymous viewers cost no queries.
+
+Relations:
+    LIKED              the viewer has a users.Like on the object
+    FOLLOWING_OWNER    the viewer follows the object's owner (viewer_owner_field)
+    MEMBERSHIP         the viewer's communities.Membership, as {id, role, joined_at}
+    FOLLOWING          the viewer follows the community (communities.CommunityFollow)
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from rest_framework import serializers
+
+LIKED = 'liked'
+FOLLOWING_OWNER = 'following_owner'
+MEMBERSHIP = 'membership'
+FOLLOWING = 'following'
+
+DEFAULTS = {LIKED: False, FOLLOWING_OWNER: False, MEMBERSHIP: None, FOLLOWING: False}
+
+
+def viewer(context):
+    """The authenticated user in a serializer context, else None."""
+    user = getattr(context.get('request'), 'user', None)
+    return user if user is not None and user.is_authenticated else None
+
+
+def _liked(user, objs):
+    content_type = ContentType.objects.get_for_model(objs[0])
+    from users.models import Like
+    liked = set(Like.objects.filter(
+        user=user, content_type=content_type, object_id__in=[obj.pk for obj in objs]
+    ).values_list('object_id', flat=True))
+    return {obj.pk: obj.pk in liked for obj in objs}
+
+
+def _following_owner(user, objs, owner_field):
+    from users.models import Follow
+    owner_ids = {getattr(obj, owner_field) for obj in objs}
+    followed = set(Follow.objects.filter(
+        follower=user, following_id__in=owner_ids
+    ).values_list('following_id', flat=True))
+    return {obj.pk: getattr(obj, owner_field) in followed for obj in objs}
+
+
+def _membership(user, objs):
+    from communities.models import Membership
+    memberships = {
+        m['community_id']: {'id': m['id'], 'role': m['role'], 'joined_at': m['joined_at']}
+        for m in Membership.objects.filter(
+            user=user, community_id__in=[obj.pk for obj in objs]
+        ).values('id', 'community_id', 'role', 'joined_at')
+    }
+    return {obj.pk: memberships.get(obj.pk) for obj in objs}
+
+
+def _following(user, objs):
+    from communities.models import CommunityFollow
+    followed = set(CommunityFollow.objects.filter(
+        user=user, community_id__in=[obj.pk for obj in objs]
+    ).values_list('community_id', flat=True))
+    return {obj.pk: obj.pk in followed for obj in objs}
+
+
+def fill_viewer_state(objs, user, relations, owner_field=None):
+    """Set ``_viewer_state`` on every object in ``objs`` that lacks it."""
+    objs = [obj for obj in objs if not hasattr(obj, '_viewer_state')]
+    for obj in objs:
+        obj._viewer_state = {relation: DEFAULTS[relation] for relation in relations}
+    if not objs or user is None:
+        return
+
+    loaders = {
+        LIKED: lambda: _liked(user, objs),
+        FOLLOWING_OWNER: lambda: _following_owner(user, objs, owner_field),
+        MEMBERSHIP: lambda: _membership(user, objs),
+        FOLLOWING: lambda: _following(user, objs),
+    }
+    for relation in relations:
+        values = loaders[relation]()
+        for obj in objs:
+            obj._viewer_state[relation] = values[obj.pk]
+
+
+class ViewerStateListSerializer(serializers.ListSerializer):
+    """Fills the child's ``viewer_relations`` for the whole page up front."""
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        fill_viewer_state(
+            items, viewer(self.context),
+            self.child.viewer_relations, getattr(self.child, 'viewer_owner_field', None),
+        )
+        return super().to_representation(items)
+
+
+class ViewerStateField(serializers.Field):
+    """Read-only field rendering one relation from ``obj._viewer_state``."""
+
+    def __init__(self, relation, **kwargs):
+        self.relation = relation
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, obj):
+        if not hasattr(obj, '_viewer_state'):
+            fill_viewer_state(
+                [obj], viewer(self.context),
+                self.parent.viewer_relations, getattr(self.parent, 'viewer_owner_field', None),
+            )
+        return obj._viewer_state.get(self.relation, DEFAULTS[self.relation])
@@ -18,6 +18,7 @@ from django.core.cache import cache
 
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
+from api.idempotency import idempotent
 from api.throttles import PublicChatThrottle
 from users.permissions import production_staff_required
 
@@ -373,6 +374,7 @@ DCPE_UPLOAD_COST = 100  # DAP credits per video file
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent()
 def dcpe_creator_upload(request):
     """
     POST /ops/dcpe/upload/ — session-based file upload for Creator Studio.
@@ -869,6 +871,7 @@ def dap_balance(request, address):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent()
 def dap_deduct(request):
     """
     POST /api/dap/deduct/ — deduct DAP credits for a service.
@@ -909,6 +912,7 @@ def dap_deduct(request):
 
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
+@idempotent()
 def dap_grant(request):
     """
     POST /api/admin/dap/grant/ — admin mint DAP credits to a user.
@@ -994,6 +998,7 @@ def dap_grant(request):
 
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
+@idempotent()
 def admin_dap_deduct(request):
     """
     POST /api/admin/dap/deduct/ — admin deduct DAP credits from a user.
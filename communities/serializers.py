@@ -1,6 +1,10 @@
+from django.db import models
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Community, Membership, CommunityFollow
+from api.viewer_state import (
+    MEMBERSHIP, FOLLOWING, ViewerStateField, ViewerStateListSerializer, fill_viewer_state, viewer,
+)
 
 User = get_user_model()
 
@@ -22,40 +26,29 @@ class MembershipSerializer(serializers.ModelSerializer):
 
 
 class CommunitySerializer(serializers.ModelSerializer):
+    viewer_relations = (MEMBERSHIP, FOLLOWING)
     member_count = serializers.SerializerMethodField()
     founder = serializers.SerializerMethodField()
-    user_membership = serializers.SerializerMethodField()
-    user_is_following = serializers.SerializerMethodField()
+    user_membership = ViewerStateField(MEMBERSHIP)
+    user_is_following = ViewerStateField(FOLLOWING)
 
     def get_member_count(self, obj):
         # Prefer queryset annotation (list views), fall back to property
-        return getattr(obj, 'member_count_annotated', obj.member_count)
+        if hasattr(obj, 'member_count_annotated'):
+            return obj.member_count_annotated
+        return obj.member_count
 
     def get_founder(self, obj):
         # Prefer prefetched founder_memberships (retrieve/list), else single query
-        if hasattr(obj, 'founder_memberships') and obj.founder_memberships:
-            return UserSummarySerializer(obj.founder_memberships[0].user).data
+        if hasattr(obj, 'founder_memberships'):
+            if obj.founder_memberships:
+                return UserSummarySerializer(obj.founder_memberships[0].user).data
+            return UserSummarySerializer(obj.created_by).data
         membership = obj.memberships.filter(role='founder').select_related('user').first()
         if membership:
             return UserSummarySerializer(membership.user).data
         return UserSummarySerializer(obj.created_by).data
 
-    def get_user_membership(self, obj):
-        request = self.context.get('request')
-        if not request or not request.user.is_authenticated:
-            return None
-        try:
-            membership = Membership.objects.get(user=request.user, community=obj)
-            return {'id': membership.id, 'role': membership.role, 'joined_at': membership.joined_at}
-        except Membership.DoesNotExist:
-            return None
-
-    def get_user_is_following(self, obj):
-        request = self.context.get('request')
-        if not request or not request.user.is_authenticated:
-            return False
-        return CommunityFollow.objects.filter(user=request.user, community=obj).exists()
-
     class Meta:
         model = Community
         fields = [
@@ -65,6 +58,7 @@ class CommunitySerializer(serializers.ModelSerializer):
             'member_count', 'founder', 'user_membership', 'user_is_following',
         ]
         read_only_fields = ['id', 'slug', 'created_by', 'created_at', 'updated_at']
+        list_serializer_class = ViewerStateListSerializer
 
 
 class CommunityCreateSerializer(serializers.ModelSerializer):
@@ -77,6 +71,9 @@ class AdminCommunitySerializer(CommunitySerializer):
     """Extended serializer for staff admin views — adds post/show/event counts."""
     post_count = serializers.SerializerMethodField()
     show_count = serializers.SerializerMethodField()
+    user_membership = serializers.SerializerMethodField()
+    user_is_following = serializers.SerializerMethodField()
+    viewer_relations = ()
 
     def get_post_count(self, obj):
         return getattr(obj, 'post_count_annotated', 0)
@@ -95,14 +92,23 @@ class AdminCommunitySerializer(CommunitySerializer):
         fields = CommunitySerializer.Meta.fields + ['post_count', 'show_count']
 
 
+class MembershipListSerializer(serializers.ListSerializer):
+    """Fills the nested communities' viewer state for the whole list up front."""
+
+    def to_representation(self, data):
+        memberships = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        fill_viewer_state(
+            [m.community for m in memberships], viewer(self.context), CommunitySerializer.viewer_relations
+        )
+        return super().to_representation(memberships)
+
+
 class MembershipWithCommunitySerializer(serializers.ModelSerializer):
     """Used by my_communities — full nested community object."""
-    community = serializers.SerializerMethodField()
-
-    def get_community(self, obj):
-        return CommunitySerializer(obj.community, context=self.context).data
+    community = CommunitySerializer(read_only=True)
 
     class Meta:
         model = Membership
         fields = ['id', 'role', 'joined_at', 'community']
         read_only_fields = fields
+        list_serializer_class = MembershipListSerializer
@@ -86,18 +86,23 @@ class CommunityViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_communities(self, request):
         """GET /api/communities/my_communities/ — user's communities with membership roles"""
-        memberships = (
-            Membership.objects
-            .filter(user=request.user)
-            .select_related('community')
+        communities = (
+            Community.objects
+            .select_related('created_by')
+            .annotate(member_count_annotated=Count('memberships', distinct=True))
             .prefetch_related(
                 Prefetch(
-                    'community__memberships',
+                    'memberships',
                     queryset=Membership.objects.filter(role='founder').select_related('user'),
                     to_attr='founder_memberships'
                 )
             )
         )
+        memberships = (
+            Membership.objects
+            .filter(user=request.user)
+            .prefetch_related(Prefetch('community', queryset=communities))
+        )
         serializer = MembershipWithCommunitySerializer(
             memberships, many=True, context={'request': request}
         )
@@ -108,26 +113,9 @@ class CommunityViewSet(viewsets.ModelViewSet):
         """GET /api/communities/:slug/feed/ — community-scoped post feed"""
         from posts.models import Post
         from posts.serializers import PostSerializer
-        from django.db.models import Count as DCount, Exists, OuterRef
-        from users.models import Like
-        from django.contrib.contenttypes.models import ContentType
 
         community = self.get_object()
-        queryset = Post.objects.filter(community=community).select_related('author').annotate(
-            _like_count=DCount('likes', distinct=True),
-            _comment_count=DCount('comments', distinct=True),
-        )
-        if request.user.is_authenticated:
-            post_ct = ContentType.objects.get_for_model(Post)
-            queryset = queryset.annotate(
-                _user_has_liked=Exists(
-                    Like.objects.filter(
-                        user=request.user,
-                        content_type=post_ct,
-                        object_id=OuterRef('pk')
-                    )
-                )
-            )
+        queryset = Post.objects.filter(community=community).select_related('author')
         queryset = queryset.order_by('-created_at')
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -213,35 +201,10 @@ class CommunityViewSet(viewsets.ModelViewSet):
         if not request.user.is_staff:
             return Response({'error': 'Staff access required'}, status=status.HTTP_403_FORBIDDEN)
 
-        from django.utils import timezone
-        from datetime import timedelta
+        from api.platform_stats import get_snapshot
 
-        total_communities = Community.objects.count()
-        total_memberships = Membership.objects.count()
-        communities_this_week = Community.objects.filter(
-            created_at__gte=timezone.now() - timedelta(days=7)
-        ).count()
-
-        most_active = (
-            Community.objects
-            .annotate(post_count=Count('posts', distinct=True))
-            .order_by('-post_count')
-            .first()
-        )
-        most_active_data = None
-        if most_active and most_active.post_count > 0:
-            most_active_data = {
-                'name': most_active.name,
-                'slug': most_active.slug,
-                'post_count': most_active.post_count,
-            }
-
-        return Response({
-            'total_communities': total_communities,
-            'total_memberships': total_memberships,
-            'communities_this_week': communities_this_week,
-            'most_active': most_active_data,
-        })
+        snapshot = get_snapshot()
+        return Response(dict(snapshot['communities'], generated_at=snapshot['generated_at']))
 
 
 class MembershipViewSet(viewsets.ModelViewSet):
@@ -109,6 +109,28 @@ if os.environ.get('DATABASE_URL'):
     )
 
 
+# Cache
+# Default: per-process LocMemCache for local development
+# Production: set REDIS_URL so every worker shares nonces, idempotency keys, etc.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+if os.environ.get('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL'),
+    }
+
+# How long a stored Idempotency-Key response is replayed (seconds)
+IDEMPOTENCY_KEY_TTL = int(os.environ.get('IDEMPOTENCY_KEY_TTL', 24 * 3600))
+
+# Signed x402 receipt tokens (payments/receipts.py). Tokens for txs still in
+# the mempool are short-lived so a payment revoked by settlement stops working.
+X402_RECEIPT_TOKEN_TTL = int(os.environ.get('X402_RECEIPT_TOKEN_TTL', 30 * 24 * 3600))
+X402_PENDING_RECEIPT_TOKEN_TTL = int(os.environ.get('X402_PENDING_RECEIPT_TOKEN_TTL', 10 * 60))
+
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -176,13 +198,16 @@ CORS_ALLOW_CREDENTIALS = True
 CORS_EXPOSE_HEADERS = [
     'payment-required',
     'payment-response',
+    'idempotent-replayed',
 ]
 CORS_ALLOW_HEADERS = [
     # defaults
     'accept', 'accept-encoding', 'authorization', 'content-type',
     'dnt', 'origin', 'user-agent', 'x-csrftoken', 'x-requested-with',
     # x402 custom headers
-    'payment-signature', 'x-payment-token-type',
+    'payment-signature', 'x-payment-token-type', 'payment-receipt',
+    # retry-safe POSTs (api/idempotency.py)
+    'idempotency-key',
 ]
 
 # Stacks Network Configuration
@@ -206,13 +231,13 @@ if not DEBUG:
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.BoundedPageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'rest_framework.filters.SearchFilter',
@@ -249,6 +274,7 @@ SIMPLE_JWT = {
     
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+    'TOKEN_OBTAIN_SERIALIZER': 'users.authentication.UserTokenObtainPairSerializer',
 }
 
 # ---------------------------------------------------------------------------
@@ -293,8 +319,40 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'shows.tasks.auto_cancel_unconfirmed_shows',
         'schedule': crontab(minute='*/5'),
     },
-    'cleanup-old-notifications-daily': {
-        'task': 'shows.tasks.cleanup_old_notifications',
-        'schedule': crontab(hour=0, minute=0),
+    'drain-dap-rewards-every-minute': {
+        'task': 'users.tasks.drain_dap_rewards',
+        'schedule': crontab(minute='*'),
+    },
+    'settle-pending-payments-every-minute': {
+        'task': 'payments.tasks.settle_pending_payments',
+        'schedule': crontab(minute='*'),
+    },
+    'refresh-token-prices-every-minute': {
+        'task': 'payments.tasks.refresh_token_prices',
+        'schedule': crontab(minute='*'),
+    },
+    'deliver-notifications-every-minute': {
+        'task': 'users.tasks.deliver_notifications',
+        'schedule': crontab(minute='*'),
+    },
+    'refresh-platform-stats-every-minute': {
+        'task': 'api.tasks.refresh_platform_stats',
+        'schedule': crontab(minute='*'),
+    },
+    'reconcile-follow-counts-nightly': {
+        'task': 'users.tasks.reconcile_follow_counts',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'reconcile-creator-stats-nightly': {
+        'task': 'users.tasks.reconcile_creator_stats',
+        'schedule': crontab(hour=3, minute=15),
+    },
+    'reconcile-unread-counts-nightly': {
+        'task': 'users.tasks.reconcile_unread_counts',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'run-retention-nightly': {
+        'task': 'users.tasks.run_retention',
+        'schedule': crontab(hour=2, minute=0),
     },
 }
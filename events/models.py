@@ -108,6 +108,9 @@ class Event(models.Model):
     # Generic relations for likes and comments
     likes = GenericRelation('users.Like', related_query_name='event')
     comments = GenericRelation('users.Comment', related_query_name='event')
+    # Stored counters, kept in step by users.signals (update_counts recomputes them)
+    like_count = models.IntegerField(default=0)
+    comment_count = models.IntegerField(default=0)
     
     class Meta:
         ordering = ['start_datetime']
@@ -137,14 +140,6 @@ class Event(models.Model):
         
         super().save(*args, **kwargs)
     
-    @property
-    def like_count(self):
-        return self.likes.count()
-    
-    @property
-    def comment_count(self):
-        return self.comments.count()
-    
     @property
     def is_upcoming(self):
         """Check if event is in the future"""
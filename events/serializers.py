@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import Event
 from django.contrib.auth import get_user_model
+from api.viewer_state import LIKED, FOLLOWING_OWNER, ViewerStateField, ViewerStateListSerializer
 
 User = get_user_model()
 
@@ -15,14 +16,18 @@ class EventOrganizerSerializer(serializers.ModelSerializer):
 
 class EventSerializer(serializers.ModelSerializer):
     """Full event serializer"""
+    viewer_relations = (LIKED, FOLLOWING_OWNER)
+    viewer_owner_field = 'organizer_id'
     organizer = EventOrganizerSerializer(read_only=True)
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
+    like_count = serializers.IntegerField(read_only=True)
+    comment_count = serializers.IntegerField(read_only=True)
     status = serializers.CharField(read_only=True)
     is_upcoming = serializers.BooleanField(read_only=True)
     is_ongoing = serializers.BooleanField(read_only=True)
     is_past = serializers.BooleanField(read_only=True)
     schedule_display = serializers.SerializerMethodField()
+    user_has_liked = ViewerStateField(LIKED)
+    user_is_following_owner = ViewerStateField(FOLLOWING_OWNER)
     
     class Meta:
         model = Event
@@ -36,19 +41,10 @@ class EventSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at',
             'like_count', 'comment_count', 'share_count',
             'status', 'is_upcoming', 'is_ongoing', 'is_past',
-            'schedule_display'
+            'schedule_display', 'user_has_liked', 'user_is_following_owner',
         ]
         read_only_fields = ['organizer', 'created_at', 'updated_at']
-    
-    def get_like_count(self, obj):
-        """Get like count from annotation or property"""
-        # Use the renamed annotation to avoid conflict with model property
-        return getattr(obj, '_like_count', obj.like_count)
-    
-    def get_comment_count(self, obj):
-        """Get comment count from annotation or property"""
-        # Use the renamed annotation to avoid conflict with model property
-        return getattr(obj, '_comment_count', obj.comment_count)
+        list_serializer_class = ViewerStateListSerializer
     
     def validate(self, data):
         """Validate event dates"""
@@ -75,14 +71,13 @@ class EventSerializer(serializers.ModelSerializer):
 
 class EventListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for list views"""
+    viewer_relations = (LIKED, FOLLOWING_OWNER)
+    viewer_owner_field = 'organizer_id'
     organizer = EventOrganizerSerializer(read_only=True)
-    like_count = serializers.SerializerMethodField()
+    like_count = serializers.IntegerField(read_only=True)
     status = serializers.CharField(read_only=True)
-    
-    def get_like_count(self, obj):
-        """Get like count from annotation or property"""
-        # Use the renamed annotation to avoid conflict with model property
-        return getattr(obj, '_like_count', obj.like_count)
+    user_has_liked = ViewerStateField(LIKED)
+    user_is_following_owner = ViewerStateField(FOLLOWING_OWNER)
     
     class Meta:
         model = Event
@@ -91,9 +86,11 @@ class EventListSerializer(serializers.ModelSerializer):
             'start_datetime', 'end_datetime', 'venue_name',
             'is_virtual', 'is_public',
             'is_recurring', 'recurrence_type', 'day_of_week', 'scheduled_time',
-            'status', 'like_count', 'share_count'
+            'status', 'like_count', 'share_count',
+            'user_has_liked', 'user_is_following_owner',
         ]
         read_only_fields = fields
+        list_serializer_class = ViewerStateListSerializer
 
 
 class EventCreateUpdateSerializer(serializers.ModelSerializer):
@@ -2,13 +2,14 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
-from django.db.models import Count, Q
+from django.db.models import Q
 from django.utils import timezone
 from .models import Event
 from .serializers import (
     EventSerializer, EventListSerializer, EventCreateUpdateSerializer
 )
 from api.permissions import IsOwnerOrReadOnly
+from api.pagination import paginated_response
 from communities.mixins import CommunityWriteMixin
 
 
@@ -28,10 +29,7 @@ class EventViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
     - past: GET /api/events/past/
     - my_events: GET /api/events/my_events/
     """
-    queryset = Event.objects.select_related('organizer').annotate(
-        _like_count=Count('likes', distinct=True),
-        _comment_count=Count('comments', distinct=True)
-    )
+    queryset = Event.objects.select_related('organizer')
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'description', 'venue_name']
@@ -101,15 +99,8 @@ class EventViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
         now = timezone.now()
         events = self.get_queryset().filter(
             start_datetime__gt=now
-        ).order_by('start_datetime')
-        
-        page = self.paginate_queryset(events)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(events, many=True)
-        return Response(serializer.data)
+        ).order_by('start_datetime', 'id')
+        return paginated_response(self, events)
     
     @action(detail=False, methods=['get'])
     def past(self, request):
@@ -117,25 +108,11 @@ class EventViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
         now = timezone.now()
         events = self.get_queryset().filter(
             end_datetime__lt=now
-        ).order_by('-end_datetime')
-        
-        page = self.paginate_queryset(events)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(events, many=True)
-        return Response(serializer.data)
+        ).order_by('-end_datetime', '-id')
+        return paginated_response(self, events)
     
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_events(self, request):
-        """Get current user's events"""
+        """Get current user's events (?export=json streams all of them)"""
         events = self.get_queryset().filter(organizer=request.user)
-        
-        page = self.paginate_queryset(events)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(events, many=True)
-        return Response(serializer.data)
+        return paginated_response(self, events, exportable=True)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.12 on 2026-10-18 21:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('merch', '0004_merch_community'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['merch', '-created_at', '-id'], name='merch_order_merch_i_f5cd51_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='merch_order_user_id_77ffdb_idx'),
+        ),
+    ]
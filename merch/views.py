@@ -5,6 +5,9 @@ from .models import Merch, Order
 from .serializers import MerchSerializer, OrderSerializer
 from users.permissions import HasPaidSubscription
 from payments.decorators import x402_required
+from payments.pricing import convert
+from api.idempotency import idempotent
+from api.pagination import KeysetOrListPagination, paginated_response
 from django.conf import settings
 from django.shortcuts import get_object_or_404
 from communities.mixins import CommunityWriteMixin
@@ -64,8 +67,7 @@ class MerchViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
         if request.user.role != 'creator':
             return Response({"error": "Only creators can view their specific merch management list."}, status=status.HTTP_403_FORBIDDEN)
         merch = Merch.objects.filter(creator=request.user)
-        serializer = self.get_serializer(merch, many=True)
-        return Response(serializer.data)
+        return paginated_response(self, merch, exportable=True)
 
 class OrderViewSet(viewsets.ModelViewSet):
     """
@@ -83,6 +85,7 @@ class OrderViewSet(viewsets.ModelViewSet):
         # Regular users see their own orders
         return Order.objects.filter(user=user)
 
+    @idempotent()
     def create(self, request, *args, **kwargs):
         merch_id = request.data.get('merch')
         if not merch_id:
@@ -95,11 +98,11 @@ class OrderViewSet(viewsets.ModelViewSet):
             
         def get_amounts(req, **kw):
             # Convert from human-readable to micro-units (STX, USDCx, sBTC)
-            sbtc_per_usdcx = 0.000015
+            amount_usdcx = int(float(merch_item.price_usdcx) * 1_000_000)
             return (
                 int(float(merch_item.price_stx) * 1_000_000),
-                int(float(merch_item.price_usdcx) * 1_000_000),
-                int(float(merch_item.price_usdcx) * sbtc_per_usdcx * 100_000_000),
+                amount_usdcx,
+                convert(amount_usdcx, 'USDCX', 'SBTC'),
             )
 
         @x402_required(get_pay_to, get_amounts, description=f"Purchase Merch: {merch_item.name}", bypass_cache=True)
@@ -109,19 +112,30 @@ class OrderViewSet(viewsets.ModelViewSet):
         return gated_create(request, *args, **kwargs)
 
     def perform_create(self, serializer):
+        # Confirmed payments are paid immediately; mempool txs stay 'pending'
+        # until payments.settlement moves them to 'paid' or 'failed'.
+        payment_status = getattr(self.request, 'x402_payment_status', 'pending')
         serializer.save(
             user=self.request.user,
             buyer_note=self.request.data.get('buyer_note', ''),
             shipping_address=self.request.data.get('shipping_address', ''),
             tx_id=getattr(self.request, 'x402_tx_id', ''),
+            status='paid' if payment_status == 'confirmed' else 'pending',
         )
 
     @action(detail=False, methods=['get'], url_path='mine')
     def mine(self, request):
-        """GET /api/orders/mine/ — orders for creator's merch products."""
+        """
+        GET /api/orders/mine/ — orders for creator's merch products.
+        Cursor paginated on (created_at, id); ?pagination=legacy returns the full list.
+        """
         if request.user.role != 'creator':
             return Response({"error": "Only creators can view merch orders."}, status=status.HTTP_403_FORBIDDEN)
         orders = Order.objects.filter(merch__creator=request.user).select_related('merch', 'user').order_by('-created_at')
+        paginator = KeysetOrListPagination()
+        page = paginator.paginate_queryset(orders, request, view=self)
+        if page is not None:
+            return paginator.get_paginated_response(self.get_serializer(page, many=True).data)
         serializer = self.get_serializer(orders, many=True)
         return Response(serializer.data)
 
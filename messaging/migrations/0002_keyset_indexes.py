@@ -0,0 +1,19 @@
+# Generated by Django 5.2.12 on 2026-10-18 21:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['thread', '-created_at', '-id'], name='messaging_m_thread__f3c5d6_idx'),
+        ),
+    ]
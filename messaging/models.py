@@ -33,6 +33,9 @@ class Message(models.Model):
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['thread', '-created_at', '-id']),
+        ]
 
     def __str__(self):
         return f"Message from {self.sender.username} in {self.thread}"
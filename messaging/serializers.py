@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Thread, Message
+from payments.entitlements import RESOURCE_THREAD, has_access
+from payments.serializers import UnlockedListSerializer
 
 User = get_user_model()
 
@@ -25,13 +27,20 @@ class ThreadSerializer(serializers.ModelSerializer):
     last_message_at = serializers.DateTimeField(source='updated_at', read_only=True)
     unread_count = serializers.SerializerMethodField()
     is_paygated = serializers.BooleanField(source='is_premium')
+    has_access = serializers.SerializerMethodField()
+    unlock_resource_type = RESOURCE_THREAD
     
     class Meta:
         model = Thread
         fields = [
-            'id', 'participants', 'is_paygated', 'price_stx', 'price_usdcx', 
+            'id', 'participants', 'is_paygated', 'price_stx', 'price_usdcx', 'has_access',
             'last_message_at', 'unread_count', 'last_message', 'created_at'
         ]
+        list_serializer_class = UnlockedListSerializer
+
+    def get_has_access(self, obj):
+        request = self.context.get('request')
+        return has_access(obj, getattr(request, 'user', None), RESOURCE_THREAD)
     
     def get_last_message(self, obj):
         last_msg = obj.messages.order_by('-created_at').first()
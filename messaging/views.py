@@ -6,6 +6,9 @@ from django.shortcuts import get_object_or_404
 from .models import Thread, Message
 from .serializers import ThreadSerializer, MessageSerializer
 from payments.decorators import x402_required
+from payments.entitlements import RESOURCE_THREAD, annotate_unlocked
+from payments.pricing import convert
+from api.pagination import KeysetOrListPagination
 from django.conf import settings
 
 class ThreadViewSet(viewsets.ModelViewSet):
@@ -14,7 +17,9 @@ class ThreadViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         # Users only see threads they are participating in
-        return Thread.objects.filter(participants=self.request.user)
+        return annotate_unlocked(
+            Thread.objects.filter(participants=self.request.user), self.request.user, RESOURCE_THREAD
+        )
 
     def create(self, request, *args, **kwargs):
         # Support common direct message creation
@@ -32,6 +37,18 @@ class ThreadViewSet(viewsets.ModelViewSet):
         thread.participants.add(request.user, recipient_id)
         return Response(ThreadSerializer(thread).data, status=status.HTTP_201_CREATED)
 
+    def _message_list(self, request, thread):
+        """
+        Newest messages first, cursor paginated on (created_at, id).
+        ?pagination=legacy returns the whole thread oldest-first as before.
+        """
+        messages = thread.messages.all()
+        paginator = KeysetOrListPagination()
+        page = paginator.paginate_queryset(messages, request, view=self)
+        if page is None:
+            return Response(MessageSerializer(messages, many=True).data)
+        return paginator.get_paginated_response(MessageSerializer(page, many=True).data)
+
     @action(detail=True, methods=['get', 'post'])
     def messages(self, request, pk=None):
         thread = self.get_object()
@@ -40,11 +57,10 @@ class ThreadViewSet(viewsets.ModelViewSet):
         if thread.is_premium:
             # Reusable amounts logic for the decorator
             def get_amounts(req, **kwargs):
-                sbtc_per_usdcx = 0.000015
                 return (
                     thread.price_stx,
                     thread.price_usdcx,
-                    int(float(thread.price_usdcx) * sbtc_per_usdcx * 100_000_000),
+                    convert(thread.price_usdcx, 'USDCX', 'SBTC'),
                 )
             
             def get_pay_to(req, **kwargs):
@@ -53,19 +69,17 @@ class ThreadViewSet(viewsets.ModelViewSet):
 
             # Wrapper for the actual logic to be used with the decorator manually or via dispatch
             @x402_required(get_pay_to, get_amounts, description=f"Unlock conversation Thread #{thread.id}")
-            def get_gated_messages(req, thread_obj):
-                messages = thread_obj.messages.all()
-                serializer = MessageSerializer(messages, many=True)
-                return Response(serializer.data)
+            def get_gated_messages(req, thread_obj, **kw):
+                return self._message_list(req, thread_obj)
 
             if request.method == 'GET':
-                return get_gated_messages(request, thread_obj=thread)
+                return get_gated_messages(
+                    request, thread_obj=thread, resource_type=RESOURCE_THREAD, resource_id=thread.id
+                )
 
         # Standard non-premium flow or POSTing new messages
         if request.method == 'GET':
-            messages = thread.messages.all()
-            serializer = MessageSerializer(messages, many=True)
-            return Response(serializer.data)
+            return self._message_list(request, thread)
         
         elif request.method == 'POST':
             serializer = MessageSerializer(data=request.data)
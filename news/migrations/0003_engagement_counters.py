@@ -0,0 +1,47 @@
+# Generated by Django 5.2.12 on 2026-10-18 21:34
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counts(apps, schema_editor):
+    News = apps.get_model('news', 'news')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Like = apps.get_model('users', 'Like')
+    Comment = apps.get_model('users', 'Comment')
+
+    ct = ContentType.objects.filter(app_label='news', model='news').first()
+    if ct is None:
+        return  # fresh database: nothing can have been liked yet
+
+    def count_of(relation):
+        return Coalesce(Subquery(
+            relation.objects.filter(content_type=ct, object_id=OuterRef('pk'))
+            .values('object_id').annotate(n=Count('pk')).values('n')[:1]
+        ), 0)
+
+    News.objects.update(like_count=count_of(Like), comment_count=count_of(Comment))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('users', '0020_user_follow_counters'),
+        ('news', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='comment_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='like_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
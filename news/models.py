@@ -61,6 +61,9 @@ class News(models.Model):
     # Generic relations for likes and comments
     likes = GenericRelation('users.Like', related_query_name='news')
     comments = GenericRelation('users.Comment', related_query_name='news')
+    # Stored counters, kept in step by users.signals (update_counts recomputes them)
+    like_count = models.IntegerField(default=0)
+    comment_count = models.IntegerField(default=0)
     
     class Meta:
         verbose_name_plural = 'News'
@@ -79,14 +82,6 @@ class News(models.Model):
             self.slug = slugify(self.title)
         super().save(*args, **kwargs)
     
-    @property
-    def like_count(self):
-        return self.likes.count()
-    
-    @property
-    def comment_count(self):
-        return self.comments.count()
-    
     def get_tags_list(self):
         """Return tags as a list"""
         return [tag.strip() for tag in self.tags.split(',') if tag.strip()]
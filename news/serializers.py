@@ -2,6 +2,7 @@ from rest_framework import serializers
 from .models import News
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from api.viewer_state import LIKED, FOLLOWING_OWNER, ViewerStateField, ViewerStateListSerializer
 
 User = get_user_model()
 
@@ -17,8 +18,8 @@ class NewsAuthorSerializer(serializers.ModelSerializer):
 class NewsSerializer(serializers.ModelSerializer):
     """Full news article serializer"""
     author = NewsAuthorSerializer(read_only=True)
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
+    like_count = serializers.IntegerField(read_only=True)
+    comment_count = serializers.IntegerField(read_only=True)
     tags_list = serializers.ListField(source='get_tags_list', read_only=True)
     
     class Meta:
@@ -32,16 +33,6 @@ class NewsSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['slug', 'author', 'created_at', 'updated_at', 'view_count']
     
-    def get_like_count(self, obj):
-        """Get like count from annotation or property"""
-        # Use the renamed annotation to avoid conflict with model property
-        return getattr(obj, '_like_count', obj.like_count)
-    
-    def get_comment_count(self, obj):
-        """Get comment count from annotation or property"""
-        # Use the renamed annotation to avoid conflict with model property
-        return getattr(obj, '_comment_count', obj.comment_count)
-    
     def create(self, validated_data):
         """Auto-set published_at if is_published is True"""
         if validated_data.get('is_published') and not validated_data.get('published_at'):
@@ -58,28 +49,24 @@ class NewsSerializer(serializers.ModelSerializer):
 
 class NewsListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for list views"""
+    viewer_relations = (LIKED, FOLLOWING_OWNER)
+    viewer_owner_field = 'author_id'
     author = NewsAuthorSerializer(read_only=True)
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
-    
-    def get_like_count(self, obj):
-        """Get like count from annotation or property"""
-        # Use the renamed annotation to avoid conflict with model property
-        return getattr(obj, '_like_count', obj.like_count)
-    
-    def get_comment_count(self, obj):
-        """Get comment count from annotation or property"""
-        # Use the renamed annotation to avoid conflict with model property
-        return getattr(obj, '_comment_count', obj.comment_count)
+    like_count = serializers.IntegerField(read_only=True)
+    comment_count = serializers.IntegerField(read_only=True)
+    user_has_liked = ViewerStateField(LIKED)
+    user_is_following_owner = ViewerStateField(FOLLOWING_OWNER)
     
     class Meta:
         model = News
         fields = [
             'id', 'title', 'slug', 'excerpt', 'featured_image',
             'author', 'category', 'is_published', 'published_at',
-            'view_count', 'like_count', 'comment_count'
+            'view_count', 'like_count', 'comment_count',
+            'user_has_liked', 'user_is_following_owner',
         ]
         read_only_fields = fields
+        list_serializer_class = ViewerStateListSerializer
 
 
 class NewsCreateUpdateSerializer(serializers.ModelSerializer):
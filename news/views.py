@@ -2,12 +2,13 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
-from django.db.models import Count, F
+from django.db.models import F
 from .models import News
 from .serializers import (
     NewsSerializer, NewsListSerializer, NewsCreateUpdateSerializer
 )
 from api.permissions import IsOwnerOrReadOnly
+from api.pagination import paginated_response
 
 
 class NewsViewSet(viewsets.ModelViewSet):
@@ -24,10 +25,7 @@ class NewsViewSet(viewsets.ModelViewSet):
     - increment_view: POST /api/news/{id}/increment_view/
     - my_articles: GET /api/news/my_articles/
     """
-    queryset = News.objects.select_related('author').annotate(
-        _like_count=Count('likes', distinct=True),
-        _comment_count=Count('comments', distinct=True)
-    )
+    queryset = News.objects.select_related('author')
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'content', 'tags']
@@ -107,7 +105,6 @@ class NewsViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_articles(self, request):
-        """Get current user's articles"""
+        """Get current user's articles (paginated; ?export=json streams all of them)"""
         articles = self.get_queryset().filter(author=request.user)
-        serializer = self.get_serializer(articles, many=True)
-        return Response(serializer.data)
+        return paginated_response(self, articles, exportable=True)
@@ -3,7 +3,7 @@ from .models import PaymentReceipt
 
 @admin.register(PaymentReceipt)
 class PaymentReceiptAdmin(admin.ModelAdmin):
-    list_display = ('user', 'resource_type', 'resource_id', 'token_type', 'amount', 'paid_at')
-    list_filter = ('resource_type', 'token_type')
+    list_display = ('user', 'resource_type', 'resource_id', 'token_type', 'amount', 'status', 'paid_at')
+    list_filter = ('resource_type', 'token_type', 'status')
     search_fields = ('user__username', 'tx_id', 'resource_id')
-    readonly_fields = ('paid_at',)
+    readonly_fields = ('paid_at', 'settled_at')
@@ -0,0 +1,149 @@
+"""
+Pooled HTTP client for the x402 facilitator and the Hiro Stacks API.
+
+Both services are called through long-lived requests.Session objects with a
+connection pool, so verification does not pay a TCP/TLS handshake per call.
+Hiro rate-limit headers are honoured: a short Retry-After is waited out once,
+a longer one (or an exhausted RateLimit-Remaining budget) puts Hiro in a
+cool-down during which lookups fail fast instead of queueing behind 429s.
+
+Base URLs come from the environment so tests and benchmarks can point them
+at payments.testing.StubChainServer.
+"""
+import os
+import time
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+FACILITATOR_BASE = lambda: os.environ.get("X402_FACILITATOR_URL", "https://x402.aibtc.dev").rstrip("/")
+HIRO_HEADERS = lambda: {"x-api-key": os.environ["HIRO_API_KEY"]} if os.environ.get("HIRO_API_KEY") else {}
+
+REQUEST_TIMEOUT = 15
+POOL_SIZE = 20
+# Retry-After values up to this many seconds are waited out inline (once)
+MAX_INLINE_RETRY_AFTER = 2
+
+
+class RateLimited(Exception):
+    """Raised when Hiro is in a rate-limit cool-down."""
+
+
+def hiro_base(network: str = "mainnet") -> str:
+    override = os.environ.get("HIRO_API_URL", "").rstrip("/")
+    if override:
+        return override
+    return "https://api.mainnet.hiro.so" if network == "mainnet" else "https://api.testnet.hiro.so"
+
+
+def _make_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_local = threading.local()
+_cooldown_lock = threading.Lock()
+_hiro_cooldown_until = 0.0
+
+
+def session() -> requests.Session:
+    """Per-thread pooled session (requests.Session is not thread-safe)."""
+    s = getattr(_local, "session", None)
+    if s is None:
+        s = _local.session = _make_session()
+    return s
+
+
+def _parse_seconds(value, default=0.0) -> float:
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _set_cooldown(seconds: float) -> None:
+    global _hiro_cooldown_until
+    with _cooldown_lock:
+        _hiro_cooldown_until = max(_hiro_cooldown_until, time.monotonic() + seconds)
+
+
+def hiro_cooldown_remaining() -> float:
+    return max(0.0, _hiro_cooldown_until - time.monotonic())
+
+
+def reset_hiro_cooldown() -> None:
+    global _hiro_cooldown_until
+    with _cooldown_lock:
+        _hiro_cooldown_until = 0.0
+
+
+def _record_rate_limit_headers(resp) -> None:
+    remaining = resp.headers.get("ratelimit-remaining") or resp.headers.get("x-ratelimit-remaining")
+    if remaining is not None and _parse_seconds(remaining, default=1) <= 0:
+        reset = resp.headers.get("ratelimit-reset") or resp.headers.get("x-ratelimit-reset")
+        _set_cooldown(_parse_seconds(reset, default=1.0))
+
+
+def _hiro_get(path: str, network: str, params=None, timeout: float = REQUEST_TIMEOUT):
+    if hiro_cooldown_remaining() > 0:
+        raise RateLimited(f"Hiro rate limited for {hiro_cooldown_remaining():.1f}s")
+
+    url = f"{hiro_base(network)}{path}"
+    for attempt in range(2):
+        resp = session().get(url, params=params, headers=HIRO_HEADERS(), timeout=timeout)
+        if resp.status_code != 429:
+            _record_rate_limit_headers(resp)
+            return resp
+
+        retry_after = _parse_seconds(resp.headers.get("retry-after"), default=1.0)
+        if attempt == 0 and retry_after <= MAX_INLINE_RETRY_AFTER:
+            time.sleep(retry_after)
+            continue
+        _set_cooldown(retry_after)
+        raise RateLimited(f"Hiro returned 429 (retry after {retry_after:.1f}s)")
+    return resp
+
+
+def hiro_get_tx(tx_id: str, network: str = "mainnet", timeout: float = REQUEST_TIMEOUT):
+    """
+    GET /extended/v1/tx/<tx_id> from Hiro. Returns the requests.Response.
+    Raises RateLimited while Hiro is cooling down.
+    """
+    return _hiro_get(f"/extended/v1/tx/{tx_id}", network, timeout=timeout)
+
+
+def hiro_get_txs(tx_ids, network: str = "mainnet", timeout: float = REQUEST_TIMEOUT) -> dict:
+    """
+    Look up many txs in one GET /extended/v1/tx/multiple call.
+    Returns {tx_id: tx payload} for the txs Hiro found; missing ids are omitted.
+    Raises RateLimited while Hiro is cooling down, and requests errors as-is.
+    """
+    if not tx_ids:
+        return {}
+    resp = _hiro_get("/extended/v1/tx/multiple", network, params=[("tx_id", t) for t in tx_ids], timeout=timeout)
+    resp.raise_for_status()
+    return {
+        tx_id: entry["result"]
+        for tx_id, entry in resp.json().items()
+        if entry.get("found") and entry.get("result")
+    }
+
+
+def facilitator_verify(signature_b64: str, pay_to: str, resource: str, timeout: float = REQUEST_TIMEOUT):
+    """POST /verify to the x402 facilitator. Returns the requests.Response."""
+    return session().post(
+        f"{FACILITATOR_BASE()}/verify",
+        json={
+            "paymentSignature": signature_b64,
+            "payTo": pay_to,
+            "resource": resource,
+        },
+        timeout=timeout,
+    )
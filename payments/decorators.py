@@ -1,7 +1,11 @@
 from functools import wraps
 from django.http import JsonResponse
-from .x402 import build_payment_required_header, verify_payment_signature
+from .x402 import build_payment_required_header, verify_payment_signature, verification_cache_key
 from .models import PaymentReceipt
+from .entitlements import resource_key, receipt_filter
+from .receipts import (
+    RECEIPT_HEADER, RESPONSE_HEADER, issue_receipt_token, payment_response_header, read_receipt_token,
+)
 import json, base64
 
 def x402_required(get_pay_to, get_amounts, description="", bypass_cache=False):
@@ -11,27 +15,48 @@ def x402_required(get_pay_to, get_amounts, description="", bypass_cache=False):
     get_pay_to: callable(request, **kwargs) -> str (recipient STX address)
     get_amounts: callable(request, **kwargs) -> (int amountSTX, int amountUSDCx[, int amountSBTC])
     bypass_cache: bool - if True, skip checking for existing PaymentReceipt (default False)
+
+    Unless bypass_cache is set, a successful payment returns a signed receipt
+    token in the payment-response header; sending it back in payment-receipt
+    unlocks the resource without a DB or chain lookup (see payments.receipts).
     """
     def decorator(view_func):
         @wraps(view_func)
         def wrapper(request, *args, **kwargs):
+            # We need to know what 'resource' this is in terms of our Receipt model
+            # Defaults to using the URL path and generic resource type unless overridden
+            resource_type, resource_id = resource_key(request, kwargs)
+
+            # A signed receipt token from an earlier purchase needs no DB lookup
+            if not bypass_cache:
+                claims = read_receipt_token(
+                    request.headers.get(RECEIPT_HEADER, ""), resource_type, resource_id, lambda: request.user
+                )
+                if claims:
+                    request.x402_tx_id = claims["tx"]
+                    request.x402_payment_status = claims["st"]
+                    return view_func(request, *args, **kwargs)
+
             # Check for existing valid receipt in DB if user is authenticated
             if request.user.is_authenticated and not bypass_cache:
-                # We need to know what 'resource' this is in terms of our Receipt model
-                # Defaults to using the URL path and generic resource type unless overridden
-                resource_type = kwargs.get("resource_type", "generic")
-                resource_id = str(kwargs.get("resource_id") or kwargs.get("pk") or kwargs.get("id") or request.path)
-                
+                # Pending receipts grant provisional access; failed ones were revoked
+                # by payments.settlement and must pay again
                 receipt = PaymentReceipt.objects.filter(
+                    receipt_filter(resource_type, resource_id, request.path),
                     user=request.user,
-                    resource_type=resource_type,
-                    resource_id=resource_id,
-                ).first()
+                ).exclude(status="failed").first()
                 
                 if receipt:
                     # Provide tx_id to the view even if cached
                     request.x402_tx_id = receipt.tx_id
-                    return view_func(request, *args, **kwargs)
+                    request.x402_payment_status = receipt.status
+                    response = view_func(request, *args, **kwargs)
+                    # Hand out a token so the next visit skips this query
+                    token = issue_receipt_token(
+                        resource_type, resource_id, receipt.tx_id, receipt.status, user=request.user
+                    )
+                    response[RESPONSE_HEADER] = payment_response_header(receipt.tx_id, receipt.status, token)
+                    return response
 
             # Check for payment-signature in headers
             sig = request.headers.get("payment-signature")
@@ -81,26 +106,42 @@ def x402_required(get_pay_to, get_amounts, description="", bypass_cache=False):
             if not result.get("verified"):
                 return JsonResponse({"detail": "Payment verification failed", "error": result.get("error")}, status=402)
 
-            # Provide the tx_id to the underlying view
+            # Provide the tx_id to the underlying view. A mempool tx is granted
+            # provisional access; payments.settlement confirms or revokes it.
+            payment_status = "pending" if result.get("status") == "pending" else "confirmed"
             request.x402_tx_id = verified_tx_id
             request.x402_token_type = result.get("tokenType") or token_type
+            request.x402_payment_status = payment_status
+
+            token = ""
+            if not bypass_cache:
+                token = issue_receipt_token(
+                    resource_type, resource_id, verified_tx_id, payment_status,
+                    user=request.user, payer=sender_address,
+                )
 
             # Record receipt in DB and award DAPP points
             if request.user.is_authenticated:
-                resource_type = kwargs.get("resource_type", "generic")
-                resource_id = str(kwargs.get("pk") or kwargs.get("id") or request.path)
-
-                PaymentReceipt.objects.get_or_create(
+                receipt_fields = {
+                    "tx_id": verified_tx_id,
+                    "token_type": result.get("tokenType") or token_type,
+                    "amount": result.get("amount", 0),
+                    "receipt_token": token,
+                    "status": payment_status,
+                    "verification_key": verification_cache_key(verified_tx_id, pay_to, resource, expected_amounts),
+                }
+                receipt, created = PaymentReceipt.objects.get_or_create(
                     user=request.user,
                     resource_type=resource_type,
                     resource_id=resource_id,
-                    defaults={
-                        "tx_id": verified_tx_id,
-                        "token_type": result.get("tokenType") or token_type,
-                        "amount": result.get("amount", 0),
-                        "receipt_token": result.get("receiptToken", ""),
-                    }
+                    defaults=receipt_fields,
                 )
+                if not created and receipt.status == "failed":
+                    # Re-purchase after a failed tx replaces the revoked receipt
+                    for field, value in receipt_fields.items():
+                        setattr(receipt, field, value)
+                    receipt.settled_at = None
+                    receipt.save()
 
                 # Award DAPP points — silently skipped if anything goes wrong
                 try:
@@ -120,7 +161,11 @@ def x402_required(get_pay_to, get_amounts, description="", bypass_cache=False):
                 except Exception:
                     pass  # Points MUST never block a payment
 
-            return view_func(request, *args, **kwargs)
+            response = view_func(request, *args, **kwargs)
+            response[RESPONSE_HEADER] = payment_response_header(
+                verified_tx_id, payment_status, token, payer=sender_address
+            )
+            return response
         return wrapper
     return decorator
 
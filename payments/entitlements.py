@@ -0,0 +1,91 @@
+"""
+Entitlement lookups over PaymentReceipt.
+
+x402_required answers "has this user paid for this one resource?" per request.
+Lists of premium posts/episodes/threads need the same answer for a whole
+page; annotate_unlocked() adds it as an EXISTS subquery so the page is still
+a single query, served by the (user, resource_type, resource_id) unique index.
+
+Receipts recorded before resources were typed carry resource_type='generic'
+and the object pk as resource_id (thread receipts, keyed by request path,
+were rewritten by migration 0003). They are still honoured so nobody has to
+pay twice.
+"""
+from django.db.models import CharField, Exists, OuterRef, Q, Value
+from django.db.models.functions import Cast
+
+from .models import PaymentReceipt
+
+RESOURCE_POST = "post"
+RESOURCE_EPISODE = "episode"
+RESOURCE_THREAD = "message_thread"
+LEGACY_RESOURCE_TYPE = "generic"
+
+
+def resource_key(request, kwargs) -> tuple:
+    """(resource_type, resource_id) a gated view call is recorded under."""
+    resource_type = kwargs.get("resource_type", LEGACY_RESOURCE_TYPE)
+    resource_id = str(kwargs.get("resource_id") or kwargs.get("pk") or kwargs.get("id") or request.path)
+    return resource_type, resource_id
+
+
+def receipt_filter(resource_type: str, resource_id: str, path: str = "") -> Q:
+    """Q matching a receipt for one resource, including pre-typing legacy receipts."""
+    q = Q(resource_type=resource_type, resource_id=resource_id)
+    if resource_type != LEGACY_RESOURCE_TYPE:
+        legacy_ids = [resource_id, path] if path else [resource_id]
+        q |= Q(resource_type=LEGACY_RESOURCE_TYPE, resource_id__in=legacy_ids)
+    return q
+
+
+def valid_receipts(user):
+    """Receipts that grant access: confirmed, or pending settlement."""
+    return PaymentReceipt.objects.filter(user=user).exclude(status="failed")
+
+
+def annotate_unlocked(queryset, user, resource_type: str, name: str = "_unlocked"):
+    """
+    Annotate each row with a boolean ``name``: whether ``user`` holds a
+    receipt for it. Anonymous users get a constant False.
+    """
+    if not user.is_authenticated:
+        return queryset.annotate(**{name: Value(False)})
+    resource_id = Cast(OuterRef("pk"), output_field=CharField())
+    return queryset.annotate(**{
+        name: Exists(
+            valid_receipts(user).filter(
+                resource_type__in=[resource_type, LEGACY_RESOURCE_TYPE],
+                resource_id=resource_id,
+            )
+        )
+    })
+
+
+def unlocked_ids(user, resource_type: str, ids) -> set:
+    """Set of ids (as str) among ``ids`` that ``user`` holds a receipt for. One query."""
+    ids = [str(i) for i in ids]
+    if not ids or not user.is_authenticated:
+        return set()
+    return set(
+        valid_receipts(user).filter(
+            resource_type__in=[resource_type, LEGACY_RESOURCE_TYPE],
+            resource_id__in=ids,
+        ).values_list("resource_id", flat=True)
+    )
+
+
+def has_access(obj, user, resource_type: str, owner_id=None) -> bool:
+    """
+    Whether ``user`` may open ``obj``: it is free, they own it, or they hold a
+    receipt. Uses the ``_unlocked`` annotation when present, else one query.
+    """
+    if not getattr(obj, "is_premium", False):
+        return True
+    if user is None or not user.is_authenticated:
+        return False
+    if owner_id is not None and owner_id == user.pk:
+        return True
+    unlocked = getattr(obj, "_unlocked", None)
+    if unlocked is None:
+        unlocked = str(obj.pk) in unlocked_ids(user, resource_type, [obj.pk])
+    return bool(unlocked)
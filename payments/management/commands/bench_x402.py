@@ -0,0 +1,94 @@
+"""
+Latency benchmark for the x402_required decorator path.
+
+Runs against payments.testing.StubChainServer with configurable upstream
+delays, so no real facilitator or Hiro traffic is generated. Reports the
+old sequential (facilitator, then Hiro) cost next to the raced path and the
+verification-cache hit path.
+
+    python manage.py bench_x402 --iterations 50 --facilitator-delay 0.3 --hiro-delay 0.1
+"""
+import base64
+import json
+import os
+import statistics
+import time
+import uuid
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.http import JsonResponse
+from django.test import RequestFactory
+
+from payments import chain
+from payments.decorators import x402_required
+from payments.testing import StubChainServer, stub_stx_transfer
+from payments.x402 import check_tx_on_blockchain
+
+PAY_TO = 'SP000BENCH'
+AMOUNT = 1_000_000
+
+
+class Command(BaseCommand):
+    help = 'Benchmark x402 payment verification latency against a local stub facilitator/Hiro'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=30)
+        parser.add_argument('--facilitator-delay', type=float, default=0.3,
+                            help='Seconds the stub facilitator takes to answer (it never verifies)')
+        parser.add_argument('--hiro-delay', type=float, default=0.1,
+                            help='Seconds the stub Hiro API takes to answer')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        with StubChainServer(
+            facilitator_delay=options['facilitator_delay'],
+            hiro_delay=options['hiro_delay'],
+        ) as server, mock.patch.dict(os.environ, {
+            'X402_FACILITATOR_URL': server.url,
+            'HIRO_API_URL': server.url,
+        }):
+            view = x402_required(
+                lambda req, **kw: PAY_TO,
+                lambda req, **kw: (AMOUNT, 0, 0),
+                description='bench',
+            )(lambda req, **kw: JsonResponse({'ok': True}))
+            factory = RequestFactory()
+
+            def new_signature():
+                tx_id = uuid.uuid4().hex
+                server.txs[f'0x{tx_id}'] = stub_stx_transfer(PAY_TO, AMOUNT)
+                return base64.b64encode(json.dumps({'txId': tx_id, 'tokenType': 'STX'}).encode()).decode()
+
+            def call(signature):
+                request = factory.get('/bench/', HTTP_PAYMENT_SIGNATURE=signature)
+                request.user = AnonymousUser()
+                started = time.perf_counter()
+                response = view(request)
+                elapsed = time.perf_counter() - started
+                assert response.status_code == 200, response.content
+                return elapsed
+
+            def sequential(signature):
+                # The pre-race behaviour: facilitator first, Hiro only after it says no
+                tx_id = json.loads(base64.b64decode(signature))['txId']
+                started = time.perf_counter()
+                chain.facilitator_verify(signature, PAY_TO, '/bench/')
+                check_tx_on_blockchain(tx_id, PAY_TO, {'stx': AMOUNT}, 'STX')
+                return time.perf_counter() - started
+
+            signatures = [new_signature() for _ in range(iterations)]
+            self._report('sequential (old)', [sequential(new_signature()) for _ in range(iterations)])
+            self._report('raced, cold', [call(sig) for sig in signatures])
+            self._report('raced, cached', [call(sig) for sig in signatures])
+
+    def _report(self, label, samples):
+        samples = sorted(samples)
+        p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+        self.stdout.write(
+            f"{label:<18} n={len(samples):<4} "
+            f"p50={statistics.median(samples) * 1000:8.1f}ms  "
+            f"p95={p95 * 1000:8.1f}ms  "
+            f"max={samples[-1] * 1000:8.1f}ms"
+        )
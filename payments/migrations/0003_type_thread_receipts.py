@@ -0,0 +1,36 @@
+import re
+
+from django.db import migrations
+
+THREAD_PATH = re.compile(r'^/api/messages/threads/(\d+)/messages/?$')
+
+
+def type_thread_receipts(apps, schema_editor):
+    """Thread receipts were keyed by request path; key them by thread id."""
+    PaymentReceipt = apps.get_model('payments', 'PaymentReceipt')
+    legacy = PaymentReceipt.objects.filter(
+        resource_type='generic', resource_id__startswith='/api/messages/threads/'
+    )
+    for receipt in legacy.iterator():
+        match = THREAD_PATH.match(receipt.resource_id)
+        if not match:
+            continue
+        thread_id = match.group(1)
+        if PaymentReceipt.objects.filter(
+            user_id=receipt.user_id, resource_type='message_thread', resource_id=thread_id
+        ).exists():
+            continue
+        receipt.resource_type = 'message_thread'
+        receipt.resource_id = thread_id
+        receipt.save(update_fields=['resource_type', 'resource_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_paymentreceipt_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(type_thread_receipts, migrations.RunPython.noop),
+    ]
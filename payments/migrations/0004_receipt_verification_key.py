@@ -0,0 +1,18 @@
+# Generated by Django 5.2.12 on 2026-10-18 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0003_type_thread_receipts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paymentreceipt',
+            name='verification_key',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+    ]
@@ -2,6 +2,12 @@ from django.db import models
 from django.conf import settings
 
 class PaymentReceipt(models.Model):
+    STATUS_CHOICES = [
+        ("pending", "Pending"),        # verified against a mempool tx — provisional access
+        ("confirmed", "Confirmed"),    # tx succeeded on chain
+        ("failed", "Failed"),          # tx aborted/dropped — access revoked
+    ]
+
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="payment_receipts")
     resource_type = models.CharField(max_length=50)   # "post", "episode", "message_thread", "merch_order"
     resource_id = models.CharField(max_length=255)
@@ -9,11 +15,18 @@ class PaymentReceipt(models.Model):
     token_type = models.CharField(max_length=10)       # "STX" or "USDCx"
     amount = models.BigIntegerField()                  # in microSTX or smallest USDCx unit
     receipt_token = models.TextField(blank=True)       # x402 v2 receipt for repeat access
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="confirmed")
+    settled_at = models.DateTimeField(null=True, blank=True)
+    # x402 verification cache entry of the payment; payments.settlement overwrites it with the final result
+    verification_key = models.CharField(max_length=100, blank=True)
     paid_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ("user", "resource_type", "resource_id")
         ordering = ['-paid_at']
+        indexes = [
+            models.Index(fields=["status", "paid_at"]),
+        ]
 
     def __str__(self):
         return f"{self.user.username} paid for {self.resource_type}:{self.resource_id} ({self.token_type})"
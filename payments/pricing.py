@@ -0,0 +1,126 @@
+"""
+Token price oracle for x402 pricing.
+
+Gated views quote the same price in STX, USDCx and sBTC. Cross-token amounts
+come from convert(), which reads a rate snapshot ({symbol: USD per whole
+token}) and never touches the network:
+
+    1. in-process copy, reused for LOCAL_TTL seconds
+    2. shared cache (PRICE_CACHE_KEY), written by refresh_prices()
+    3. FALLBACK_RATES, so pricing keeps working before the first refresh
+
+refresh_prices() runs from Celery beat (payments.tasks.refresh_token_prices)
+and pulls from PRICE_ORACLE_URL, a CoinGecko-compatible /simple/price
+endpoint. Tests point it at payments.testing.StubChainServer.
+"""
+import os
+import time
+import logging
+import threading
+
+from django.core.cache import cache
+
+from . import chain
+
+logger = logging.getLogger(__name__)
+
+PRICE_ORACLE_URL = lambda: os.environ.get(
+    "PRICE_ORACLE_URL", "https://api.coingecko.com/api/v3"
+).rstrip("/")
+
+PRICE_CACHE_KEY = "payments:price_snapshot"
+# A snapshot older than this in the shared cache is dropped in favour of the fallback
+PRICE_CACHE_TTL = 30 * 60
+LOCAL_TTL = 30
+
+# Base-unit decimals: microSTX, smallest USDCx unit, satoshis
+DECIMALS = {"STX": 6, "USDCX": 6, "SBTC": 8}
+# CoinGecko ids for each token; sBTC is pegged 1:1 to BTC
+ORACLE_IDS = {"STX": "blockstack", "USDCX": "usd-coin", "SBTC": "bitcoin"}
+# USD per whole token. The SBTC/USDCX ratio matches the 0.000015 sBTC per
+# USDCx the views used to hard-code.
+FALLBACK_RATES = {"STX": 1.0, "USDCX": 1.0, "SBTC": 1 / 0.000015}
+
+_local_lock = threading.Lock()
+_local = {"snapshot": None, "loaded_at": 0.0}
+
+
+class UnknownToken(ValueError):
+    pass
+
+
+def _fallback_snapshot() -> dict:
+    return {"rates": dict(FALLBACK_RATES), "fetched_at": 0, "source": "fallback"}
+
+
+def get_snapshot() -> dict:
+    """Current rate snapshot. Reads the in-process copy or the shared cache only."""
+    now = time.monotonic()
+    snapshot = _local["snapshot"]
+    if snapshot is not None and now - _local["loaded_at"] < LOCAL_TTL:
+        return snapshot
+
+    snapshot = cache.get(PRICE_CACHE_KEY) or _fallback_snapshot()
+    with _local_lock:
+        _local["snapshot"] = snapshot
+        _local["loaded_at"] = now
+    return snapshot
+
+
+def reset_local_snapshot() -> None:
+    with _local_lock:
+        _local["snapshot"] = None
+        _local["loaded_at"] = 0.0
+
+
+def convert(amount: int, from_token: str, to_token: str, snapshot: dict = None) -> int:
+    """
+    Convert ``amount`` base units of ``from_token`` into base units of
+    ``to_token`` (e.g. micro-USDCx -> satoshis). Tokens: STX, USDCX, SBTC.
+    """
+    from_token, to_token = from_token.upper(), to_token.upper()
+    for token in (from_token, to_token):
+        if token not in DECIMALS:
+            raise UnknownToken(token)
+    if not amount:
+        return 0
+    if from_token == to_token:
+        return int(amount)
+
+    rates = (snapshot or get_snapshot())["rates"]
+    usd = amount / 10 ** DECIMALS[from_token] * rates[from_token]
+    return round(usd / rates[to_token] * 10 ** DECIMALS[to_token])
+
+
+def fetch_rates() -> dict:
+    """Fetch {symbol: USD price} from the oracle. Raises on any failure."""
+    resp = chain.session().get(
+        f"{PRICE_ORACLE_URL()}/simple/price",
+        params={"ids": ",".join(ORACLE_IDS.values()), "vs_currencies": "usd"},
+        timeout=chain.REQUEST_TIMEOUT,
+    )
+    resp.raise_for_status()
+    data = resp.json()
+    rates = {}
+    for symbol, oracle_id in ORACLE_IDS.items():
+        price = float(data[oracle_id]["usd"])
+        if price <= 0:
+            raise ValueError(f"non-positive {symbol} price from oracle")
+        rates[symbol] = price
+    return rates
+
+
+def refresh_prices() -> dict:
+    """Fetch fresh rates and publish them to the shared cache. Keeps the old snapshot on failure."""
+    try:
+        rates = fetch_rates()
+    except Exception as e:
+        logger.warning(f"[pricing] oracle refresh failed, keeping previous snapshot: {e}")
+        return get_snapshot()
+
+    snapshot = {"rates": rates, "fetched_at": int(time.time()), "source": PRICE_ORACLE_URL()}
+    cache.set(PRICE_CACHE_KEY, snapshot, timeout=PRICE_CACHE_TTL)
+    with _local_lock:
+        _local["snapshot"] = snapshot
+        _local["loaded_at"] = time.monotonic()
+    return snapshot
@@ -0,0 +1,91 @@
+"""
+Signed x402 receipt tokens.
+
+After a payment verifies, x402_required returns a compact HMAC-signed token
+(django.core.signing, keyed by SECRET_KEY) in the base64 ``payment-response``
+header. Clients send it back in the ``payment-receipt`` request header and
+are let through without a PaymentReceipt query or a chain lookup. This is
+also the only repeat-access path for anonymous buyers, who have no receipt
+row.
+
+Claims:
+    res    "<resource_type>:<resource_id>" the token unlocks
+    tx     paying tx id
+    st     "confirmed" or "pending"
+    exp    unix expiry
+    sub    user pk, when bought while logged in (token is then bound to them)
+    payer  sender address from the payment-signature, if known
+
+Tokens for pending txs live X402_PENDING_RECEIPT_TOKEN_TTL only, so access
+granted on a mempool tx that settlement later revokes lapses quickly.
+"""
+import base64
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core import signing
+
+RECEIPT_HEADER = "payment-receipt"
+RESPONSE_HEADER = "payment-response"
+_SALT = "payments.receipt-token"
+
+
+def _ttl(status: str) -> int:
+    if status == "pending":
+        return settings.X402_PENDING_RECEIPT_TOKEN_TTL
+    return settings.X402_RECEIPT_TOKEN_TTL
+
+
+def issue_receipt_token(resource_type: str, resource_id: str, tx_id: str, status: str,
+                        user=None, payer: str = "") -> str:
+    claims = {
+        "res": f"{resource_type}:{resource_id}",
+        "tx": tx_id,
+        "st": status,
+        "exp": int(time.time()) + _ttl(status),
+    }
+    if user is not None and user.is_authenticated:
+        claims["sub"] = user.pk
+    if payer:
+        claims["payer"] = payer
+    return signing.dumps(claims, salt=_SALT, compress=True)
+
+
+def read_receipt_token(token: str, resource_type: str, resource_id: str, get_user) -> dict:
+    """
+    Return the claims of ``token`` if it is valid for this resource, else None.
+    ``get_user`` is only called for user-bound tokens, so an anonymous token
+    is checked without touching authentication.
+    """
+    if not token:
+        return None
+    try:
+        claims = signing.loads(token, salt=_SALT)
+    except signing.BadSignature:
+        return None
+    if claims.get("res") != f"{resource_type}:{resource_id}":
+        return None
+    if claims.get("exp", 0) < time.time():
+        return None
+    if "sub" in claims:
+        user = get_user()
+        if not user.is_authenticated or user.pk != claims["sub"]:
+            return None
+    return claims
+
+
+def payment_response_header(tx_id: str, status: str, token: str = "", payer: str = "") -> str:
+    """Base64 JSON for the payment-response header."""
+    payload = {
+        "success": True,
+        "transaction": tx_id,
+        "status": status,
+        "network": os.environ.get("STACKS_NETWORK", "mainnet"),
+    }
+    if payer:
+        payload["payer"] = payer
+    if token:
+        payload["receiptToken"] = token
+    return base64.b64encode(json.dumps(payload).encode()).decode()
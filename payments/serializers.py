@@ -0,0 +1,23 @@
+from django.db import models
+from rest_framework import serializers
+
+from .entitlements import unlocked_ids
+
+
+class UnlockedListSerializer(serializers.ListSerializer):
+    """
+    List serializer for premium resources that fills ``_unlocked`` for every
+    row in one receipt query when the queryset was not annotated (nested
+    serializers, custom actions). The child sets ``unlock_resource_type``.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        missing = [obj for obj in items if getattr(obj, 'is_premium', False) and not hasattr(obj, '_unlocked')]
+        if missing and user is not None and user.is_authenticated:
+            unlocked = unlocked_ids(user, self.child.unlock_resource_type, [obj.pk for obj in missing])
+            for obj in missing:
+                obj._unlocked = str(obj.pk) in unlocked
+        return super().to_representation(items)
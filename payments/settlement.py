@@ -0,0 +1,147 @@
+"""
+Background settlement of x402 payments.
+
+x402_required grants access as soon as a payment verifies, including when
+the tx is still in the mempool; such receipts are stored with
+status='pending'. settle_pending_payments() (Celery beat, every minute) pages
+through every pending receipt and pending merch order by primary key, one
+batched Hiro call per SETTLE_BATCH_SIZE rows, and moves them to their final
+state. Rows still pending do not hold back newer ones: each run reaches them all.
+
+- tx success            -> receipt 'confirmed', order 'paid'
+- tx abort_* / dropped_* -> receipt 'failed' (access revoked), order 'failed'
+- tx still unknown after PENDING_EXPIRY -> treated as dropped
+
+This job is the only poller of pending txs. A settled receipt's x402
+verification cache entry (PaymentReceipt.verification_key) is overwritten
+with the final result, so a retried payment-signature sees the same answer.
+"""
+import os
+import logging
+from datetime import timedelta
+
+from django.utils import timezone
+
+from . import chain
+from .models import PaymentReceipt
+from .x402 import cache_verification_result
+
+logger = logging.getLogger(__name__)
+
+SETTLE_BATCH_SIZE = 50
+# A tx Hiro still doesn't know about after this long was dropped from the mempool
+PENDING_EXPIRY = timedelta(hours=24)
+
+
+def _normalize(tx_id: str) -> str:
+    return tx_id if tx_id.startswith("0x") else f"0x{tx_id}"
+
+
+def _outcome(tx, created_at, now):
+    """Return 'success', 'failed' or None (still pending) for a Hiro tx payload."""
+    if tx is None:
+        return 'failed' if created_at < now - PENDING_EXPIRY else None
+    status = tx.get("tx_status")
+    if status == "success":
+        return 'success'
+    if status == "pending":
+        return None
+    return 'failed'
+
+
+def _verification_result(receipt, tx, outcome):
+    """The final x402 verification result for a settled receipt, as check_tx_on_blockchain shapes it."""
+    tx_id = _normalize(receipt.tx_id)
+    if outcome == 'success':
+        return {"verified": True, "txId": tx_id, "status": "success",
+                "amount": receipt.amount, "tokenType": receipt.token_type}
+    status = tx.get("tx_status") if tx else "dropped_stale"
+    return {"verified": False, "txId": tx_id, "status": status, "error": f"Transaction status is {status}"}
+
+
+def settle_pending_payments(batch_size: int = SETTLE_BATCH_SIZE) -> dict:
+    """
+    Settle every pending receipt and order, SETTLE_BATCH_SIZE of each per
+    Hiro call. Stops early if Hiro fails (the rest waits for the next run).
+    Returns {'confirmed': n, 'failed': n, 'pending': n}.
+    """
+    from merch.models import Order
+
+    network = os.environ.get("STACKS_NETWORK", "mainnet").lower()
+    now = timezone.now()
+    summary = {'confirmed': 0, 'failed': 0, 'pending': 0}
+
+    receipts_after = orders_after = 0
+    while True:
+        receipts = list(
+            PaymentReceipt.objects.filter(status='pending', pk__gt=receipts_after).order_by('pk')[:batch_size]
+        )
+        orders = list(
+            Order.objects.filter(status='pending', pk__gt=orders_after)
+            .exclude(tx_id='').order_by('pk')[:batch_size]
+        )
+        if not receipts and not orders:
+            break
+        if not _settle_batch(receipts, orders, network, now, summary):
+            break
+        receipts_after = receipts[-1].pk if receipts else receipts_after
+        orders_after = orders[-1].pk if orders else orders_after
+    return summary
+
+
+def _settle_batch(receipts, orders, network, now, summary) -> bool:
+    """Settle one page of receipts and orders; False if the Hiro lookup failed."""
+    from merch.models import Order
+
+    tx_ids = sorted({_normalize(r.tx_id) for r in receipts} | {_normalize(o.tx_id) for o in orders})
+    try:
+        txs = chain.hiro_get_txs(tx_ids, network)
+    except Exception as e:
+        logger.warning(f"[settlement] Hiro lookup for {len(tx_ids)} txs failed: {e}")
+        summary['pending'] += len(receipts) + len(orders)
+        return False
+
+    confirmed_receipts, failed_receipts = [], []
+    for receipt in receipts:
+        tx = txs.get(_normalize(receipt.tx_id))
+        outcome = _outcome(tx, receipt.paid_at, now)
+        if outcome == 'success':
+            confirmed_receipts.append(receipt.pk)
+        elif outcome == 'failed':
+            failed_receipts.append(receipt.pk)
+        else:
+            summary['pending'] += 1
+            continue
+        if receipt.verification_key:
+            cache_verification_result(receipt.verification_key, _verification_result(receipt, tx, outcome))
+
+    paid_orders, failed_orders = [], []
+    for order in orders:
+        outcome = _outcome(txs.get(_normalize(order.tx_id)), order.created_at, now)
+        if outcome == 'success':
+            paid_orders.append(order.pk)
+        elif outcome == 'failed':
+            failed_orders.append(order.pk)
+        else:
+            summary['pending'] += 1
+
+    # status='pending' in the filters keeps a concurrent run from flipping a settled row
+    summary['confirmed'] += PaymentReceipt.objects.filter(pk__in=confirmed_receipts, status='pending').update(
+        status='confirmed', settled_at=now
+    )
+    summary['failed'] += PaymentReceipt.objects.filter(pk__in=failed_receipts, status='pending').update(
+        status='failed', settled_at=now
+    )
+    summary['confirmed'] += Order.objects.filter(pk__in=paid_orders, status='pending').update(
+        status='paid', updated_at=now
+    )
+    summary['failed'] += Order.objects.filter(pk__in=failed_orders, status='pending').update(
+        status='failed', updated_at=now
+    )
+
+    if failed_receipts or failed_orders:
+        logger.warning(
+            f"[settlement] revoked {len(failed_receipts)} receipts, flagged {len(failed_orders)} orders "
+            f"after failed txs"
+        )
+    return True
@@ -0,0 +1,22 @@
+from celery import shared_task
+
+from .settlement import settle_pending_payments as _settle_pending_payments
+
+
+@shared_task
+def settle_pending_payments():
+    """
+    Move pending PaymentReceipts and merch Orders to their final state.
+    Runs every minute via Celery Beat.
+    """
+    return _settle_pending_payments()
+
+
+@shared_task(ignore_result=True)
+def refresh_token_prices():
+    """
+    Refresh the STX/USDCx/sBTC rate snapshot used by payments.pricing.convert().
+    Runs every minute via Celery Beat.
+    """
+    from .pricing import refresh_prices
+    refresh_prices()
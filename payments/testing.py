@@ -0,0 +1,117 @@
+"""
+Local stand-in for the x402 facilitator, the Hiro API and the price oracle,
+for tests and the bench_x402 command. Runs a ThreadingHTTPServer on
+127.0.0.1 in a daemon thread; point X402_FACILITATOR_URL, HIRO_API_URL and
+PRICE_ORACLE_URL at ``server.url``.
+
+    with StubChainServer(facilitator_delay=0.5) as server:
+        server.txs['0xabc'] = stub_stx_transfer('SP...', 1_000_000)
+        ...
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+
+def stub_stx_transfer(recipient: str, amount: int, status: str = 'success') -> dict:
+    """Minimal Hiro /extended/v1/tx payload for an STX token transfer."""
+    return {
+        'tx_status': status,
+        'tx_type': 'token_transfer',
+        'token_transfer': {'recipient_address': recipient, 'amount': str(amount)},
+    }
+
+
+class StubChainServer:
+    def __init__(self, facilitator_delay=0.0, hiro_delay=0.0, facilitator_verified=False):
+        self.facilitator_delay = facilitator_delay
+        self.hiro_delay = hiro_delay
+        self.facilitator_verified = facilitator_verified
+        # tx_id -> Hiro tx payload
+        self.txs = {}
+        # Set to (status_code, headers) to make the next Hiro call answer with it
+        self.hiro_override = None
+        # oracle id -> USD price served on /simple/price
+        self.prices = {'blockstack': 2.0, 'usd-coin': 1.0, 'bitcoin': 100_000.0}
+        self.calls = {'facilitator': 0, 'hiro': 0, 'prices': 0}
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, payload, headers=None):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                self.rfile.read(length)
+                stub.calls['facilitator'] += 1
+                time.sleep(stub.facilitator_delay)
+                if stub.facilitator_verified:
+                    self._send(200, {'verified': True, 'status': 'success', 'tokenType': 'STX'})
+                else:
+                    self._send(200, {'verified': False, 'error': 'not found'})
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path.rstrip('/').endswith('/simple/price'):
+                    stub.calls['prices'] += 1
+                    self._send(200, {oracle_id: {'usd': price} for oracle_id, price in stub.prices.items()})
+                    return
+
+                stub.calls['hiro'] += 1
+                time.sleep(stub.hiro_delay)
+                if stub.hiro_override is not None:
+                    status, headers = stub.hiro_override
+                    stub.hiro_override = None
+                    self._send(status, {'error': 'stub override'}, headers)
+                    return
+                if url.path.rstrip('/').endswith('/tx/multiple'):
+                    self._send(200, {
+                        tx_id: {'found': tx_id in stub.txs, 'result': stub.txs.get(tx_id)}
+                        for tx_id in parse_qs(url.query).get('tx_id', [])
+                    })
+                    return
+                tx_id = url.path.rstrip('/').rsplit('/', 1)[-1]
+                tx = stub.txs.get(tx_id)
+                if tx is None:
+                    self._send(404, {'error': 'tx not found'})
+                else:
+                    self._send(200, tx)
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,292 @@
+import base64
+import json
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from . import chain, pricing
+from .models import PaymentReceipt
+from .settlement import settle_pending_payments
+from .testing import StubChainServer, stub_stx_transfer
+from .x402 import verify_payment_signature
+from merch.models import Merch, Order
+from posts.models import Post
+from users.models import User
+
+PAY_TO = 'SP000CREATOR'
+AMOUNTS = {'stx': 1_000_000, 'usdcx': 0, 'sbtc': 0}
+
+
+def _signature(tx_id):
+    return base64.b64encode(json.dumps({'txId': tx_id, 'tokenType': 'STX'}).encode()).decode()
+
+
+class VerificationRaceTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        chain.reset_hiro_cooldown()
+        self.server = StubChainServer().start()
+        self.addCleanup(self.server.stop)
+        env = mock.patch.dict('os.environ', {
+            'X402_FACILITATOR_URL': self.server.url,
+            'HIRO_API_URL': self.server.url,
+        })
+        env.start()
+        self.addCleanup(env.stop)
+
+    def test_hiro_answer_wins_over_slow_facilitator(self):
+        self.server.facilitator_delay = 2
+        self.server.txs['0xaa'] = stub_stx_transfer(PAY_TO, 1_000_000)
+
+        started = time.monotonic()
+        result = verify_payment_signature(_signature('aa'), PAY_TO, '/api/posts/1/', AMOUNTS)
+
+        self.assertTrue(result['verified'])
+        self.assertLess(time.monotonic() - started, 1.5)
+
+    def test_facilitator_answer_wins_over_slow_hiro(self):
+        self.server.facilitator_verified = True
+        self.server.hiro_delay = 2
+
+        started = time.monotonic()
+        result = verify_payment_signature(_signature('bb'), PAY_TO, '/api/posts/1/', AMOUNTS)
+
+        self.assertTrue(result['verified'])
+        self.assertLess(time.monotonic() - started, 1.5)
+
+    def test_underpayment_is_rejected(self):
+        self.server.txs['0xcc'] = stub_stx_transfer(PAY_TO, 10)
+
+        result = verify_payment_signature(_signature('cc'), PAY_TO, '/api/posts/1/', AMOUNTS)
+
+        self.assertFalse(result['verified'])
+
+    def test_long_retry_after_starts_cooldown(self):
+        self.server.hiro_override = (429, {'Retry-After': '30'})
+
+        with self.assertRaises(chain.RateLimited):
+            chain.hiro_get_tx('0xdd')
+        with self.assertRaises(chain.RateLimited):
+            chain.hiro_get_tx('0xdd')
+
+        self.assertEqual(self.server.calls['hiro'], 1)
+
+
+class SettlementTests(TestCase):
+    def setUp(self):
+        self.server = StubChainServer().start()
+        self.addCleanup(self.server.stop)
+        env = mock.patch.dict('os.environ', {'HIRO_API_URL': self.server.url})
+        env.start()
+        self.addCleanup(env.stop)
+        chain.reset_hiro_cooldown()
+
+        self.buyer = User.objects.create(username='buyer')
+        creator = User.objects.create(username='maker', role='creator')
+        self.merch = Merch.objects.create(
+            creator=creator, name='Shirt', description='', price_stx=1, price_usdcx=1
+        )
+
+    def _receipt(self, tx_id, resource_id):
+        return PaymentReceipt.objects.create(
+            user=self.buyer, resource_type='post', resource_id=resource_id,
+            tx_id=tx_id, token_type='STX', amount=1, status='pending',
+        )
+
+    def test_batch_settles_receipts_and_orders(self):
+        ok = self._receipt('0x01', '1')
+        aborted = self._receipt('0x02', '2')
+        waiting = self._receipt('0x03', '3')
+        order = Order.objects.create(user=self.buyer, merch=self.merch, tx_id='0x04')
+        self.server.txs['0x01'] = stub_stx_transfer(PAY_TO, 1)
+        self.server.txs['0x02'] = stub_stx_transfer(PAY_TO, 1, status='abort_by_response')
+        self.server.txs['0x03'] = stub_stx_transfer(PAY_TO, 1, status='pending')
+        self.server.txs['0x04'] = stub_stx_transfer(PAY_TO, 1)
+
+        summary = settle_pending_payments()
+
+        self.assertEqual(summary, {'confirmed': 2, 'failed': 1, 'pending': 1})
+        self.assertEqual(self.server.calls['hiro'], 1)
+        ok.refresh_from_db(); aborted.refresh_from_db(); waiting.refresh_from_db(); order.refresh_from_db()
+        self.assertEqual(ok.status, 'confirmed')
+        self.assertEqual(aborted.status, 'failed')
+        self.assertEqual(waiting.status, 'pending')
+        self.assertEqual(order.status, 'paid')
+
+    def test_settlement_writes_the_final_verification_result(self):
+        from .x402 import verification_cache_key
+        cache.clear()
+        key = verification_cache_key('0x05', PAY_TO, '/api/posts/1/', AMOUNTS)
+        receipt = self._receipt('0x05', '5')
+        receipt.verification_key = key
+        receipt.save()
+        cache.set(key, {'verified': True, 'txId': '0x05', 'status': 'pending'})
+        self.server.txs['0x05'] = stub_stx_transfer(PAY_TO, 1, status='abort_by_response')
+
+        settle_pending_payments()
+
+        self.assertEqual(cache.get(key)['status'], 'abort_by_response')
+        self.assertFalse(cache.get(key)['verified'])
+
+
+    def test_stuck_rows_do_not_hide_newer_ones(self):
+        stuck = [self._receipt(f'0x1{i}', f'1{i}') for i in range(3)]
+        newer = self._receipt('0x20', '20')
+        for receipt in stuck:
+            self.server.txs[receipt.tx_id] = stub_stx_transfer(PAY_TO, 1, status='pending')
+        self.server.txs['0x20'] = stub_stx_transfer(PAY_TO, 1)
+
+        summary = settle_pending_payments(batch_size=2)
+
+        self.assertEqual(summary, {'confirmed': 1, 'failed': 0, 'pending': 3})
+        self.assertEqual(self.server.calls['hiro'], 2)
+        newer.refresh_from_db()
+        self.assertEqual(newer.status, 'confirmed')
+
+
+class EntitlementTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create(username='author', role='creator')
+        self.reader = User.objects.create(username='reader')
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def _posts(self, n):
+        return [
+            Post.objects.create(author=self.author, content=f'p{i}', is_premium=True, price_stx=1)
+            for i in range(n)
+        ]
+
+    def _receipt(self, resource_type, resource_id, status='confirmed'):
+        return PaymentReceipt.objects.create(
+            user=self.reader, resource_type=resource_type, resource_id=str(resource_id),
+            tx_id=f'0x{resource_type}{resource_id}', token_type='STX', amount=1, status=status,
+        )
+
+    def _access(self):
+        resp = self.client.get('/api/posts/')
+        self.assertEqual(resp.status_code, 200)
+        return {item['id']: item['has_access'] for item in resp.data['results']}
+
+    def test_post_list_reports_access_per_post(self):
+        paid, legacy, revoked, other_type, locked = self._posts(5)
+        free = Post.objects.create(author=self.author, content='free')
+        self._receipt('post', paid.pk)
+        self._receipt('generic', legacy.pk)
+        self._receipt('post', revoked.pk, status='failed')
+        self._receipt('episode', other_type.pk)
+
+        access = self._access()
+
+        self.assertTrue(access[paid.pk])
+        self.assertTrue(access[legacy.pk])
+        self.assertTrue(access[free.pk])
+        self.assertFalse(access[revoked.pk])
+        self.assertFalse(access[other_type.pk])
+        self.assertFalse(access[locked.pk])
+
+    def test_query_count_does_not_grow_with_page(self):
+        for post in self._posts(2):
+            self._receipt('post', post.pk)
+        with CaptureQueriesContext(connection) as small:
+            self._access()
+
+        for post in self._posts(10):
+            self._receipt('post', post.pk)
+        with CaptureQueriesContext(connection) as large:
+            access = self._access()
+
+        self.assertTrue(all(access.values()))
+        self.assertEqual(self._receipt_queries(small), self._receipt_queries(large))
+
+    @staticmethod
+    def _receipt_queries(ctx):
+        return sum('payments_paymentreceipt' in q['sql'] for q in ctx.captured_queries)
+
+
+class ReceiptTokenTests(TestCase):
+    def setUp(self):
+        author = User.objects.create(username='writer', role='creator', stacks_address=PAY_TO)
+        self.post = Post.objects.create(author=author, content='paid', is_premium=True, price_stx=1)
+        self.other = Post.objects.create(author=author, content='also paid', is_premium=True, price_stx=1)
+        self.client = APIClient()
+        verify = mock.patch(
+            'payments.decorators.verify_payment_signature',
+            return_value={'verified': True, 'txId': '0xee', 'tokenType': 'STX', 'status': 'success'},
+        )
+        self.verify = verify.start()
+        self.addCleanup(verify.stop)
+
+    def _buy(self, post):
+        resp = self.client.get(f'/api/posts/{post.pk}/', HTTP_PAYMENT_SIGNATURE=_signature('ee'))
+        self.assertEqual(resp.status_code, 200)
+        return json.loads(base64.b64decode(resp['payment-response']))['receiptToken']
+
+    def test_token_unlocks_without_receipt_lookup(self):
+        token = self._buy(self.post)
+        self.verify.reset_mock()
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(f'/api/posts/{self.post.pk}/', HTTP_PAYMENT_RECEIPT=token)
+
+        self.assertEqual(resp.status_code, 200)
+        self.verify.assert_not_called()
+        self.assertFalse(any('payments_paymentreceipt' in q['sql'] for q in ctx.captured_queries))
+
+    def test_token_is_scoped_to_resource_and_user(self):
+        buyer = User.objects.create(username='buyer')
+        self.client.force_authenticate(buyer)
+        token = self._buy(self.post)
+        self.assertEqual(PaymentReceipt.objects.get(user=buyer).receipt_token, token)
+
+        resp = self.client.get(f'/api/posts/{self.other.pk}/', HTTP_PAYMENT_RECEIPT=token)
+        self.assertEqual(resp.status_code, 402)
+
+        self.client.force_authenticate(User.objects.create(username='friend'))
+        resp = self.client.get(f'/api/posts/{self.post.pk}/', HTTP_PAYMENT_RECEIPT=token)
+        self.assertEqual(resp.status_code, 402)
+
+    def test_tampered_token_is_rejected(self):
+        token = self._buy(self.post)
+
+        resp = self.client.get(f'/api/posts/{self.post.pk}/', HTTP_PAYMENT_RECEIPT=token[:-2] + 'xx')
+
+        self.assertEqual(resp.status_code, 402)
+
+
+class PriceOracleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        pricing.reset_local_snapshot()
+        self.addCleanup(pricing.reset_local_snapshot)
+        self.server = StubChainServer().start()
+        self.addCleanup(self.server.stop)
+        env = mock.patch.dict('os.environ', {'PRICE_ORACLE_URL': self.server.url})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def test_convert_uses_fallback_before_first_refresh(self):
+        # 1 USDCx at the fallback 0.000015 sBTC/USDCx is 1500 sats
+        self.assertEqual(pricing.convert(1_000_000, 'USDCX', 'SBTC'), 1500)
+        self.assertEqual(self.server.calls['prices'], 0)
+
+    def test_refresh_publishes_snapshot_and_convert_stays_offline(self):
+        pricing.refresh_prices()
+        pricing.reset_local_snapshot()  # force a read through the shared cache
+
+        self.assertEqual(pricing.convert(1_000_000, 'USDCX', 'SBTC'), 1000)   # $1 at $100k/BTC
+        self.assertEqual(pricing.convert(2_000_000, 'USDCX', 'STX'), 1_000_000)  # $2 at $2/STX
+        self.assertEqual(self.server.calls['prices'], 1)
+
+    def test_failed_refresh_keeps_previous_snapshot(self):
+        pricing.refresh_prices()
+        self.server.prices['bitcoin'] = 0
+
+        pricing.refresh_prices()
+
+        self.assertEqual(pricing.get_snapshot()['rates']['SBTC'], 100_000.0)
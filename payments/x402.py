@@ -1,7 +1,22 @@
-import uuid, base64, json, requests, os
+import uuid, base64, json, os, hashlib, logging, time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta, timezone
 
-FACILITATOR_URL = os.environ.get("X402_FACILITATOR_URL", "https://x402.aibtc.dev")
+from django.core.cache import cache
+
+from . import chain
+
+logger = logging.getLogger(__name__)
+
+# Shared pool for racing the facilitator against Hiro
+_verify_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="x402-verify")
+
+# Verification result cache, keyed by (txId, payTo, resource, amounts).
+# A confirmed tx never changes, so it is kept for a long time; a pending one
+# only briefly. payments.settlement polls pending txs (one batched Hiro call
+# per page) and overwrites the entry with the final result.
+VERIFIED_TX_TTL = 30 * 24 * 3600
+PENDING_TX_TTL = 30
 
 def build_payment_required_header(pay_to: str, amount_stx: int, amount_usdcx: int,
                                    resource: str, description: str, amount_sbtc: int = 0) -> str:
@@ -35,16 +50,15 @@ def check_tx_on_blockchain(tx_id: str, expected_pay_to: str, expected_amounts: d
     # Standardize 0x prefix for blockchain check
     clean_tx_id = tx_id if tx_id.startswith("0x") else f"0x{tx_id}"
     
-    base_url = "https://api.mainnet.hiro.so" if network == "mainnet" else "https://api.testnet.hiro.so"
     try:
-        resp = requests.get(f"{base_url}/extended/v1/tx/{clean_tx_id}", timeout=15)
+        resp = chain.hiro_get_tx(clean_tx_id, network)
         if resp.status_code == 200:
             data = resp.json()
             status = data.get("tx_status")
             
             # We ONLY accept success or pending
             if status not in ["success", "pending"]:
-                return {"verified": False, "error": f"Transaction status is {status}"}
+                return {"verified": False, "status": status, "error": f"Transaction status is {status}"}
 
             # Verify STX transfers
             if token_type == "STX" and data.get("tx_type") == "token_transfer":
@@ -85,50 +99,129 @@ def check_tx_on_blockchain(tx_id: str, expected_pay_to: str, expected_amounts: d
         return {"verified": False, "error": str(e)}
 
 
+def _normalize_tx_id(tx_id: str) -> str:
+    return tx_id if tx_id.startswith("0x") else f"0x{tx_id}"
+
+
+def _signature_tx(signature_b64: str):
+    """Return (txId, tokenType) from a payment-signature header, or ("", "STX")."""
+    try:
+        sig_data = json.loads(base64.b64decode(signature_b64))
+        return sig_data.get("txId") or "", sig_data.get("tokenType", "STX")
+    except Exception:
+        return "", "STX"
+
+
+def verification_cache_key(tx_id: str, pay_to: str, resource: str, expected_amounts: dict) -> str:
+    amounts = ":".join(str(int(expected_amounts.get(k, 0) or 0)) for k in ("stx", "usdcx", "sbtc"))
+    raw = f"{_normalize_tx_id(tx_id)}|{pay_to}|{resource}|{amounts}"
+    return f"x402:verified:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+def cache_verification_result(cache_key: str, result: dict) -> None:
+    """Store a verification result: confirmed for VERIFIED_TX_TTL, pending for PENDING_TX_TTL."""
+    if result.get("verified"):
+        timeout = PENDING_TX_TTL if result.get("status") == "pending" else VERIFIED_TX_TTL
+    elif result.get("status") not in (None, "pending"):
+        # Hiro gave a terminal failure (abort_*, dropped_*): it will never succeed
+        timeout = VERIFIED_TX_TTL
+    else:
+        return
+    cache.set(cache_key, result, timeout=timeout)
+
+
 def verify_payment_signature(signature_b64: str, expected_pay_to: str,
                               resource: str, expected_amounts: dict) -> dict:
     """
-    POST to aibtcdev facilitator to verify the payment transaction.
-    Returns verified payload or raises a requests exception.
+    Verify a payment signature, serving repeat checks of the same
+    (txId, payTo, resource, amounts) from the verification cache.
+
+    A pending tx is accepted as before; its receipt is settled, and this
+    cache entry overwritten, by payments.settlement instead of a re-poll here.
     """
-    network = os.environ.get("STACKS_NETWORK", "mainnet").lower()
-    
     # Support for old calls that might not provide expected_amounts dict properly
     if not isinstance(expected_amounts, dict):
         expected_amounts = {'stx': 0, 'usdcx': 0, 'sbtc': 0}
 
+    tx_id, _ = _signature_tx(signature_b64)
+    if not tx_id:
+        return _verify_payment_signature(signature_b64, expected_pay_to, resource, expected_amounts)
+
+    cache_key = verification_cache_key(tx_id, expected_pay_to, resource, expected_amounts)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    result = _verify_payment_signature(signature_b64, expected_pay_to, resource, expected_amounts)
+    cache_verification_result(cache_key, result)
+    return result
+
+
+def _is_authoritative(source: str, result: dict) -> bool:
+    """
+    A positive answer from either side settles verification. From Hiro, a
+    terminal tx status (abort_*, dropped_*) settles it negatively too; any
+    other negative only counts once the facilitator has also said no.
+    """
+    if result.get("verified"):
+        return True
+    return source == "hiro" and result.get("status") not in (None, "pending")
+
+
+def _facilitator_check(signature_b64: str, expected_pay_to: str, resource: str) -> dict:
     try:
-        resp = requests.post(
-            f"{FACILITATOR_URL}/verify",
-            json={
-                "paymentSignature": signature_b64,
-                "payTo": expected_pay_to,
-                "resource": resource,
-            },
-            timeout=15,
-        )
+        resp = chain.facilitator_verify(signature_b64, expected_pay_to, resource)
         if resp.ok:
             result = resp.json()
             if result.get("verified"):
                 return result
+        return {"verified": False, "error": f"Facilitator returned {resp.status_code}"}
     except Exception as e:
-        print(f"Facilitator Error: {e}")
+        logger.warning(f"[x402] facilitator error: {e}")
+        return {"verified": False, "error": f"Facilitator error: {e}"}
 
-    # Fallback: check blockchain directly
-    try:
-        sig_data = json.loads(base64.b64decode(signature_b64))
-        tx_id = sig_data.get("txId")
-        token_type = sig_data.get("tokenType", "STX")
-        
-        if tx_id:
-            return check_tx_on_blockchain(
-                tx_id=tx_id, 
-                expected_pay_to=expected_pay_to, 
-                expected_amounts=expected_amounts,
-                token_type=token_type,
-                network=network
-            )
-    except Exception as e:
-        return {"verified": False, "error": f"Fallback verification failed: {str(e)}"}
 
-    return {"verified": False, "error": "Facilitator failed and no valid TX ID found in signature"}
+def _verify_payment_signature(signature_b64: str, expected_pay_to: str,
+                               resource: str, expected_amounts: dict) -> dict:
+    """
+    Race the aibtcdev facilitator against a direct Hiro lookup and return
+    the first authoritative answer (see _is_authoritative), so a payment
+    costs at most one REQUEST_TIMEOUT of wall time instead of two.
+    """
+    network = os.environ.get("STACKS_NETWORK", "mainnet").lower()
+    tx_id, token_type = _signature_tx(signature_b64)
+
+    futures = {
+        _verify_pool.submit(_facilitator_check, signature_b64, expected_pay_to, resource): "facilitator",
+    }
+    if tx_id:
+        futures[_verify_pool.submit(
+            check_tx_on_blockchain,
+            tx_id=tx_id,
+            expected_pay_to=expected_pay_to,
+            expected_amounts=expected_amounts,
+            token_type=token_type,
+            network=network,
+        )] = "hiro"
+
+    results = {}
+    pending = set(futures)
+    deadline = time.monotonic() + chain.REQUEST_TIMEOUT + 1
+    while pending:
+        done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            source = futures[future]
+            try:
+                results[source] = future.result()
+            except Exception as e:
+                results[source] = {"verified": False, "error": f"{source} check failed: {e}"}
+            if _is_authoritative(source, results[source]):
+                return results[source]
+
+    if "hiro" in results:
+        return results["hiro"]
+    if not tx_id:
+        return {"verified": False, "error": "Facilitator failed and no valid TX ID found in signature"}
+    return {"verified": False, "error": "Payment verification timed out"}
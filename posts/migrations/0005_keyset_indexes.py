@@ -0,0 +1,32 @@
+# Generated by Django 5.2.12 on 2026-10-18 21:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0003_backfill_show_community'),
+        ('posts', '0004_engagement_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='posts_post_created_183a3b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='posts_post_author__f8ea20_idx',
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-created_at', '-id'], name='posts_post_created_a7e5d4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', '-created_at', '-id'], name='posts_post_author__85d846_idx'),
+        ),
+    ]
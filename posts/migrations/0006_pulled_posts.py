@@ -0,0 +1,37 @@
+# Generated by Django 5.2.12 on 2026-10-18 22:25
+
+import os
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def flag_large_author_posts(apps, schema_editor):
+    # Until now posts by authors over the limit were pulled by follower count;
+    # keep those readable
+    Post = apps.get_model('posts', 'Post')
+    limit = int(os.environ.get('FEED_FANOUT_FOLLOWER_LIMIT', 10_000))
+    Post.objects.filter(author__follower_count__gt=limit).update(pulled=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0003_backfill_show_community'),
+        ('posts', '0005_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('users', '0020_user_follow_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='pulled',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('pulled', True)), fields=['author', '-id'], name='post_pulled_author_idx'),
+        ),
+        migrations.RunPython(flag_large_author_posts, migrations.RunPython.noop),
+    ]
@@ -37,21 +37,19 @@ class Post(models.Model):
     # Engagement via generic relations (reuses existing Like/Comment system)
     likes = GenericRelation('users.Like', related_query_name='post')
     comments = GenericRelation('users.Comment', related_query_name='post')
+    # Stored counters, kept in step by users.signals (update_counts recomputes them)
+    like_count = models.IntegerField(default=0)
+    comment_count = models.IntegerField(default=0)
+    # Not fanned out (author over the limit when posting); feeds pull it at read time (posts.timeline)
+    pulled = models.BooleanField(default=False)
 
     class Meta:
         ordering = ['-is_pinned', '-created_at']
         indexes = [
-            models.Index(fields=['-created_at']),
-            models.Index(fields=['author', '-created_at']),
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['author', '-created_at', '-id']),
+            models.Index(fields=['author', '-id'], condition=models.Q(pulled=True), name='post_pulled_author_idx'),
         ]
 
     def __str__(self):
         return f"{self.author.username}: {self.content[:50]}"
-
-    @property
-    def like_count(self):
-        return self.likes.count()
-
-    @property
-    def comment_count(self):
-        return self.comments.count()
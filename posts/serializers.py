@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Post
+from payments.entitlements import RESOURCE_POST, has_access
+from payments.serializers import UnlockedListSerializer
+from api.viewer_state import LIKED, FOLLOWING_OWNER, ViewerStateField, ViewerStateListSerializer
 
 User = get_user_model()
 
@@ -13,37 +16,36 @@ class PostAuthorSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class PostListSerializer(ViewerStateListSerializer, UnlockedListSerializer):
+    """Batches both viewer state and receipt lookups for a page of posts."""
+
+
 class PostSerializer(serializers.ModelSerializer):
     """Full post serializer with engagement data"""
     author = PostAuthorSerializer(read_only=True)
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
-    user_has_liked = serializers.SerializerMethodField()
+    like_count = serializers.IntegerField(read_only=True)
+    comment_count = serializers.IntegerField(read_only=True)
+    user_has_liked = ViewerStateField(LIKED)
+    user_is_following_owner = ViewerStateField(FOLLOWING_OWNER)
+    has_access = serializers.SerializerMethodField()
+    unlock_resource_type = RESOURCE_POST
+    viewer_relations = (LIKED, FOLLOWING_OWNER)
+    viewer_owner_field = 'author_id'
 
     class Meta:
         model = Post
         fields = [
             'id', 'author', 'content', 'image', 'is_pinned',
-            'is_premium', 'price_stx', 'price_usdcx',
+            'is_premium', 'price_stx', 'price_usdcx', 'has_access',
             'created_at', 'updated_at',
-            'like_count', 'comment_count', 'user_has_liked'
+            'like_count', 'comment_count', 'user_has_liked', 'user_is_following_owner',
         ]
         read_only_fields = ['id', 'author', 'created_at', 'updated_at']
+        list_serializer_class = PostListSerializer
 
-    def get_like_count(self, obj):
-        return getattr(obj, '_like_count', obj.like_count)
-
-    def get_comment_count(self, obj):
-        return getattr(obj, '_comment_count', obj.comment_count)
-
-    def get_user_has_liked(self, obj):
+    def get_has_access(self, obj):
         request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            # Use prefetched data if available
-            if hasattr(obj, '_user_has_liked'):
-                return obj._user_has_liked
-            return obj.likes.filter(user=request.user).exists()
-        return False
+        return has_access(obj, getattr(request, 'user', None), RESOURCE_POST, owner_id=obj.author_id)
 
 
 class PostCreateSerializer(serializers.ModelSerializer):
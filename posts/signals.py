@@ -0,0 +1,31 @@
+"""
+Queue timeline writes (posts.timeline) for new posts and follow changes.
+Nothing is queued when no timeline store is configured.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from users.models import Follow
+from . import timeline
+from .models import Post
+
+
+@receiver(post_save, sender=Post)
+def fan_out_new_post(sender, instance, created, **kwargs):
+    if created and timeline.get_store() is not None:
+        from .tasks import fan_out_post
+        timeline.enqueue(fan_out_post, instance.pk)
+
+
+@receiver(post_save, sender=Follow)
+def backfill_followed_author(sender, instance, created, **kwargs):
+    if created and timeline.get_store() is not None:
+        from .tasks import sync_follow_timeline
+        timeline.enqueue(sync_follow_timeline, instance.follower_id, instance.following_id, True)
+
+
+@receiver(post_delete, sender=Follow)
+def drop_unfollowed_author(sender, instance, **kwargs):
+    if timeline.get_store() is not None:
+        from .tasks import sync_follow_timeline
+        timeline.enqueue(sync_follow_timeline, instance.follower_id, instance.following_id, False)
@@ -0,0 +1,26 @@
+from celery import shared_task
+
+from . import timeline
+
+
+@shared_task
+def fan_out_post(post_id):
+    """Push a new post into its author's followers' timelines (posts.timeline)."""
+    from .models import Post
+    store = timeline.get_store()
+    post = Post.objects.select_related('author').filter(pk=post_id).first()
+    if store is None or post is None:
+        return
+    if not timeline.is_fanout_author(post.author):
+        # Merged into feeds at read time, even after the author drops under the limit
+        Post.objects.filter(pk=post.pk).update(pulled=True)
+        return
+    timeline.fan_out(store, post)
+
+
+@shared_task
+def sync_follow_timeline(follower_id, author_id, following):
+    """Backfill (follow) or drop (unfollow) an author's posts in one follower's timeline."""
+    store = timeline.get_store()
+    if store is not None:
+        timeline.follow_changed(store, follower_id, author_id, following)
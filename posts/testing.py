@@ -0,0 +1,44 @@
+"""
+In-process stand-in for posts.timeline.RedisTimelineStore, for tests:
+
+    with mock.patch('posts.timeline.get_store', return_value=InMemoryTimelineStore()):
+        ...
+"""
+from . import timeline
+
+
+class InMemoryTimelineStore:
+    def __init__(self):
+        # user_id -> set of post ids; a key present means the timeline is built
+        self.timelines = {}
+        # user_id -> lowest id the timeline is complete down to (0 = untrimmed)
+        self.floors = {}
+        self.calls = {'push': 0, 'page': 0, 'replace': 0}
+
+    def push(self, user_ids, post_ids):
+        self.calls['push'] += 1
+        for user_id in user_ids:
+            if user_id in self.timelines:
+                ids = sorted(self.timelines[user_id] | set(post_ids), reverse=True)
+                if len(ids) > timeline.TIMELINE_MAX_LEN:
+                    ids = ids[:timeline.TIMELINE_MAX_LEN]
+                    self.floors[user_id] = max(self.floors[user_id], ids[-1])
+                self.timelines[user_id] = set(ids)
+
+    def remove(self, user_id, post_ids):
+        if user_id in self.timelines:
+            self.timelines[user_id] -= set(post_ids)
+
+    def replace(self, user_id, post_ids, floor=0):
+        self.calls['replace'] += 1
+        self.timelines[user_id] = set(post_ids)
+        self.floors[user_id] = floor
+
+    def page(self, user_id, before=None, limit=20):
+        self.calls['page'] += 1
+        if user_id not in self.timelines:
+            return None
+        ids = sorted(self.timelines[user_id], reverse=True)
+        if before:
+            ids = [pk for pk in ids if pk < before]
+        return ids[:limit], self.floors[user_id]
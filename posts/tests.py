@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from users.follows import follow_user, unfollow
+from users.models import User
+from .models import Post
+from .testing import InMemoryTimelineStore
+
+
+def run_inline(task, *args):
+    task(*args)
+
+
+@mock.patch('posts.timeline.enqueue', side_effect=run_inline)
+class TimelineFeedTests(TestCase):
+    def setUp(self):
+        self.store = InMemoryTimelineStore()
+        patcher = mock.patch('posts.timeline.get_store', return_value=self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.reader = User.objects.create(username='reader')
+        self.authors = [User.objects.create(username=f'author{i}', role='creator') for i in range(3)]
+        for author in self.authors:
+            follow_user(self.reader, author.pk)
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def _feed_ids(self, **params):
+        resp = self.client.get('/api/posts/feed/', params)
+        self.assertEqual(resp.status_code, 200)
+        return [row['id'] for row in resp.data['results']], resp.data['next']
+
+    def test_new_posts_are_fanned_out_to_built_timelines(self, enqueue):
+        old = Post.objects.create(author=self.authors[0], content='old')
+        self.assertEqual(self._feed_ids()[0], [old.pk])  # cold read builds the timeline
+        self.assertEqual(self.store.calls['replace'], 1)
+
+        new = Post.objects.create(author=self.authors[1], content='new')
+
+        self.assertIn(new.pk, self.store.timelines[self.reader.pk])
+        self.assertEqual(self._feed_ids()[0], [new.pk, old.pk])
+        self.assertEqual(self.store.calls['replace'], 1)
+
+    def test_unfollow_drops_and_follow_backfills(self, enqueue):
+        post = Post.objects.create(author=self.authors[2], content='hi')
+        self._feed_ids()
+        follow = self.reader.following.get(following=self.authors[2])
+
+        unfollow(follow)
+        self.assertEqual(self._feed_ids()[0], [])
+
+        follow_user(self.reader, self.authors[2].pk)
+        self.assertEqual(self._feed_ids()[0], [post.pk])
+
+    def test_large_authors_are_pulled_at_read_time(self, enqueue):
+        self._feed_ids()
+        with mock.patch.dict('os.environ', {'FEED_FANOUT_FOLLOWER_LIMIT': '0'}):
+            post = Post.objects.create(author=self.authors[0], content='big')
+            self.assertNotIn(post.pk, self.store.timelines[self.reader.pk])
+            self.assertEqual(self._feed_ids()[0], [post.pk])
+
+    def test_author_back_under_the_limit_keeps_pulled_posts(self, enqueue):
+        self._feed_ids()
+        with mock.patch.dict('os.environ', {'FEED_FANOUT_FOLLOWER_LIMIT': '0'}):
+            big = Post.objects.create(author=self.authors[0], content='big')
+        small = Post.objects.create(author=self.authors[0], content='small again')
+        self.assertEqual(self._feed_ids()[0], [small.pk, big.pk])
+
+    @mock.patch('posts.timeline.TIMELINE_MAX_LEN', 3)
+    def test_trimmed_timeline_pages_on_from_db_after_unfollow(self, enqueue):
+        self._feed_ids()
+        kept = [Post.objects.create(author=self.authors[0], content=f'a{i}') for i in range(4)]
+        dropped = [Post.objects.create(author=self.authors[1], content=f'b{i}') for i in range(2)]
+        self.assertEqual(self.store.floors[self.reader.pk], dropped[0].pk - 1)
+
+        # The timeline shrinks below TIMELINE_MAX_LEN; author0's older posts must stay reachable
+        unfollow(self.reader.following.get(following=self.authors[1]))
+        self.assertEqual(self._feed_ids()[0], [p.pk for p in reversed(kept)])
+
+    def test_pages_by_post_id_with_constant_queries(self, enqueue):
+        posts = [Post.objects.create(author=self.authors[i % 3], content=str(i)) for i in range(5)]
+        self._feed_ids()
+
+        with CaptureQueriesContext(connection) as ctx:
+            first, next_link = self._feed_ids(page_size=3)
+        # large authors' posts, hydration, viewer likes, viewer follows
+        self.assertLessEqual(len(ctx.captured_queries), 4)
+        self.assertEqual(first, [p.pk for p in reversed(posts)][:3])
+
+        resp = self.client.get(next_link)
+        self.assertEqual([row['id'] for row in resp.data['results']], [posts[1].pk, posts[0].pk])
@@ -0,0 +1,211 @@
+"""
+Fan-out-on-write timelines for GET /api/posts/feed/.
+
+Each follower has a Redis sorted set of post ids (score = post id, so newest
+first is a reverse range and ids double as the page cursor):
+
+    timeline:<user_id>  {post_id: post_id, ..., "0": -floor}
+
+The "0" member marks a timeline as built; timelines missing it (new, evicted
+or expired) are rebuilt from the database on the next read. Only timelines
+that exist are written to, so inactive users cost nothing.
+
+Timelines keep the newest TIMELINE_MAX_LEN ids. The marker's score is minus
+the timeline's floor: the lowest id it is complete down to, raised whenever
+push() trims and set by replace() (0 = never trimmed). Unfollows remove ids
+but leave the floor alone, so a read that runs below the floor always pages
+on from the database, however small the timeline has become.
+
+Writes happen in Celery (posts.tasks), queued on commit by posts.signals:
+    - a new post is pushed to every follower of its author
+    - following someone backfills their recent posts, unfollowing drops them
+
+Posts by authors with more than FANOUT_FOLLOWER_LIMIT followers are not
+fanned out; they are flagged Post.pulled and merged in at read time (hybrid
+fan-out-on-read). The flag is per post, so an author who later falls back
+under the limit keeps their earlier posts readable. A read is one
+ZREVRANGEBYSCORE, one query for followed authors' pulled posts and one
+batched hydration query, whatever the follow count.
+
+Without TIMELINE_REDIS_URL / REDIS_URL get_store() returns None and the feed
+falls back to querying posts by followed author.
+"""
+import os
+import logging
+
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+TIMELINE_REDIS_URL = lambda: os.environ.get('TIMELINE_REDIS_URL') or os.environ.get('REDIS_URL')
+FANOUT_FOLLOWER_LIMIT = lambda: int(os.environ.get('FEED_FANOUT_FOLLOWER_LIMIT', 10_000))
+
+KEY_PREFIX = 'timeline:'
+BUILT_MARKER = '0'
+# Newest posts kept per timeline; pages past the floor come from the database
+TIMELINE_MAX_LEN = 800
+TIMELINE_TTL = 7 * 24 * 3600
+FANOUT_CHUNK = 1000
+
+_store = {'url': None, 'store': None}
+
+
+class RedisTimelineStore:
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url):
+        import redis
+        return cls(redis.Redis.from_url(url))
+
+    def _key(self, user_id):
+        return f'{KEY_PREFIX}{user_id}'
+
+    def push(self, user_ids, post_ids):
+        """Add ``post_ids`` to each built timeline among ``user_ids``."""
+        entries = {str(pk): pk for pk in post_ids}
+        if not entries:
+            return
+        keys = [self._key(uid) for uid in user_ids]
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.exists(key)
+        built = [key for key, exists in zip(keys, pipe.execute()) if exists]
+
+        pipe = self.client.pipeline(transaction=False)
+        for key in built:
+            pipe.zadd(key, entries)
+            # Rank 0 is the marker; keep it and the newest TIMELINE_MAX_LEN ids
+            pipe.zremrangebyrank(key, 1, -(TIMELINE_MAX_LEN + 1))
+        trimmed = [key for key, removed in zip(built, pipe.execute()[1::2]) if removed]
+        if not trimmed:
+            return
+
+        # Raise the floor of trimmed timelines to their lowest remaining id
+        pipe = self.client.pipeline(transaction=False)
+        for key in trimmed:
+            pipe.zrange(key, 1, 1, withscores=True)
+        pipe_set = self.client.pipeline(transaction=False)
+        for key, lowest in zip(trimmed, pipe.execute()):
+            if lowest:
+                # LT: floors only go up (the marker score only goes down)
+                pipe_set.zadd(key, {BUILT_MARKER: -lowest[0][1]}, lt=True)
+        pipe_set.execute()
+
+    def remove(self, user_id, post_ids):
+        if post_ids:
+            self.client.zrem(self._key(user_id), *[str(pk) for pk in post_ids])
+
+    def replace(self, user_id, post_ids, floor=0):
+        key = self._key(user_id)
+        pipe = self.client.pipeline()
+        pipe.delete(key)
+        pipe.zadd(key, {BUILT_MARKER: -floor, **{str(pk): pk for pk in post_ids}})
+        pipe.expire(key, TIMELINE_TTL)
+        pipe.execute()
+
+    def page(self, user_id, before=None, limit=20):
+        """(newest post ids below ``before``, floor), or None if the timeline is not built."""
+        key = self._key(user_id)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zscore(key, BUILT_MARKER)
+        pipe.zrevrangebyscore(key, f'({before}' if before else '+inf', '(0', start=0, num=limit)
+        pipe.expire(key, TIMELINE_TTL)
+        marker, ids, _ = pipe.execute()
+        if marker is None:
+            return None
+        return [int(pk) for pk in ids], int(-marker)
+
+
+def get_store():
+    """The configured timeline store, or None when no Redis is configured."""
+    url = TIMELINE_REDIS_URL()
+    if not url:
+        return None
+    if _store['url'] != url:
+        _store['store'] = RedisTimelineStore.from_url(url)
+        _store['url'] = url
+    return _store['store']
+
+
+def is_fanout_author(user):
+    return user.follower_count <= FANOUT_FOLLOWER_LIMIT()
+
+
+def enqueue(task, *args):
+    """Queue ``task`` once the current transaction commits; run it inline if the broker is down."""
+    def send():
+        try:
+            task.apply_async(args=args, retry=False)
+        except Exception as e:
+            logger.warning(f"[timeline] could not queue {task.name}, running inline: {e}")
+            task(*args)
+    transaction.on_commit(send)
+
+
+def _recent_post_ids(**filters):
+    """The newest TIMELINE_MAX_LEN fanned-out post ids matching ``filters``."""
+    from .models import Post
+    return list(
+        Post.objects.filter(pulled=False, **filters).order_by('-id').values_list('id', flat=True)[:TIMELINE_MAX_LEN]
+    )
+
+
+def fan_out(store, post):
+    """Push ``post`` to the timelines of its author's followers, in chunks."""
+    from users.models import Follow
+    follower_ids = Follow.objects.filter(following_id=post.author_id).values_list('follower_id', flat=True)
+    chunk = []
+    for follower_id in follower_ids.iterator(chunk_size=FANOUT_CHUNK):
+        chunk.append(follower_id)
+        if len(chunk) == FANOUT_CHUNK:
+            store.push(chunk, [post.pk])
+            chunk = []
+    if chunk:
+        store.push(chunk, [post.pk])
+
+
+def follow_changed(store, follower_id, author_id, following):
+    """Backfill or drop ``author_id``'s recent posts in ``follower_id``'s timeline."""
+    # Their pulled posts are merged in at read time either way
+    post_ids = _recent_post_ids(author_id=author_id)
+    if following:
+        store.push([follower_id], post_ids)
+    else:
+        store.remove(follower_id, post_ids)
+
+
+def rebuild(store, user_id):
+    post_ids = _recent_post_ids(author__followers__follower_id=user_id)
+    # A full rebuild may have cut off older posts; below its last id, read the database
+    floor = post_ids[-1] if len(post_ids) == TIMELINE_MAX_LEN else 0
+    store.replace(user_id, post_ids, floor)
+
+
+def feed_post_ids(store, user, before=None, limit=20):
+    """Ids of the newest ``limit`` feed posts for ``user`` with id below ``before``."""
+    from users.models import Follow
+    from .models import Post
+
+    page = store.page(user.pk, before, limit)
+    if page is None:
+        rebuild(store, user.pk)
+        page = store.page(user.pk, before, limit) or ([], 0)
+    ids, floor = page
+    # Backfills may have added ids below the floor; the timeline is only complete above it
+    ids = [pk for pk in ids if pk >= floor]
+    candidates = set(ids)
+
+    # Posts of authors over the fan-out limit were not fanned out; pull them in
+    followed = Follow.objects.filter(follower=user).values('following_id')
+    pulled = Post.objects.filter(pulled=True, author_id__in=followed)
+    if before:
+        pulled = pulled.filter(id__lt=before)
+    candidates.update(pulled.order_by('-id').values_list('id', flat=True)[:limit])
+
+    # Past the floor of a trimmed timeline, page on from the database
+    if floor and len(ids) < limit:
+        older = Post.objects.filter(author__followers__follower=user, id__lt=min(floor, before or floor))
+        candidates.update(older.order_by('-id').values_list('id', flat=True)[:limit])
+    return sorted(candidates, reverse=True)[:limit]
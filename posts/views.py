@@ -2,11 +2,15 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
-from django.db.models import Count, Exists, OuterRef, Subquery
 from .models import Post
 from .serializers import PostSerializer, PostCreateSerializer
 from payments.decorators import x402_required
+from payments.entitlements import RESOURCE_POST, annotate_unlocked
+from payments.pricing import convert
 from communities.mixins import CommunityWriteMixin
+from api.pagination import BoundedPageNumberPagination, KeysetPagination
+from rest_framework.utils.urls import replace_query_param
+from . import timeline
 from django.conf import settings
 
 
@@ -37,15 +41,14 @@ class PostViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
         
         if instance.is_premium:
             def get_pay_to(req, **kw):
-                return instance.author.stx_address or getattr(settings, 'PLATFORM_WALLET_ADDRESS', 'SP...')
+                return instance.author.stacks_address or getattr(settings, 'PLATFORM_WALLET_ADDRESS', 'SP...')
             
             def get_amounts(req, **kw):
-                # (STX, USDCx, sBTC) — sBTC derived from USDCx at demo rate
-                sbtc_per_usdcx = 0.000015
+                # (STX, USDCx, sBTC) — sBTC priced off the USDCx amount at the cached oracle rate
                 return (
                     instance.price_stx,
                     instance.price_usdcx,
-                    int(float(instance.price_usdcx) * sbtc_per_usdcx * 100_000_000),
+                    convert(instance.price_usdcx, 'USDCX', 'SBTC'),
                 )
 
             @x402_required(get_pay_to, get_amounts, description=f"Unlock Post by {instance.author.username}")
@@ -53,35 +56,18 @@ class PostViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
                 serializer = self.get_serializer(instance)
                 return Response(serializer.data)
             
-            return gated_retrieve(request, *args, **kwargs)
+            return gated_retrieve(request, *args, resource_type=RESOURCE_POST, **kwargs)
 
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
     def get_queryset(self):
-        from users.models import Like
-        from django.contrib.contenttypes.models import ContentType
-
+        # user_has_liked and friends are batched per page by PostSerializer
+        # (api.viewer_state) rather than annotated per row here
         queryset = Post.objects.select_related('author')
 
-        # Annotate with like/comment counts for performance
-        queryset = queryset.annotate(
-            _like_count=Count('likes', distinct=True),
-            _comment_count=Count('comments', distinct=True),
-        )
-
-        # Annotate user_has_liked if authenticated
-        if self.request.user.is_authenticated:
-            post_ct = ContentType.objects.get_for_model(Post)
-            queryset = queryset.annotate(
-                _user_has_liked=Exists(
-                    Like.objects.filter(
-                        user=self.request.user,
-                        content_type=post_ct,
-                        object_id=OuterRef('pk')
-                    )
-                )
-            )
+        # Whether the viewer holds a receipt for each (premium) post
+        queryset = annotate_unlocked(queryset, self.request.user, RESOURCE_POST)
 
         # Filter by author
         author_id = self.request.query_params.get('author')
@@ -125,9 +111,18 @@ class PostViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
         """
         Personalized feed: posts from creators the user follows.
         GET /api/posts/feed/
+
+        Served from the follower's timeline (posts.timeline) when a timeline
+        store is configured, paged with ?before=<post id>. Otherwise cursor
+        paginated on (created_at, id). ?pagination=legacy for page numbers.
         """
         from users.models import Follow
 
+        paginator = KeysetPagination()
+        store = timeline.get_store()
+        if store is not None and not paginator.wants_legacy(request):
+            return self._timeline_feed(request, store)
+
         # Get IDs of users this user follows
         following_ids = Follow.objects.filter(
             follower=request.user
@@ -135,10 +130,30 @@ class PostViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
 
         queryset = self.get_queryset().filter(author_id__in=following_ids)
 
-        page = self.paginate_queryset(queryset)
+        page = paginator.paginate_queryset(queryset, request, view=self)
         if page is not None:
             serializer = PostSerializer(page, many=True, context={'request': request})
-            return self.get_paginated_response(serializer.data)
+            return paginator.get_paginated_response(serializer.data)
 
         serializer = PostSerializer(queryset, many=True, context={'request': request})
         return Response(serializer.data)
+
+    def _timeline_feed(self, request, store):
+        """One page of the timeline, hydrated in a single query."""
+        paginator = BoundedPageNumberPagination()
+        limit = paginator.get_page_size(request)
+        before = request.query_params.get('before')
+        before = int(before) if before and before.isdigit() else None
+
+        ids = timeline.feed_post_ids(store, request.user, before=before, limit=limit)
+        posts = self.get_queryset().in_bulk(ids)
+        page = [posts[pk] for pk in ids if pk in posts]
+
+        next_link = None
+        if len(ids) == limit:
+            next_link = replace_query_param(request.build_absolute_uri(), 'before', ids[-1])
+        return Response({
+            'next': next_link,
+            'previous': None,
+            'results': PostSerializer(page, many=True, context={'request': request}).data,
+        })
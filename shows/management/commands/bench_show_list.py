@@ -0,0 +1,171 @@
+"""
+Query-count and latency benchmark for GET /api/shows/.
+
+Seeds a synthetic catalogue (default 10k shows, 1M likes) inside a
+transaction that is rolled back at the end, then times the list endpoint
+next to the pre-rewrite queryset shape (likes/comments prefetch, joined
+Count annotations, one M2M join per ?tags= id, blanket DISTINCT).
+
+    python manage.py bench_show_list --shows 10000 --likes 1000000 --iterations 20
+
+Nothing is left behind in the database, but seeding 1M rows takes a while;
+use --shows/--likes to scale down.
+"""
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from shows.models import Show, Tag
+from shows.serializers import ShowListSerializer
+from shows.views import ShowViewSet
+from users.models import Like, User
+
+BATCH = 5000
+TAGS_PER_SHOW = 5
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the show list endpoint against a seeded catalogue (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shows', type=int, default=10_000)
+        parser.add_argument('--likes', type=int, default=1_000_000)
+        parser.add_argument('--tags', type=int, default=20)
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._seed(options['shows'], options['likes'], options['tags'])
+                self._run(options['iterations'])
+                raise Rollback
+        except Rollback:
+            self.stdout.write('Seed data rolled back')
+
+    def _seed(self, n_shows, n_likes, n_tags):
+        started = time.perf_counter()
+        likes_per_show = max(1, n_likes // max(1, n_shows))
+        users = User.objects.bulk_create(
+            [User(username=f'bench_user_{i}', role='creator') for i in range(likes_per_show)],
+            batch_size=BATCH,
+        )
+        self.creator = users[0]
+        self.tags = Tag.objects.bulk_create(
+            [Tag(name=f'bench-tag-{i}', slug=f'bench-tag-{i}') for i in range(n_tags)]
+        )
+        shows = Show.objects.bulk_create(
+            [
+                Show(
+                    title=f'Bench show {i}', slug=f'bench-show-{i}', description='x' * 500,
+                    creator=users[i % len(users)], status='published', like_count=likes_per_show,
+                )
+                for i in range(n_shows)
+            ],
+            batch_size=BATCH,
+        )
+        Through = Show.tags.through
+        Through.objects.bulk_create(
+            [
+                Through(show_id=show.pk, tag_id=self.tags[(i + k) % n_tags].pk)
+                for i, show in enumerate(shows) for k in range(TAGS_PER_SHOW)
+            ],
+            batch_size=BATCH,
+        )
+        Show.co_hosts.through.objects.bulk_create(
+            [Show.co_hosts.through(show_id=show.pk, user_id=self.creator.pk) for show in shows[1::7]],
+            batch_size=BATCH,
+        )
+
+        show_ct = ContentType.objects.get_for_model(Show)
+        batch = []
+        for show in shows:
+            for user in users:
+                batch.append(Like(user_id=user.pk, content_type=show_ct, object_id=show.pk))
+                if len(batch) >= BATCH:
+                    Like.objects.bulk_create(batch)
+                    batch = []
+        if batch:
+            Like.objects.bulk_create(batch)
+
+        self.stdout.write(
+            f"Seeded {len(shows)} shows, {len(shows) * len(users)} likes, {n_tags} tags "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+    def _run(self, iterations):
+        # Pagination links need a host the settings accept
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h and h != '*'), 'localhost')
+        factory = APIRequestFactory(HTTP_HOST=host)
+        view = ShowViewSet.as_view({'get': 'list'})
+
+        def lean_page(params):
+            request = factory.get('/api/shows/', params)
+            response = view(request)
+            assert response.status_code == 200, response.data
+            return response.data
+
+        def tags(n):
+            return ','.join(str(tag.pk) for tag in self.tags[:n])
+
+        scenarios = [
+            ('plain', {}),
+            ('creator', {'creator': self.creator.pk}),
+            ('2 tags', {'tags': tags(2)}),
+            ('3 tags', {'tags': tags(3)}),
+            ('5 tags', {'tags': tags(5)}),
+            ('5 tags any', {'tags': tags(5), 'tags_mode': 'any'}),
+        ]
+        for label, params in scenarios:
+            self._measure(f'legacy  {label}', iterations, lambda: self._legacy_page(params))
+            self._measure(f'lean    {label}', iterations, lambda: lean_page(params))
+
+    def _legacy_page(self, params):
+        """The list queryset as it was before the rewrite."""
+        queryset = Show.objects.select_related('creator').prefetch_related('tags', 'co_hosts').annotate(
+            _like_count=Count('likes', distinct=True),
+            _comment_count=Count('comments', distinct=True),
+            episode_count=Count('episodes', distinct=True),
+        ).prefetch_related('likes', 'comments').filter(status='published')
+        if 'creator' in params:
+            queryset = queryset.filter(
+                Q(creator_id=params['creator']) | Q(co_hosts__id=params['creator'])
+            ).distinct()
+        if 'tags' in params:
+            tag_ids = [int(tag_id) for tag_id in params['tags'].split(',')]
+            if params.get('tags_mode') == 'any':
+                queryset = queryset.filter(tags__id__in=tag_ids)
+            else:
+                # One join on the through table per tag
+                for tag_id in tag_ids:
+                    queryset = queryset.filter(tags__id=tag_id)
+        queryset = queryset.distinct().order_by('-created_at')
+        queryset.count()
+        return ShowListSerializer(queryset[:20], many=True).data
+
+    def _measure(self, label, iterations, call):
+        call()  # warm caches
+        samples = []
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(iterations):
+                started = time.perf_counter()
+                call()
+                samples.append(time.perf_counter() - started)
+        queries = len(ctx.captured_queries) // iterations
+        samples.sort()
+        p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+        self.stdout.write(
+            f"{label:<19} queries={queries:<4} "
+            f"p50={statistics.median(samples) * 1000:9.1f}ms  "
+            f"p95={p95 * 1000:9.1f}ms"
+        )
@@ -1,25 +1,59 @@
-from django.core.management.base import BaseCommand
+"""
+Management command to recompute the stored like_count / comment_count.
+
+Usage:
+    python manage.py update_counts [--model shows.show ...]
+
+users.signals keeps the counters on Show, Post, News and Event in step with
+Like/Comment rows. This repairs drift with one set-based UPDATE per model,
+touching only rows whose stored counts differ from the real ones.
+"""
+from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
-from shows.models import Show
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
 from users.models import Like, Comment
+from users.signals import COUNTED_MODELS
+
+
+def _count_of(relation, content_type):
+    return Coalesce(Subquery(
+        relation.objects.filter(content_type=content_type, object_id=OuterRef('pk'))
+        .values('object_id').annotate(n=Count('pk')).values('n')[:1]
+    ), 0)
+
+
+def recompute_counts(model):
+    """Recompute like_count / comment_count for drifted rows of ``model``. Returns rows fixed."""
+    ct = ContentType.objects.get_for_model(model)
+    drifted = model.objects.annotate(
+        real_likes=_count_of(Like, ct),
+        real_comments=_count_of(Comment, ct),
+    ).filter(
+        ~Q(like_count=F('real_likes')) | ~Q(comment_count=F('real_comments'))
+    ).values('pk')
+    return model.objects.filter(pk__in=Subquery(drifted)).update(
+        like_count=_count_of(Like, ct),
+        comment_count=_count_of(Comment, ct),
+    )
 
 
 class Command(BaseCommand):
-    help = 'Update like_count and comment_count for all shows'
+    help = 'Recompute like_count and comment_count for shows, posts, news and events'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model', action='append', dest='models',
+            help='app_label.model to recompute (repeatable); default: all counted models',
+        )
 
     def handle(self, *args, **options):
-        show_ct = ContentType.objects.get(app_label='shows', model='show')
-        
-        for show in Show.objects.all():
-            show.like_count = Like.objects.filter(
-                content_type=show_ct, 
-                object_id=show.id
-            ).count()
-            show.comment_count = Comment.objects.filter(
-                content_type=show_ct,
-                object_id=show.id
-            ).count()
-            show.save(update_fields=['like_count', 'comment_count'])
-            self.stdout.write(f"✅ {show.title}: {show.like_count} likes, {show.comment_count} comments")
-        
-        self.stdout.write(self.style.SUCCESS('✅ All counts updated!'))
\ No newline at end of file
+        labels = options['models'] or sorted(f'{app}.{model}' for app, model in COUNTED_MODELS)
+        for label in labels:
+            model = apps.get_model(label)
+            fixed = recompute_counts(model)
+            self.stdout.write(f"{label}: {fixed} rows updated")
+
+        self.stdout.write(self.style.SUCCESS('All counts updated'))
@@ -154,6 +154,9 @@ class Show(models.Model):
     # Generic relations for likes and comments
     likes = GenericRelation('users.Like', related_query_name='show')
     comments = GenericRelation('users.Comment', related_query_name='show')
+    # Stored counters, kept in step by users.signals (update_counts recomputes them)
+    like_count = models.IntegerField(default=0)
+    comment_count = models.IntegerField(default=0)
     
     class Meta:
         ordering = ['-created_at']
@@ -166,10 +169,6 @@ class Show(models.Model):
     def __str__(self):
         return self.title
     
-    # REMOVED: like_count and comment_count properties
-    # These were conflicting with queryset annotations in views
-    # Counts are now calculated exclusively via annotations in ShowViewSet
-    
     def get_schedule_display(self):
         """Return human-readable schedule"""
         if not self.is_recurring or not self.scheduled_time:
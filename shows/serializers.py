@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from .models import Show, ShowEpisode, Tag, ShowReminder, GuestRequest
 from django.contrib.auth import get_user_model
+from payments.entitlements import RESOURCE_EPISODE, has_access
+from payments.serializers import UnlockedListSerializer
+from api.viewer_state import LIKED, FOLLOWING_OWNER, ViewerStateField, ViewerStateListSerializer
 
 User = get_user_model()
 
@@ -23,15 +26,23 @@ class ShowCreatorSerializer(serializers.ModelSerializer):
 
 class ShowEpisodeSerializer(serializers.ModelSerializer):
     """Serializer for show episodes"""
+    has_access = serializers.SerializerMethodField()
+    unlock_resource_type = RESOURCE_EPISODE
+
     class Meta:
         model = ShowEpisode
         fields = [
             'id', 'show', 'episode_number', 'title', 'description',
             'air_date', 'duration', 'video_url', 
-            'is_premium', 'price_stx', 'price_usdcx',
+            'is_premium', 'price_stx', 'price_usdcx', 'has_access',
             'created_at'
         ]
         read_only_fields = ['created_at']
+        list_serializer_class = UnlockedListSerializer
+
+    def get_has_access(self, obj):
+        request = self.context.get('request')
+        return has_access(obj, getattr(request, 'user', None), RESOURCE_EPISODE, owner_id=obj.show.creator_id)
 
 
 class ShowSerializer(serializers.ModelSerializer):
@@ -40,8 +51,8 @@ class ShowSerializer(serializers.ModelSerializer):
     tags = TagSerializer(many=True, read_only=True)
     guests = ShowCreatorSerializer(many=True, read_only=True)
     co_hosts = ShowCreatorSerializer(many=True, read_only=True)
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
+    like_count = serializers.IntegerField(read_only=True)
+    comment_count = serializers.IntegerField(read_only=True)
     schedule_display = serializers.CharField(source='get_schedule_display', read_only=True)
     episodes = ShowEpisodeSerializer(many=True, read_only=True)
     episode_count = serializers.IntegerField(read_only=True)
@@ -57,18 +68,6 @@ class ShowSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at', 'creator', 'slug', 'share_count', 'episode_count']
     
-    def get_like_count(self, obj):
-        """Get like count from annotation"""
-        # CRITICAL: Check if annotation exists AND is not None
-        # hasattr() returns True even if value is None/0
-        return getattr(obj, '_like_count', obj.likes.count())
-    
-    def get_comment_count(self, obj):
-        """Get comment count from annotation"""
-        # CRITICAL: Check if annotation exists AND is not None
-        # hasattr() returns True even if value is None/0
-        return getattr(obj, '_comment_count', obj.comments.count())
-    
     def validate(self, data):
         """Validate recurring show fields"""
         is_recurring = data.get('is_recurring', False)
@@ -97,14 +96,18 @@ class ShowSerializer(serializers.ModelSerializer):
 
 class ShowListSerializer(serializers.ModelSerializer):
     """Lightweight show serializer for list views"""
+    viewer_relations = (LIKED, FOLLOWING_OWNER)
+    viewer_owner_field = 'creator_id'
     creator = ShowCreatorSerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     guests = ShowCreatorSerializer(many=True, read_only=True)
     co_hosts = ShowCreatorSerializer(many=True, read_only=True)
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
+    like_count = serializers.IntegerField(read_only=True)
+    comment_count = serializers.IntegerField(read_only=True)
     schedule_display = serializers.CharField(source='get_schedule_display', read_only=True)
     episode_count = serializers.IntegerField(read_only=True)
+    user_has_liked = ViewerStateField(LIKED)
+    user_is_following_owner = ViewerStateField(FOLLOWING_OWNER)
     
     class Meta:
         model = Show
@@ -112,18 +115,12 @@ class ShowListSerializer(serializers.ModelSerializer):
             'id', 'slug', 'title', 'description', 'thumbnail', 'creator', 'tags', 'guests', 'co_hosts',
             'external_link', 'link_platform',
             'is_recurring', 'recurrence_type', 'day_of_week', 'scheduled_time', 'schedule_display',
-            'status', 'created_at', 'like_count', 'comment_count', 'share_count', 'episode_count'
+            'status', 'created_at', 'like_count', 'comment_count', 'share_count', 'episode_count',
+            'user_has_liked', 'user_is_following_owner',
         ]
         read_only_fields = fields
+        list_serializer_class = ViewerStateListSerializer
     
-    def get_like_count(self, obj):
-        """Get like count from annotation"""
-        return getattr(obj, '_like_count', obj.likes.count())
-    
-    def get_comment_count(self, obj):
-        """Get comment count from annotation"""
-        return getattr(obj, '_comment_count', obj.comments.count())
-
 
 class ShowCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating/updating shows"""
@@ -102,17 +102,13 @@ def auto_cancel_unconfirmed_shows():
 @shared_task
 def cleanup_old_notifications():
     """
-    Clean up old read notifications after 30 days.
-    Runs daily.
+    Clean up old read notifications.
+    Superseded by users.tasks.run_retention (the 'notifications' policy);
+    kept so schedules already stored in the beat database keep working.
     """
-    cutoff_date = timezone.now() - timedelta(days=30)
-    deleted_count = Notification.objects.filter(
-        is_read=True,
-        created_at__lt=cutoff_date
-    ).delete()[0]
-    
-    print(f"Cleaned up {deleted_count} old notifications")
-    return deleted_count
+    from users.retention import POLICIES, run_policy
+    return run_policy(POLICIES['notifications'])['deleted']
+
 @shared_task
 def auto_create_recurring_episodes():
     """
@@ -1,3 +1,90 @@
+import json
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from users.models import User, Like
+from .models import Show, Tag
+
+
+class ShowListQueryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = User.objects.create(username='alice', role='creator')
+        self.bob = User.objects.create(username='bob', role='creator')
+        self.news, self.music = Tag.objects.create(name='News', slug='news'), Tag.objects.create(name='Music', slug='music')
+
+        self.solo = Show.objects.create(title='Solo', slug='solo', creator=self.alice, status='published')
+        self.solo.tags.add(self.news, self.music)
+        self.shared = Show.objects.create(title='Shared', slug='shared', creator=self.alice, status='published')
+        self.shared.co_hosts.add(self.alice, self.bob)
+        self.shared.tags.add(self.news)
+
+    def _slugs(self, **params):
+        response = self.client.get('/api/shows/', params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['slug'] for row in response.data['results'])
+
+    def test_creator_filter_includes_co_hosted_without_duplicates(self):
+        self.assertEqual(self._slugs(creator=self.alice.pk), ['shared', 'solo'])
+        self.assertEqual(self._slugs(creator=self.bob.pk), ['shared'])
+
+    def test_tag_filter_requires_every_tag(self):
+        self.assertEqual(self._slugs(tags=f'{self.news.pk}'), ['shared', 'solo'])
+        self.assertEqual(self._slugs(tags=f'{self.news.pk},{self.music.pk}'), ['solo'])
+        # Repeated ids do not raise the bar
+        self.assertEqual(self._slugs(tags=f'{self.music.pk},{self.music.pk}'), ['solo'])
+
+    def test_tag_filter_any_mode(self):
+        talk = Tag.objects.create(name='Talk', slug='talk')
+        other = Show.objects.create(title='Other', slug='other', creator=self.bob, status='published')
+        other.tags.add(talk)
+
+        self.assertEqual(self._slugs(tags=f'{self.music.pk},{talk.pk}', tags_mode='any'), ['other', 'solo'])
+        self.assertEqual(self._slugs(tags=f'{self.news.pk},{self.music.pk}', tags_mode='any'), ['shared', 'solo'])
+        self.assertEqual(self._slugs(tags=f'{self.music.pk},{talk.pk}'), [])
+
+    def test_list_query_count_does_not_grow_with_likes(self):
+        for i in range(5):
+            fan = User.objects.create(username=f'fan{i}')
+            Like.objects.create(user=fan, content_object=self.solo)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/shows/')
+        self.assertEqual(response.status_code, 200)
+        solo = next(row for row in response.data['results'] if row['slug'] == 'solo')
+        self.assertEqual(solo['like_count'], 5)
+        # count, page, tags, co_hosts, guests
+        self.assertLessEqual(len(ctx.captured_queries), 5)
+
+
+class ShowActionPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.host = User.objects.create(username='host', role='creator')
+        for i in range(3):
+            Show.objects.create(title=f'Show {i}', slug=f'show-{i}', creator=self.host, status='published')
+        self.client.force_authenticate(self.host)
+
+    def test_my_shows_is_paginated(self):
+        resp = self.client.get('/api/shows/my_shows/', {'page_size': 2})
+        self.assertEqual(resp.data['count'], 3)
+        self.assertEqual(len(resp.data['results']), 2)
+        self.assertIsNotNone(resp.data['next'])
+
+    def test_page_size_is_capped(self):
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+        from api.pagination import MAX_PAGE_SIZE, BoundedPageNumberPagination
+
+        request = Request(APIRequestFactory().get('/', {'page_size': MAX_PAGE_SIZE * 10}))
+        self.assertEqual(BoundedPageNumberPagination().get_page_size(request), MAX_PAGE_SIZE)
 
-# Create your tests here.
+    def test_my_shows_export_streams_every_row(self):
+        resp = self.client.get('/api/shows/my_shows/', {'export': 'json'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        rows = json.loads(b''.join(resp.streaming_content))
+        self.assertEqual(sorted(row['slug'] for row in rows), ['show-0', 'show-1', 'show-2'])
@@ -2,7 +2,9 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Q
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta, datetime
 from .models import Show, ShowEpisode, Tag, ShowReminder, GuestRequest
@@ -13,8 +15,50 @@ from .serializers import (
     GuestRequestSerializer, GuestRequestCreateSerializer, GuestRequestListSerializer
 )
 from api.permissions import IsCreatorOrReadOnly
+from api.pagination import paginated_response
 from communities.mixins import CommunityWriteMixin
 
+User = get_user_model()
+
+# Columns ShowListSerializer reads; the list action projects the query to these
+SHOW_LIST_FIELDS = (
+    'id', 'slug', 'title', 'description', 'thumbnail', 'creator',
+    'external_link', 'link_platform',
+    'is_recurring', 'recurrence_type', 'day_of_week', 'scheduled_time',
+    'status', 'created_at', 'like_count', 'comment_count', 'share_count',
+)
+# Columns ShowCreatorSerializer reads
+SHOW_PERSON_FIELDS = ('id', 'username', 'profile_picture', 'is_verified')
+
+
+def _people(relation):
+    """Prefetch a user M2M of Show, loading only what ShowCreatorSerializer needs."""
+    return Prefetch(relation, queryset=User.objects.only(*SHOW_PERSON_FIELDS))
+
+
+def hosted_by(user_id):
+    """Shows created or co-hosted by ``user_id``, as an EXISTS test rather than a join."""
+    return Q(creator_id=user_id) | Q(Exists(
+        Show.co_hosts.through.objects.filter(show_id=OuterRef('pk'), user_id=user_id)
+    ))
+
+
+def tagged_with(tag_ids, match_all=True):
+    """
+    Shows carrying every tag in ``tag_ids`` (or any of them with match_all=False).
+
+    One pass over the show/tag through table grouped by show (a (show, tag)
+    pair is unique there), so the cost does not grow with the number of tags
+    and no DISTINCT is needed afterwards.
+    """
+    tag_ids = set(tag_ids)
+    matches = Show.tags.through.objects.filter(tag_id__in=tag_ids)
+    if match_all:
+        matches = matches.values('show_id').annotate(
+            n=Count('tag_id')
+        ).filter(n=len(tag_ids))
+    return Q(pk__in=matches.values('show_id'))
+
 
 class TagViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -65,21 +109,28 @@ class ShowViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
     Update: PUT/PATCH /api/shows/{id}/ (owner only)
     Delete: DELETE /api/shows/{id}/ (owner only)
     
-    Custom actions:
+    Custom actions (paginated):
     - upcoming_shows: GET /api/shows/upcoming_shows/
-    - my_shows: GET /api/shows/my_shows/
+    - my_shows: GET /api/shows/my_shows/ (?export=json streams all of them)
+    - episodes: GET /api/shows/{slug}/episodes/
     
     Filters:
     - ?search=query - Search title and description
-    - ?tags=1,2,3 - Filter by tag IDs
+    - ?tags=1,2,3 - Filter by tag IDs (shows with all of them)
+    - ?tags_mode=any - Match shows with any of the tags instead
     - ?creator=15 - Filter by creator ID
     - ?status=published - Filter by status
     """
-    queryset = Show.objects.select_related('creator').prefetch_related('tags', 'co_hosts').annotate(
-        _like_count=Count('likes', distinct=True),
-        _comment_count=Count('comments', distinct=True),
-        episode_count=Count('episodes', distinct=True)
-    ).prefetch_related('likes', 'comments')
+    # like_count / comment_count are stored columns; episode_count is a
+    # correlated subquery so the list needs no GROUP BY over joined rows
+    queryset = Show.objects.select_related('creator').prefetch_related(
+        'tags', _people('co_hosts'), _people('guests'),
+    ).annotate(
+        episode_count=Coalesce(Subquery(
+            ShowEpisode.objects.filter(show=OuterRef('pk'))
+            .values('show').annotate(n=Count('pk')).values('n')[:1]
+        ), 0)
+    )
     permission_classes = [IsCreatorOrReadOnly]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'description']
@@ -96,6 +147,10 @@ class ShowViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
     
     def get_queryset(self):
         queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.only(
+                *SHOW_LIST_FIELDS, *(f'creator__{field}' for field in SHOW_PERSON_FIELDS)
+            )
         
         # Filter by status
         status_param = self.request.query_params.get('status')
@@ -109,18 +164,16 @@ class ShowViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
         # Filter by creator (also includes shows where user is co-host)
         creator_id = self.request.query_params.get('creator')
         if creator_id:
-            queryset = queryset.filter(
-                Q(creator_id=creator_id) | Q(co_hosts__id=creator_id)
-            ).distinct()
+            queryset = queryset.filter(hosted_by(creator_id))
         
         # Filter by tags (comma-separated tag IDs)
         tags_param = self.request.query_params.get('tags')
         if tags_param:
             tag_ids = [int(tid) for tid in tags_param.split(',') if tid.strip().isdigit()]
             if tag_ids:
-                # Show must have ALL specified tags
-                for tag_id in tag_ids:
-                    queryset = queryset.filter(tags__id=tag_id)
+                # Show must have ALL specified tags unless ?tags_mode=any
+                match_all = self.request.query_params.get('tags_mode', 'all').lower() != 'any'
+                queryset = queryset.filter(tagged_with(tag_ids, match_all=match_all))
         
         # Filter by recurring
         is_recurring = self.request.query_params.get('is_recurring')
@@ -132,7 +185,9 @@ class ShowViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
         if day_of_week is not None:
             queryset = queryset.filter(day_of_week=int(day_of_week))
         
-        return queryset.distinct()  # Avoid duplicates from tag filtering
+        # Every filter above is a column test, EXISTS or IN, so rows are
+        # already unique and no DISTINCT is needed
+        return queryset
     
     def get_object(self):
         """Support lookup by slug or numeric ID fallback"""
@@ -173,18 +228,14 @@ class ShowViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
             is_recurring=True,
             status='published'
         )
-        serializer = self.get_serializer(shows, many=True)
-        return Response(serializer.data)
+        return paginated_response(self, shows)
     
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_shows(self, request):
         """Get current user's shows (owned + co-hosted) with counts"""
         # get_queryset() already has annotations from base queryset
-        shows = self.get_queryset().filter(
-            Q(creator=request.user) | Q(co_hosts=request.user)
-        ).distinct()
-        serializer = self.get_serializer(shows, many=True)
-        return Response(serializer.data)
+        shows = self.get_queryset().filter(hosted_by(request.user.pk))
+        return paginated_response(self, shows, exportable=True)
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def respond_to_reminder(self, request, slug=None):
@@ -257,6 +308,8 @@ class ShowViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
         show = self.get_object()
         show.share_count += 1
         show.save(update_fields=['share_count'])
+        from users import creator_stats
+        creator_stats.bump(show.creator_id, shares=1)
         
         return Response({
             'success': True,
@@ -278,9 +331,8 @@ class ShowViewSet(CommunityWriteMixin, viewsets.ModelViewSet):
     def episodes(self, request, slug=None):
         """Get all episodes for a specific show"""
         show = self.get_object()
-        episodes = show.episodes.all().order_by('-air_date', '-episode_number')
-        serializer = ShowEpisodeSerializer(episodes, many=True, context={'request': request})
-        return Response(serializer.data)
+        episodes = show.episodes.all().order_by('-air_date', '-episode_number', '-id')
+        return paginated_response(self, episodes, ShowEpisodeSerializer)
         
         # Calculate next 30 days of instances
         instances = []
@@ -335,7 +387,9 @@ class ShowEpisodeViewSet(viewsets.ModelViewSet):
         if show_id:
             queryset = queryset.filter(show_id=show_id)
         
-        return queryset
+        # Whether the viewer holds a receipt for each (premium) episode
+        from payments.entitlements import RESOURCE_EPISODE, annotate_unlocked
+        return annotate_unlocked(queryset, self.request.user, RESOURCE_EPISODE)
     
     def perform_create(self, serializer):
         """Ensure the user owns the show before creating episodes"""
@@ -346,6 +400,8 @@ class ShowEpisodeViewSet(viewsets.ModelViewSet):
 
     def retrieve(self, request, *args, **kwargs):
         from payments.decorators import x402_required
+        from payments.entitlements import RESOURCE_EPISODE
+        from payments.pricing import convert
         from django.conf import settings
         
         instance = self.get_object()
@@ -356,11 +412,11 @@ class ShowEpisodeViewSet(viewsets.ModelViewSet):
             
             def get_amounts(req, **kw):
                 # Convert from human-readable to micro-units (STX, USDCx, sBTC)
-                sbtc_per_usdcx = 0.000015
+                amount_usdcx = int(float(instance.price_usdcx) * 1_000_000)
                 return (
                     int(float(instance.price_stx) * 1_000_000),
-                    int(float(instance.price_usdcx) * 1_000_000),
-                    int(float(instance.price_usdcx) * sbtc_per_usdcx * 100_000_000),
+                    amount_usdcx,
+                    convert(amount_usdcx, 'USDCX', 'SBTC'),
                 )
 
             @x402_required(get_pay_to, get_amounts, description=f"Unlock Episode: {instance.title}")
@@ -368,7 +424,7 @@ class ShowEpisodeViewSet(viewsets.ModelViewSet):
                 serializer = self.get_serializer(instance)
                 return Response(serializer.data)
             
-            return gated_retrieve(request, *args, **kwargs)
+            return gated_retrieve(request, *args, resource_type=RESOURCE_EPISODE, **kwargs)
 
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Like, Comment, Follow, Subscription, RTMPDestination, Notification, CreatorPlaylist
+from .models import User, Like, Comment, Follow, Subscription, RTMPDestination, Notification, CreatorPlaylist, DapRewardGrant
 
 
 @admin.register(User)
@@ -102,3 +102,12 @@ class CreatorPlaylistAdmin(admin.ModelAdmin):
     list_filter = ['user']
     search_fields = ['user__username', 'dcpe_playlist_name', 'label']
     raw_id_fields = ['user']
+
+
+@admin.register(DapRewardGrant)
+class DapRewardGrantAdmin(admin.ModelAdmin):
+    """Admin for queued DAP credit rewards"""
+    list_display = ['user', 'reward_key', 'amount', 'status', 'attempts', 'next_attempt_at', 'minted_at']
+    list_filter = ['status', 'reward_key']
+    search_fields = ['user__username', 'stacks_address']
+    raw_id_fields = ['user']
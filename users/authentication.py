@@ -0,0 +1,123 @@
+"""
+Cached user resolution for JWT-authenticated requests.
+
+simplejwt's JWTAuthentication loads the User row on every request, and a page
+mount fires 15-20 of them in parallel. CachedJWTAuthentication resolves the
+token's user from the cache instead, under ``auth_user:<user_id>:<version>``
+for AUTH_USER_CACHE_TTL seconds (0 turns the cache off). Only users that
+passed the normal database checks (exists, active, not revoked) are stored.
+
+``version`` is User.token_version as it was when the token was issued (the
+``tv`` claim; tokens without one are version 0). Deactivating a user bumps it,
+so their outstanding access and refresh tokens point at a key that is never
+filled again and are rejected on the database path, even after reactivation.
+
+Entries are dropped on every User save and on changes to a user's groups or
+user_permissions (users.signals). Writes that skip signals (queryset.update(),
+the F() counters in users.follows / users.unread) show up within the TTL;
+endpoints that need them exact read them from the database. Django's
+permission caches are never stored, so has_perm() checks stay live.
+
+Tokens are built with UserRefreshToken. With JWT_USER_CLAIMS set they also
+carry ``role``, ``groups`` and ``is_staff`` for clients; these describe the
+user when the refresh token was issued and are never used for authorization.
+"""
+import os
+
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+AUTH_USER_CACHE_TTL = lambda: int(os.environ.get('AUTH_USER_CACHE_TTL', 60))
+JWT_USER_CLAIMS = lambda: os.environ.get('JWT_USER_CLAIMS', '').lower() in ('1', 'true', 'yes')
+
+TOKEN_VERSION_CLAIM = 'tv'
+USER_CACHE_KEY = 'auth_user:{}:{}'
+
+
+def user_cache_key(user_id, version):
+    return USER_CACHE_KEY.format(user_id, version)
+
+
+def user_claims(user):
+    """The optional hot-field claims: role, group names and is_staff."""
+    return {
+        'role': user.role,
+        'groups': sorted(user.groups.values_list('name', flat=True)),
+        'is_staff': user.is_staff,
+    }
+
+
+class UserRefreshToken(RefreshToken):
+    """RefreshToken carrying the user's token version (and hot fields with JWT_USER_CLAIMS)."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        if JWT_USER_CLAIMS():
+            for claim, value in user_claims(user).items():
+                token[claim] = value
+        return token
+
+
+class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = UserRefreshToken
+
+
+def _dump(user):
+    return {field.attname: getattr(user, field.attname) for field in user._meta.concrete_fields}
+
+
+def _load(model, values):
+    """Rebuild a cached user; None if the row shape changed since it was stored."""
+    names = [field.attname for field in model._meta.concrete_fields]
+    if set(names) != set(values):
+        return None
+    return model.from_db('default', names, [values[name] for name in names])
+
+
+def invalidate_user(user):
+    cache.delete(user_cache_key(user.pk, user.token_version))
+
+
+def invalidate_users(user_ids):
+    """Drop the cached entries of ``user_ids`` (one query for their versions)."""
+    from .models import User
+    keys = [
+        user_cache_key(pk, version)
+        for pk, version in User.objects.filter(pk__in=user_ids).values_list('pk', 'token_version')
+    ]
+    if keys:
+        cache.delete_many(keys)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that resolves the user from a short-TTL cache."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        version = validated_token.get(TOKEN_VERSION_CLAIM, 0)
+        ttl = AUTH_USER_CACHE_TTL()
+        key = user_cache_key(user_id, version)
+        if ttl:
+            values = cache.get(key)
+            if values is not None:
+                user = _load(self.user_model, values)
+                if user is not None:
+                    return user
+
+        user = super().get_user(validated_token)
+        if version != user.token_version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        if ttl:
+            cache.set(key, _dump(user), ttl)
+        return user
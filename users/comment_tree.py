@@ -0,0 +1,57 @@
+"""
+Comment threads without per-comment queries.
+
+A page of comments renders as roots plus a preview of each root's newest
+replies. Rather than one replies query and one COUNT per comment:
+
+    with_reply_count(qs)         annotates reply_count with a correlated COUNT
+    attach_reply_previews(roots) loads the first REPLY_PREVIEW replies of every
+                                 root in one ROW_NUMBER() OVER (PARTITION BY
+                                 parent_id) query into ``_reply_preview``
+
+Replies past the preview come from GET /api/comments/<id>/replies/, cursor
+paginated on (created_at, id) so it picks up where the preview stopped.
+"""
+from collections import defaultdict
+
+from django.db.models import Count, F, OuterRef, Subquery, Window
+from django.db.models.functions import Coalesce, RowNumber
+
+from .models import Comment
+
+REPLY_PREVIEW = 5
+
+
+def with_reply_count(queryset):
+    return queryset.annotate(reply_count=Coalesce(Subquery(
+        Comment.objects.filter(parent=OuterRef('pk'))
+        .values('parent').annotate(n=Count('pk')).values('n')[:1]
+    ), 0))
+
+
+def replies_of(parent_ids):
+    """Replies of ``parent_ids`` with user and reply_count loaded, newest first."""
+    return with_reply_count(
+        Comment.objects.select_related('user').filter(parent_id__in=parent_ids)
+    ).order_by('-created_at', '-id')
+
+
+def attach_reply_previews(roots, limit=REPLY_PREVIEW):
+    """Set ``_reply_preview`` (newest ``limit`` replies) on each of ``roots`` with one query."""
+    roots = [root for root in roots if not hasattr(root, '_reply_preview')]
+    if not roots:
+        return
+
+    ranked = replies_of([root.pk for root in roots]).annotate(
+        reply_rank=Window(
+            RowNumber(),
+            partition_by=F('parent_id'),
+            order_by=[F('created_at').desc(), F('id').desc()],
+        )
+    ).filter(reply_rank__lte=limit)
+
+    by_parent = defaultdict(list)
+    for reply in ranked:
+        by_parent[reply.parent_id].append(reply)
+    for root in roots:
+        root._reply_preview = by_parent.get(root.pk, [])
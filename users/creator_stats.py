@@ -0,0 +1,108 @@
+"""
+Materialized creator stats for GET /api/users/<id>/stats/.
+
+One CreatorStats row per creator holds the totals the endpoint returns, so a
+profile view is a single-row read instead of a COUNT per show. Rows move
+with single F() UPDATEs from the paths that change them:
+
+    users.signals   likes / comments on the creator's shows, shows, events
+    users.follows   followers, alongside User.follower_count
+    ShowViewSet.share  shares
+
+Bumps only touch existing rows; a creator without one gets it computed on
+their first stats read. Anything the bumps miss (bulk deletes,
+queryset.update(), the admin) is repaired by the nightly
+users.tasks.reconcile_creator_stats, which recounts drifted rows only.
+"""
+from django.db.models import Count, Exists, F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import CreatorStats, User
+
+FIELDS = ('views', 'shares', 'likes', 'comments', 'shows', 'events', 'followers')
+
+
+def _per_user(queryset, owner_field, expression, user_ref):
+    return Coalesce(Subquery(
+        queryset.filter(**{owner_field: OuterRef(user_ref)}).order_by()
+        .values(owner_field).annotate(n=expression).values('n')[:1],
+        output_field=IntegerField(),
+    ), 0)
+
+
+def _totals(user_ref):
+    """Recount expressions for every stat, correlated on the outer ``user_ref``."""
+    from shows.models import Show
+    from events.models import Event
+
+    shows = Show.objects.all()
+    return {
+        'views': Value(0),
+        'shares': _per_user(shows, 'creator', Sum('share_count'), user_ref),
+        'likes': _per_user(shows, 'creator', Count('likes'), user_ref),
+        'comments': _per_user(shows, 'creator', Count('comments'), user_ref),
+        'shows': _per_user(shows, 'creator', Count('pk'), user_ref),
+        'events': _per_user(Event.objects.all(), 'organizer', Count('pk'), user_ref),
+        'followers': Subquery(User.objects.filter(pk=OuterRef(user_ref)).values('follower_count')[:1]),
+    }
+
+
+def bump(user_id, **deltas):
+    """F() update of the given stats on ``user_id``'s row, if it has one."""
+    CreatorStats.objects.filter(user_id=user_id).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+
+
+def bump_show_creator(show_id, **deltas):
+    """bump() the creator of ``show_id`` in the same single UPDATE."""
+    from shows.models import Show
+    CreatorStats.objects.filter(
+        user_id=Subquery(Show.objects.filter(pk=show_id).values('creator_id')[:1])
+    ).update(**{field: F(field) + delta for field, delta in deltas.items()})
+
+
+def _create_missing(users):
+    """Compute and insert rows for ``users`` that have none; returns how many."""
+    rows = users.filter(creator_stats__isnull=True).annotate(
+        **{f'total_{field}': expression for field, expression in _totals('pk').items()}
+    ).values('pk', *(f'total_{field}' for field in FIELDS))
+    created = CreatorStats.objects.bulk_create([
+        CreatorStats(user_id=row['pk'], **{field: row[f'total_{field}'] for field in FIELDS})
+        for row in rows
+    ], ignore_conflicts=True)
+    return len(created)
+
+
+def stats_for(user):
+    """``user``'s CreatorStats row, computed and stored on first read."""
+    stats = CreatorStats.objects.filter(user=user).first()
+    if stats is None:
+        _create_missing(User.objects.filter(pk=user.pk))
+        stats = CreatorStats.objects.get(user=user)
+    return stats
+
+
+def reconcile_creator_stats(dry_run=False):
+    """
+    Recount every CreatorStats row that drifted and create rows for show or
+    event owners that lack one. Set-based: one UPDATE over the drifted rows.
+    Returns how many rows were off or missing.
+    """
+    from shows.models import Show
+    from events.models import Event
+
+    owners = User.objects.filter(
+        Exists(Show.objects.filter(creator=OuterRef('pk')))
+        | Exists(Event.objects.filter(organizer=OuterRef('pk')))
+    )
+    totals = _totals('user_id')
+    drifted = CreatorStats.objects.annotate(
+        **{f'real_{field}': expression for field, expression in totals.items()}
+    ).exclude(
+        **{field: F(f'real_{field}') for field in FIELDS}
+    ).values('pk')
+    if dry_run:
+        return drifted.count() + owners.filter(creator_stats__isnull=True).count()
+    fixed = CreatorStats.objects.filter(pk__in=Subquery(drifted)).update(**totals)
+    return fixed + _create_missing(owners)
@@ -4,21 +4,49 @@ Cryptographic utilities for Stacks wallet signature verification.
 This module provides PRODUCTION-READY functions for verifying Stacks blockchain 
 wallet signatures using the secp256k1 elliptic curve.
 
+Verification hashes the message once, recovers candidate public keys and
+compares the wallet address against both network addresses of each key.
+Address derivation (SHA-256, RIPEMD-160, double SHA-256 checksum, c32) runs
+once per public key: stacks_addresses() keeps the last ADDRESS_CACHE_SIZE
+keys in an LRU, so returning users cost one recovery and one verify.
+
+Per-attempt diagnostics go to this module's logger at DEBUG; set
+STACKS_SIGNATURE_DEBUG=1 to turn them on.
+`python manage.py bench_wallet_verify` measures verifications per second.
+
 Dependencies:
     - coincurve: secp256k1 operations
     - Crypto: Hashing operations (RIPEMD160, SHA256)
 """
 
+import os
 import hashlib
 import base64
+import logging
+from functools import lru_cache
 from typing import Optional, Tuple
-from coincurve import PublicKey, verify_signature
+from coincurve import PublicKey
+from coincurve.ecdsa import cdata_to_der, deserialize_compact
 from Crypto.Hash import RIPEMD160
-import struct
 
+logger = logging.getLogger(__name__)
+
+STACKS_SIGNATURE_DEBUG = lambda: os.environ.get('STACKS_SIGNATURE_DEBUG', '').lower() in ('1', 'true', 'yes')
+if STACKS_SIGNATURE_DEBUG():
+    logger.setLevel(logging.DEBUG)
+
+# Public keys whose addresses are kept (~200 bytes each)
+ADDRESS_CACHE_SIZE = 4096
 
 # Stacks c32 encoding alphabet
 C32_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+# Every pair of c32 digits, indexed by the 10 bits they encode
+_C32_PAIRS = tuple(high + low for high in C32_ALPHABET for low in C32_ALPHABET)
+_C32_VALUES = {char: value for value, char in enumerate(C32_ALPHABET)}
+
+# P2PKH address versions
+MAINNET_VERSION = 22
+TESTNET_VERSION = 26
 
 
 def verify_stacks_signature(
@@ -54,106 +82,54 @@ def verify_stacks_signature(
     """
     
     try:
-        # Basic validation
         if not wallet_address or not message or not signature:
-            print("❌ Error: Missing required parameters")
+            logger.debug("missing wallet address, message or signature")
             return False
-        
-        # Validate wallet address format
-        if not (wallet_address.startswith('SP') or wallet_address.startswith('ST')):
-            print(f"❌ Error: Invalid Stacks address format: {wallet_address}")
+
+        if not wallet_address.startswith(('SP', 'ST')):
+            logger.debug("invalid Stacks address format: %s", wallet_address)
             return False
-        
-        print(f"\n🔍 Verifying signature for wallet: {wallet_address}")
-        print(f"📝 Message length: {len(message)} chars")
-        print(f"✍️  Signature length: {len(signature)} chars")
-        
-        # Parse signature - Stacks Connect uses VRS format
+
         sig_data = _parse_stacks_connect_signature(signature)
         if not sig_data:
-            print("❌ Error: Failed to parse signature")
             return False
-        
+
         sig_bytes = sig_data['signature']
-        recovery_id = sig_data['recovery_id']
-        
-        print(f"📊 Parsed signature: {len(sig_bytes)} bytes, recovery_id: {recovery_id}")
-        
-        # Hash the message with Stacks-specific formatting
-        # Stacks uses a specific message prefix for signing
         message_hash = _hash_stacks_message(message)
-        
-        print(f"🔐 Message hash: {message_hash.hex()[:32]}...")
-        
-        # Try to recover public key
-        # If recovery_id was extracted, try it first; otherwise try all
-        recovery_attempts = [recovery_id] if recovery_id is not None else range(4)
-        
-        public_key = None
-        matched_recovery_id = None
-        
-        for rec_id in recovery_attempts:
-            try:
-                # Create recoverable signature (65 bytes: 64 bytes sig + 1 byte recovery ID)
-                # coincurve expects the recovery ID as the LAST byte, not first
-                recoverable_sig = sig_bytes + bytes([rec_id])
-                
-                print(f"🔄 Trying recovery ID {rec_id}...")
-                
-                # Attempt recovery using recoverable signature format
-                pk = PublicKey.from_signature_and_message(
-                    recoverable_sig,  # 65 bytes: r + s + recovery_id
-                    message_hash,
-                    hasher=None
-                )
-                
-                # Derive address from this public key (try both mainnet and testnet)
-                for is_testnet in [False, True]:
-                    derived_address = derive_stacks_address(pk.format(compressed=True), testnet=is_testnet)
-
-                    if derived_address == wallet_address:
-                        public_key = pk
-                        matched_recovery_id = rec_id
-                        print(f"✅ Public key recovered! Recovery ID: {rec_id}, Testnet: {is_testnet}")
-                        print(f"✅ Address match: {derived_address}")
-                        break
-                
-                if public_key:
-                    break
-                    
-            except Exception as e:
-                # This recovery ID didn't work, try next
-                print(f"⚠️  Recovery ID {rec_id} failed: {str(e)[:80]}")
+
+        for rec_id, public_key in _recover_public_keys(sig_bytes, sig_data['recovery_id'], message_hash):
+            if wallet_address not in stacks_addresses(public_key.format(compressed=True)):
                 continue
-        
-        if public_key is None:
-            print("❌ Error: Could not recover public key matching the address")
-            print(f"   Wallet address: {wallet_address}")
-            print(f"   Tried recovery IDs: {list(recovery_attempts)}")
-            return False
-        
-        # Verify the signature is valid for this public key
-        try:
-            # For verification, use compact signature (64 bytes)
-            is_valid = public_key.verify_compact(sig_bytes, message_hash, hasher=None)
-            if is_valid:
-                print(f"✅ Cryptographic signature verification PASSED!")
-                print(f"✅ Wallet authenticated: {wallet_address}")
-                return True
-            else:
-                print("❌ Error: Signature verification failed")
-                return False
-        except Exception as e:
-            print(f"❌ Error during signature verification: {e}")
-            return False
-            
+            # Recovery also accepts high-S signatures, which verify() rejects
+            is_valid = public_key.verify(
+                cdata_to_der(deserialize_compact(sig_bytes)), message_hash, hasher=None
+            )
+            logger.debug("%s: recovery id %s matched, signature valid=%s", wallet_address, rec_id, is_valid)
+            return is_valid
+
+        logger.debug("no recovered public key matches %s", wallet_address)
+        return False
+
     except Exception as e:
-        print(f"❌ Error in verify_stacks_signature: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.warning(f"[wallet-sig] verify_stacks_signature failed for {wallet_address}: {e}")
         return False
 
 
+def _recover_public_keys(sig_bytes: bytes, recovery_id: Optional[int], message_hash: bytes):
+    """
+    Yield (recovery_id, PublicKey) for ``recovery_id``, or for each of 0-3 when
+    it is None, skipping ids that recover no key.
+    """
+    for rec_id in ([recovery_id] if recovery_id is not None else range(4)):
+        try:
+            # coincurve expects the recovery ID as the LAST byte (r + s + recid)
+            yield rec_id, PublicKey.from_signature_and_message(
+                sig_bytes + bytes([rec_id]), message_hash, hasher=None
+            )
+        except Exception as e:
+            logger.debug("recovery id %s failed: %s", rec_id, e)
+
+
 def _encode_varint(n: int) -> bytes:
     """
     Encode an integer as a Bitcoin-style varint (compact size).
@@ -181,66 +157,18 @@ def recover_signing_address(message: str, signature: str) -> Optional[str]:
 
     Returns the recovered mainnet (SP) address, or None on any failure.
     """
-    import logging
-    logger = logging.getLogger(__name__)
     try:
-        # Log raw signature bytes for debugging
-        raw_sig = signature[2:] if signature.startswith(('0x', '0X')) else signature
-        try:
-            raw_bytes = bytes.fromhex(raw_sig)
-            logger.info(
-                f"[signing] raw sig: len={len(raw_bytes)}B "
-                f"first4={raw_bytes[:4].hex()} last4={raw_bytes[-4:].hex()} "
-                f"byte0={raw_bytes[0]}(0x{raw_bytes[0]:02x}) byte64={raw_bytes[64] if len(raw_bytes) > 64 else 'n/a'}"
-            )
-            print(
-                f"[signing] raw sig: len={len(raw_bytes)}B "
-                f"first4={raw_bytes[:4].hex()} last4={raw_bytes[-4:].hex()} "
-                f"byte0={raw_bytes[0]}(0x{raw_bytes[0]:02x}) byte64={raw_bytes[64] if len(raw_bytes) > 64 else 'n/a'}"
-            )
-        except Exception:
-            logger.warning(f"[signing] could not decode sig as hex: {signature[:20]}")
-
         sig_data = _parse_stacks_connect_signature(signature)
         if not sig_data:
             return None
 
-        sig_bytes    = sig_data['signature']
-        recovery_id  = sig_data['recovery_id']
         message_hash = _hash_stacks_message(message)
-
-        logger.info(f"[signing] parsed: sig_bytes={len(sig_bytes)}B recovery_id={recovery_id} msg_hash={message_hash.hex()[:16]}...")
-        print(f"[signing] parsed: sig_bytes={len(sig_bytes)}B recovery_id={recovery_id} msg_hash={message_hash.hex()[:16]}...")
-
-        recovery_attempts = [recovery_id] if recovery_id is not None else range(4)
-        all_recovered = []
-
-        for rec_id in recovery_attempts:
-            try:
-                recoverable_sig = sig_bytes + bytes([rec_id])
-                pk = PublicKey.from_signature_and_message(
-                    recoverable_sig,
-                    message_hash,
-                    hasher=None,
-                )
-                # Prefer mainnet address; fall back to testnet
-                for is_testnet in [False, True]:
-                    addr = derive_stacks_address(pk.format(compressed=True), testnet=is_testnet)
-                    if addr:
-                        all_recovered.append((rec_id, addr))
-                        break
-            except Exception as e:
-                all_recovered.append((rec_id, f'ERROR:{str(e)[:40]}'))
-                continue
-
-        logger.info(f"[signing] all recovery attempts: {all_recovered}")
-        print(f"[signing] all recovery attempts: {all_recovered}")
-
-        if all_recovered:
-            rec_id, addr = all_recovered[0]
-            if not addr.startswith('ERROR'):
-                logger.info(f"[signing] Recovered signing address: {addr} (recid={rec_id})")
-                return addr
+        # Only the first recovery id is ever used (0 when the signature does not say)
+        recovery_id = sig_data['recovery_id'] if sig_data['recovery_id'] is not None else 0
+        for rec_id, public_key in _recover_public_keys(sig_data['signature'], recovery_id, message_hash):
+            addr = stacks_addresses(public_key.format(compressed=True))[0]
+            logger.debug("[signing] recovered signing address %s (recid=%s)", addr, rec_id)
+            return addr
 
         return None
     except Exception as e:
@@ -290,14 +218,10 @@ def _parse_stacks_connect_signature(signature: str) -> Optional[dict]:
         if signature.startswith('0x') or signature.startswith('0X'):
             signature = signature[2:]
         
-        print(f"🔧 Parsing signature: {signature[:20]}...{signature[-20:]}")
-        
-        # Try hex decoding
         try:
             sig_bytes = bytes.fromhex(signature)
-            print(f"📏 Raw signature length: {len(sig_bytes)} bytes")
         except ValueError as e:
-            print(f"❌ Failed to decode hex: {e}")
+            logger.debug("signature is not hex: %s", e)
             return None
         
         # Stacks signatures are 65 bytes. Two formats are seen in the wild:
@@ -311,61 +235,52 @@ def _parse_stacks_connect_signature(signature: str) -> Optional[dict]:
             first_byte = sig_bytes[0]
             last_byte  = sig_bytes[64]
 
-            print(f"✅ 65-byte signature detected")
-            print(f"   First byte: {first_byte} (0x{first_byte:02x}), Last byte: {last_byte} (0x{last_byte:02x})")
-
             # VRS format — standard stacks.js compressed key convention
             if first_byte in (31, 32):
-                recovery_id = first_byte - 31
-                print(f"   VRS format — recovery_id: {recovery_id}")
+                logger.debug("65-byte VRS signature, recovery_id %s", first_byte - 31)
                 return {
                     'signature': sig_bytes[1:],   # 64 bytes r+s
-                    'recovery_id': recovery_id,
+                    'recovery_id': first_byte - 31,
                 }
 
             # RSV format — newer Leather wallet request() API
             # Last byte is the recovery ID (0 or 1 for compressed keys).
             # Use it directly; do NOT fall back to try-all, which picks the wrong key.
             if last_byte in (0, 1, 2, 3):
-                print(f"   RSV format — last byte {last_byte} is recovery_id, using directly")
+                logger.debug("65-byte RSV signature, recovery_id %s", last_byte)
                 return {
                     'signature': sig_bytes[:64],  # 64 bytes r+s
                     'recovery_id': last_byte,
                 }
 
             # Unknown — strip first byte and try all recovery IDs
-            print(f"   Unknown format — will try all recovery IDs (0-3)")
+            logger.debug("65-byte signature of unknown layout (first 0x%02x, last 0x%02x)", first_byte, last_byte)
             return {
                 'signature': sig_bytes[1:],
                 'recovery_id': None,
             }
         
-        # Check for raw RS format (64 bytes) - less common
+        # Raw RS format (64 bytes) - less common; try all recovery IDs
         elif len(sig_bytes) == 64:
-            print(f"✅ 64-byte RS signature detected")
-            print(f"   Will try all recovery IDs (0-3)")
             return {
                 'signature': sig_bytes,
-                'recovery_id': None  # Will try all recovery IDs
+                'recovery_id': None
             }
         
-        # Handle other lengths
+        # Might be DER encoded or have extra data: try the last 64 bytes as r+s
         elif len(sig_bytes) > 65:
-            # Might be DER encoded or have extra data
-            print(f"⚠️  Non-standard length: {len(sig_bytes)} bytes")
-            print(f"   Attempting to extract 64-byte r+s from end")
-            # Try last 64 bytes as r+s
+            logger.debug("non-standard signature length %s, using the last 64 bytes", len(sig_bytes))
             return {
                 'signature': sig_bytes[-64:],
                 'recovery_id': None
             }
         
         else:
-            print(f"❌ Invalid signature length: {len(sig_bytes)} bytes (expected 64 or 65)")
+            logger.debug("invalid signature length %s (expected 64 or 65)", len(sig_bytes))
             return None
         
     except Exception as e:
-        print(f"❌ Error parsing signature: {e}")
+        logger.debug("error parsing signature: %s", e)
         return None
 
 
@@ -400,11 +315,11 @@ def _parse_signature(signature: str) -> Optional[bytes]:
         except:
             pass
         
-        print(f"Error: Could not parse signature (length after parsing: {len(sig_bytes) if 'sig_bytes' in locals() else 'unknown'})")
+        logger.debug("could not parse signature as hex or base64")
         return None
         
     except Exception as e:
-        print(f"Error parsing signature: {e}")
+        logger.debug("error parsing signature: %s", e)
         return None
 
 
@@ -426,35 +341,30 @@ def derive_stacks_address(public_key: bytes, testnet: bool = False) -> Optional[
         str: The Stacks address (e.g., "SP2J6ZY..."), or None if derivation fails
     """
     try:
-        # Step 1: Hash160 (RIPEMD160(SHA256(pubkey)))
-        sha256_hash = hashlib.sha256(public_key).digest()
-        ripemd160 = RIPEMD160.new()
-        ripemd160.update(sha256_hash)
-        hash160 = ripemd160.digest()
-        
-        # Step 2: Add version byte
-        # Mainnet P2PKH: 22, Testnet P2PKH: 26
-        version = 26 if testnet else 22
-        versioned_hash = bytes([version]) + hash160
-        
-        # Step 3: Compute checksum (double SHA256, take first 4 bytes)
-        checksum = hashlib.sha256(hashlib.sha256(versioned_hash).digest()).digest()[:4]
-        
-        # Step 4: c32 encode
-        address = c32_encode(versioned_hash + checksum)
-        
-        # Add prefix
-        prefix = 'ST' if testnet else 'SP'
-        
-        return prefix + address
-        
+        return stacks_addresses(bytes(public_key))[1 if testnet else 0]
     except Exception as e:
-        print(f"Error deriving address: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.warning(f"[wallet-sig] could not derive address: {e}")
         return None
 
 
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def stacks_addresses(public_key: bytes) -> Tuple[str, str]:
+    """
+    (mainnet, testnet) addresses for a public key, memoized per key.
+    The hash160 is shared; only the version byte and checksum differ.
+    """
+    sha256_hash = hashlib.sha256(public_key).digest()
+    hash160 = RIPEMD160.new(sha256_hash).digest()
+    return _versioned_address(MAINNET_VERSION, hash160), _versioned_address(TESTNET_VERSION, hash160)
+
+
+def _versioned_address(version: int, hash160: bytes) -> str:
+    versioned_hash = bytes([version]) + hash160
+    checksum = hashlib.sha256(hashlib.sha256(versioned_hash).digest()).digest()[:4]
+    prefix = 'ST' if version == TESTNET_VERSION else 'SP'
+    return prefix + c32_encode(versioned_hash + checksum)
+
+
 def c32_encode(data: bytes) -> str:
     """
     Encode bytes to c32 format (Stacks-specific base32 variant).
@@ -471,21 +381,19 @@ def c32_encode(data: bytes) -> str:
     if not data:
         return ''
     
-    # Convert bytes to integer
     num = int.from_bytes(data, byteorder='big')
+    # Digits needed for the value, padded to the length the data implies
+    digits = max((num.bit_length() + 4) // 5, len(data) * 8 // 5)
     
-    # Encode in base32
     result = []
-    while num > 0:
-        result.append(C32_ALPHABET[num % 32])
-        num //= 32
-    
-    # Pad to correct length
-    expected_length = len(data) * 8 // 5
-    while len(result) < expected_length:
-        result.append(C32_ALPHABET[0])
+    if digits % 2:
+        result.append(C32_ALPHABET[(num >> (5 * (digits - 1))) & 31])
+        digits -= 1
+    # Then two digits (10 bits) per table lookup, most significant first
+    for shift in range(5 * (digits - 2), -1, -10):
+        result.append(_C32_PAIRS[(num >> shift) & 1023])
     
-    return ''.join(reversed(result))
+    return ''.join(result)
 
 
 def c32_decode(encoded: str) -> bytes:
@@ -504,7 +412,7 @@ def c32_decode(encoded: str) -> bytes:
     # Convert to integer
     num = 0
     for char in encoded:
-        num = num * 32 + C32_ALPHABET.index(char)
+        num = num * 32 + _C32_VALUES[char]
     
     # Convert to bytes
     byte_length = (len(encoded) * 5 + 7) // 8
@@ -8,13 +8,23 @@ To add a new reward:
 1. Add an entry to DAP_REWARDS.
 2. Call issue_dap_reward(user, 'your_reward_key', logger) at the trigger point.
 
-One-time enforcement uses DappPointEvent as a lightweight tracking table —
-no extra migration required. The action field is stored as 'dap_reward:<key>'.
+issue_dap_reward() only writes a DapRewardGrant outbox row, so request
+handlers never wait on the DAP service. users.tasks.drain_dap_rewards
+(Celery beat, every minute) registers each address once, mints each pending
+grant under its own idempotency key, and retries failures with exponential
+backoff. One-time rewards are guarded by a unique constraint on
+(user, reward_key). Minted rewards are still recorded as DappPointEvent rows
+with action 'dap_reward:<key>' for the user's points history.
 """
 
 import os
 import logging
+from collections import defaultdict
+from datetime import timedelta
+
 import requests as http_requests
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +50,16 @@ DAP_REWARDS = {
     },
 }
 
+# Outbox drain tuning
+DRAIN_BATCH_SIZE = 100
+MAX_ATTEMPTS = 8
+BACKOFF_BASE_SECONDS = 60
+BACKOFF_MAX_SECONDS = 6 * 60 * 60
+# A claimed batch is skipped by other workers until this lease expires. Each
+# address is re-claimed with a fresh lease right before its mint, so the lease
+# only has to cover its register + mints, not the whole batch.
+LEASE_DURATION = timedelta(minutes=10)
+
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
@@ -67,8 +87,18 @@ def _dap_register(stacks_address: str) -> bool:
         return False
 
 
-def _dap_mint(stacks_address: str, amount: int, description: str) -> bool:
-    """Mint DAP credits for a Stacks address. Returns True on success."""
+def _mint_key(grant_id) -> str:
+    return f'dap-grant:{grant_id}'
+
+
+def _dap_mint(stacks_address: str, amount: int, description: str, grant_id) -> bool:
+    """
+    Mint one grant's DAP credits for a Stacks address. Returns True on success.
+
+    The grant id goes along as the Idempotency-Key. It never changes across
+    retries, so a mint that timed out after the DAP service applied it does
+    not credit the address twice, whatever else is pending on the next run.
+    """
     try:
         resp = http_requests.post(
             f"{_dap_base()}/api/credits/mint",
@@ -77,7 +107,7 @@ def _dap_mint(stacks_address: str, amount: int, description: str) -> bool:
                 'amount': amount,
                 'description': description,
             },
-            headers=_dap_headers(),
+            headers={**_dap_headers(), 'Idempotency-Key': _mint_key(grant_id)},
             timeout=15,
         )
         if resp.status_code in (200, 201):
@@ -94,16 +124,16 @@ def _dap_mint(stacks_address: str, amount: int, description: str) -> bool:
 
 def issue_dap_reward(user, reward_key: str, log=None) -> bool:
     """
-    Issue a DAP credit reward to a user.
+    Queue a DAP credit reward for a user.
 
     - Looks up the reward config in DAP_REWARDS.
-    - For one-time rewards, checks DappPointEvent for a prior issuance.
-      If already issued, returns False without calling the DAP service.
-    - Registers the user with the DAP service (idempotent), then mints.
-    - On success, records a DappPointEvent so one-time guards work.
+    - Inserts a pending DapRewardGrant row; the DAP register/mint round trips
+      happen later in drain_pending_rewards().
+    - For one-time rewards, a second insert hits the unique constraint and
+      returns False.
     - All failures are non-fatal: logged and returned as False.
 
-    Returns True if credits were minted, False otherwise.
+    Returns True if a new reward was queued, False otherwise.
     """
     _log = log or logger
 
@@ -117,42 +147,130 @@ def issue_dap_reward(user, reward_key: str, log=None) -> bool:
         _log.warning(f"[dap_rewards] user {user.pk} has no stacks_address — skipping {reward_key}")
         return False
 
-    if not _dap_base():
-        _log.warning(f"[dap_rewards] DAP_SERVICE_URL not set — skipping {reward_key}")
+    from .models import DapRewardGrant
+    try:
+        with transaction.atomic():
+            DapRewardGrant.objects.create(
+                user=user,
+                reward_key=reward_key,
+                one_time=reward.get('one_time', True),
+                stacks_address=stacks_address,
+                amount=reward['amount'],
+                description=reward['description'],
+            )
+    except IntegrityError:
+        _log.info(f"[dap_rewards] {reward_key} already issued to {user.username} — skipping")
+        return False
+    except Exception as e:
+        _log.warning(f"[dap_rewards] failed to queue {reward_key} for {user.username}: {e}")
         return False
 
-    # One-time check via DappPointEvent
-    if reward.get('one_time', True):
-        try:
-            from .models import DappPointEvent
-            tracking_action = f'dap_reward:{reward_key}'
-            if DappPointEvent.objects.filter(user=user, action=tracking_action).exists():
-                _log.info(f"[dap_rewards] {reward_key} already issued to {user.username} — skipping")
-                return False
-        except Exception as e:
-            _log.warning(f"[dap_rewards] one-time check failed for {reward_key}: {e} — proceeding anyway")
-
-    # Register (idempotent) then mint
-    _dap_register(stacks_address)
-
-    amount = reward['amount']
-    description = reward['description']
-    minted = _dap_mint(stacks_address, amount, description)
-
-    if minted:
-        # Record issuance for one-time tracking
-        try:
-            from .models import DappPointEvent
-            DappPointEvent.objects.create(
-                user=user,
-                action=f'dap_reward:{reward_key}',
-                points=amount,
-                description=f'DAP credit reward: {description}',
+    _log.info(f"[dap_rewards] Queued {reward['amount']} credits ({reward_key}) for {user.username}")
+    return True
+
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS))
+
+
+def _reclaim(batch, lease):
+    """The grants of ``batch`` still pending under ``lease``, re-leased for their mints."""
+    from .models import DapRewardGrant
+    with transaction.atomic():
+        claimed = set(
+            DapRewardGrant.objects
+            .select_for_update()
+            .filter(pk__in=[g.pk for g in batch], status='pending', next_attempt_at=lease)
+            .values_list('pk', flat=True)
+        )
+        DapRewardGrant.objects.filter(pk__in=claimed).update(next_attempt_at=timezone.now() + LEASE_DURATION)
+    return [g for g in batch if g.pk in claimed]
+
+
+def drain_pending_rewards(batch_size: int = DRAIN_BATCH_SIZE) -> dict:
+    """
+    Mint a batch of due DapRewardGrant rows.
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED and leased by
+    pushing next_attempt_at forward, so no row lock is held across DAP round
+    trips. Grants are grouped by address: one register call per address per
+    run, then one mint per grant, keyed by the grant id. Right before minting,
+    the address's grants are claimed again with a conditional UPDATE on (pending, this run's lease); grants
+    another worker took over after the lease ran out are dropped from the
+    mint, so a slow batch never mints the same grant twice.
+
+    Returns a summary dict: {'minted': n, 'retrying': n, 'failed': n}.
+    """
+    from . import unread
+    from .models import DapRewardGrant, DappPointEvent
+
+    summary = {'minted': 0, 'retrying': 0, 'failed': 0}
+    if not _dap_base():
+        logger.warning("[dap_rewards] DAP_SERVICE_URL not set — outbox not drained")
+        return summary
+
+    now = timezone.now()
+    lease = now + LEASE_DURATION
+    with transaction.atomic():
+        grants = list(
+            DapRewardGrant.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        DapRewardGrant.objects.filter(pk__in=[g.pk for g in grants]).update(next_attempt_at=lease)
+
+    by_address = defaultdict(list)
+    for grant in grants:
+        by_address[grant.stacks_address].append(grant)
+
+    for stacks_address, batch in by_address.items():
+        batch = _reclaim(batch, lease)
+        if not batch:
+            logger.info(f"[dap_rewards] lease on {stacks_address} expired and was taken over — skipping")
+            continue
+        _dap_register(stacks_address)
+
+        minted = []
+        for grant in batch:
+            grant.attempts += 1
+            if _dap_mint(stacks_address, grant.amount, grant.description, grant.pk):
+                minted.append(grant)
+                grant.status = 'minted'
+                grant.minted_at = timezone.now()
+                grant.last_error = ''
+                summary['minted'] += 1
+            elif grant.attempts >= MAX_ATTEMPTS:
+                grant.status = 'failed'
+                grant.last_error = 'mint failed'
+                summary['failed'] += 1
+            else:
+                grant.next_attempt_at = timezone.now() + _backoff(grant.attempts)
+                grant.last_error = 'mint failed'
+                summary['retrying'] += 1
+
+        with transaction.atomic():
+            DapRewardGrant.objects.bulk_update(
+                batch, ['status', 'attempts', 'minted_at', 'last_error', 'next_attempt_at']
             )
-        except Exception as e:
-            _log.warning(f"[dap_rewards] failed to record DappPointEvent for {reward_key}: {e}")
+            if minted:
+                events = DappPointEvent.objects.bulk_create([
+                    DappPointEvent(
+                        user_id=g.user_id,
+                        action=f'dap_reward:{g.reward_key}',
+                        points=g.amount,
+                        description=f'DAP credit reward: {g.description}',
+                    )
+                    for g in minted
+                ])
+                unread.dap_events_created(events)
 
-        _log.info(f"[dap_rewards] Issued {amount} credits ({reward_key}) to {user.username} ({stacks_address})")
-        return True
+        if minted:
+            amount = sum(g.amount for g in minted)
+            logger.info(f"[dap_rewards] Minted {amount} credits ({len(minted)} rewards) to {stacks_address}")
+        if len(minted) < len(batch):
+            logger.warning(
+                f"[dap_rewards] Mint of {len(batch) - len(minted)} rewards to {stacks_address} failed — will retry"
+            )
 
-    return False
+    return summary
@@ -0,0 +1,60 @@
+"""
+Follow / unfollow with the stored User.follower_count and following_count.
+
+Counters move with F() updates from the Follow post_save / post_delete
+receivers in users.signals, so every path that saves or deletes Follow rows
+(these helpers, serializers, user cascade deletes, the admin) keeps them in
+step. Paths that send no signals (bulk_create, raw SQL) are repaired nightly
+by users.tasks.reconcile_follow_counts, or on demand with
+`python manage.py reconcile_follow_counts`.
+"""
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from . import creator_stats
+from .models import Follow, User
+
+
+def bump(follower_id, following_id, delta):
+    """F() update of both users' counters (and the followed creator's stats) for one Follow."""
+    User.objects.filter(pk=following_id).update(follower_count=F('follower_count') + delta)
+    creator_stats.bump(following_id, followers=delta)
+    User.objects.filter(pk=follower_id).update(following_count=F('following_count') + delta)
+
+
+def follow_user(follower, following_id):
+    """get_or_create the Follow; returns (follow, created)."""
+    return Follow.objects.get_or_create(follower=follower, following_id=following_id)
+
+
+def unfollow(follow):
+    """Delete ``follow``; returns False if it was already gone."""
+    deleted, _ = Follow.objects.filter(pk=follow.pk).delete()
+    return bool(deleted)
+
+
+def _count_of(field):
+    return Coalesce(Subquery(
+        Follow.objects.filter(**{field: OuterRef('pk')})
+        .values(field).annotate(n=Count('pk')).values('n')[:1]
+    ), 0)
+
+
+def reconcile_follow_counts(dry_run=False):
+    """
+    Recount follower/following for every user whose stored counters drifted.
+    Set-based: one UPDATE over the drifted rows. Returns how many rows were off.
+    """
+    drifted = User.objects.annotate(
+        real_followers=_count_of('following'),
+        real_following=_count_of('follower'),
+    ).exclude(
+        follower_count=F('real_followers'),
+        following_count=F('real_following'),
+    ).values('pk')
+    if dry_run:
+        return drifted.count()
+    return User.objects.filter(pk__in=Subquery(drifted)).update(
+        follower_count=_count_of('following'),
+        following_count=_count_of('follower'),
+    )
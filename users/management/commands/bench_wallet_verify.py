@@ -0,0 +1,81 @@
+"""
+Micro-benchmark for Stacks signature verification (users/crypto_utils.py).
+
+Uses the wallet / signature fixtures from users/test_wallet_auth.py (a
+64-byte signature that matches no key, so every recovery id and network is
+tried) plus a real signature from a fixed test key in RSV and bare RS form.
+Reports verifications per second with a cold and a warm address cache, and
+the c32 encoder against the previous divmod loop.
+
+    python manage.py bench_wallet_verify --iterations 2000
+"""
+import logging
+import time
+
+from coincurve import PrivateKey
+from django.core.management.base import BaseCommand
+
+from users import crypto_utils
+from users.test_wallet_auth import WalletAuthenticationTests
+
+# Deterministic throwaway key; never holds funds
+BENCH_KEY = bytes(range(1, 33))
+MESSAGE = 'Sign this message to authenticate with DeOrganized\n\nNonce: 6f1c2a9e'
+
+
+def legacy_c32_encode(data):
+    """The pre-table encoder, kept for comparison."""
+    num = int.from_bytes(data, byteorder='big')
+    result = []
+    while num > 0:
+        result.append(crypto_utils.C32_ALPHABET[num % 32])
+        num //= 32
+    while len(result) < len(data) * 8 // 5:
+        result.append(crypto_utils.C32_ALPHABET[0])
+    return ''.join(reversed(result))
+
+
+class Command(BaseCommand):
+    help = 'Benchmark Stacks wallet signature verification (verifications per second)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        # Diagnostics off, whatever the environment says
+        logging.getLogger(crypto_utils.__name__).setLevel(logging.WARNING)
+        iterations = options['iterations']
+
+        fixtures = WalletAuthenticationTests()
+        fixtures.setUp()
+        key = PrivateKey(BENCH_KEY)
+        address = crypto_utils.derive_stacks_address(key.public_key.format(compressed=True))
+        rsv = key.sign_recoverable(crypto_utils._hash_stacks_message(MESSAGE), hasher=None)
+
+        cases = [
+            ('fixture (no match, 4 ids x 2 networks)', fixtures.test_wallet, MESSAGE, fixtures.test_signature, False),
+            ('valid RSV (recovery id given)', address, MESSAGE, '0x' + rsv.hex(), True),
+            ('valid RS (try all ids)', address, MESSAGE, '0x' + rsv[:64].hex(), True),
+        ]
+        for label, wallet, message, signature, expected in cases:
+            assert crypto_utils.verify_stacks_signature(wallet, message, signature) is expected, label
+            for warm in (False, True):
+                rate = self._rate(iterations, warm, lambda: crypto_utils.verify_stacks_signature(wallet, message, signature))
+                self.stdout.write(f"{label:<42} {'warm' if warm else 'cold'} cache: {rate:>9,.0f} verifications/s")
+
+        payload = bytes([22]) + bytes(range(20)) + b'\x01\x02\x03\x04'
+        assert crypto_utils.c32_encode(payload) == legacy_c32_encode(payload)
+        for label, encode in (('c32 divmod loop', legacy_c32_encode), ('c32_encode', crypto_utils.c32_encode)):
+            rate = self._rate(iterations * 20, True, lambda: encode(payload))
+            self.stdout.write(f"{label:<42} {rate:>20,.0f} encodes/s")
+
+    def _rate(self, iterations, warm, fn):
+        fn()
+        elapsed = 0.0
+        for _ in range(iterations):
+            if not warm:
+                crypto_utils.stacks_addresses.cache_clear()
+            started = time.perf_counter()
+            fn()
+            elapsed += time.perf_counter() - started
+        return iterations / elapsed
@@ -0,0 +1,27 @@
+"""
+Management command to repair the materialized creator stats.
+
+Usage:
+    python manage.py reconcile_creator_stats [--dry-run]
+
+users.creator_stats keeps CreatorStats rows in step through signals; this
+recounts the rows that drifted and creates missing ones for show and event
+owners. The same pass runs nightly as users.tasks.reconcile_creator_stats.
+"""
+from django.core.management.base import BaseCommand
+
+from users.creator_stats import reconcile_creator_stats
+
+
+class Command(BaseCommand):
+    help = 'Recount CreatorStats rows that drifted from shows, events, likes, comments and follows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows are off')
+
+    def handle(self, *args, **options):
+        fixed = reconcile_creator_stats(dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(f'{fixed} creator stats rows are off or missing')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Reconciled {fixed} creator stats rows'))
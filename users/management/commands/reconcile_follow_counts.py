@@ -0,0 +1,28 @@
+"""
+Management command to repair the stored follower/following counters.
+
+Usage:
+    python manage.py reconcile_follow_counts [--dry-run]
+
+users.signals keeps User.follower_count / following_count in step with
+Follow rows; writes that send no signals (bulk_create, raw SQL) leave them
+off. This recounts only the drifted users; users.tasks.reconcile_follow_counts
+runs the same nightly.
+"""
+from django.core.management.base import BaseCommand
+
+from users.follows import reconcile_follow_counts
+
+
+class Command(BaseCommand):
+    help = 'Recount User.follower_count / following_count where they drifted from Follow rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many users are off')
+
+    def handle(self, *args, **options):
+        fixed = reconcile_follow_counts(dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(f'{fixed} users have drifted follow counters')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Reconciled follow counters for {fixed} users'))
@@ -0,0 +1,36 @@
+"""
+Management command to apply the retention policies in users/retention.py.
+
+Usage:
+    python manage.py run_retention [--policy notifications] [--dry-run] [--chunk-size 2000] [--sleep 0.5]
+
+Deletes in primary-key ranges with a pause between them; --dry-run only
+counts what would go. The same pass runs nightly as users.tasks.run_retention.
+"""
+from django.core.management.base import BaseCommand
+
+from users.retention import POLICIES, run_policy
+
+
+class Command(BaseCommand):
+    help = 'Delete (and optionally archive) rows past their retention policy, in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--policy', action='append', choices=sorted(POLICIES), help='Policy to run (repeatable; default all)')
+        parser.add_argument('--dry-run', action='store_true', help='Only count eligible rows')
+        parser.add_argument('--chunk-size', type=int, default=None, help='Rows per delete (default RETENTION_CHUNK_SIZE)')
+        parser.add_argument('--sleep', type=float, default=None, help='Seconds between chunks (default RETENTION_CHUNK_SLEEP)')
+
+    def handle(self, *args, **options):
+        for name in options['policy'] or POLICIES:
+            progress = run_policy(
+                POLICIES[name], dry_run=options['dry_run'],
+                chunk_size=options['chunk_size'], sleep=options['sleep'],
+            )
+            if options['dry_run']:
+                self.stdout.write(f"{name}: {progress['deleted']} rows eligible")
+            else:
+                archived = f", {progress['archived']} archived to {progress['archive_file']}" if progress['archive_file'] else ''
+                self.stdout.write(self.style.SUCCESS(
+                    f"{name}: {progress['deleted']} deleted in {progress['chunks']} chunks{archived}"
+                ))
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.12 on 2026-10-18 21:17
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_issued_rewards(apps, schema_editor):
+    """
+    Rewards minted before the outbox existed were tracked only as
+    DappPointEvent rows with action 'dap_reward:<key>'. Record them as minted
+    grants so the unique constraint keeps them one-time.
+    """
+    DappPointEvent = apps.get_model('users', 'DappPointEvent')
+    DapRewardGrant = apps.get_model('users', 'DapRewardGrant')
+
+    seen = set()
+    grants = []
+    events = (
+        DappPointEvent.objects
+        .filter(action__startswith='dap_reward:')
+        .select_related('user')
+        .order_by('created_at')
+    )
+    for event in events.iterator():
+        reward_key = event.action.split(':', 1)[1][:50]
+        if (event.user_id, reward_key) in seen:
+            continue
+        seen.add((event.user_id, reward_key))
+        grants.append(DapRewardGrant(
+            user_id=event.user_id,
+            reward_key=reward_key,
+            one_time=True,
+            stacks_address=event.user.stacks_address or '',
+            amount=event.points,
+            description=event.description[:255],
+            status='minted',
+            minted_at=event.created_at,
+        ))
+    DapRewardGrant.objects.bulk_create(grants, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0018_dapointevent_action_is_read'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DapRewardGrant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reward_key', models.CharField(max_length=50)),
+                ('one_time', models.BooleanField(default=True)),
+                ('stacks_address', models.CharField(max_length=255)),
+                ('amount', models.IntegerField()),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('minted', 'Minted'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.CharField(blank=True, max_length=255)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('minted_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dap_reward_grants', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='users_dapre_status_51f90f_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('one_time', True)), fields=('user', 'reward_key'), name='users_dap_reward_one_time')],
+            },
+        ),
+        migrations.RunPython(backfill_issued_rewards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.12 on 2026-10-18 21:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('users', '0020_user_follow_counters'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='users_comme_parent__8f657e_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['parent', '-created_at', '-id'], name='users_comme_parent__bac2d6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('parent__isnull', True)), fields=['content_type', 'object_id', '-created_at', '-id'], name='users_comment_roots_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.12 on 2026-10-18 21:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('users', '0021_comment_reply_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='users_comme_content_5458c9_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='users_comme_user_id_853883_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='like',
+            name='users_like_content_2fb2f4_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='like',
+            name='users_like_user_id_bf796a_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='users_notif_recipie_458498_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['content_type', 'object_id', '-created_at', '-id'], name='users_comme_content_81b09e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='users_comme_user_id_c5778e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(fields=['content_type', 'object_id', '-created_at', '-id'], name='users_like_content_d2c1d5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='users_like_user_id_a326fd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', '-created_at', '-id'], name='users_notif_recipie_86e1ff_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.12 on 2026-10-18 21:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0022_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CreatorStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='creator_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('views', models.IntegerField(default=0)),
+                ('shares', models.IntegerField(default=0)),
+                ('likes', models.IntegerField(default=0)),
+                ('comments', models.IntegerField(default=0)),
+                ('shows', models.IntegerField(default=0)),
+                ('events', models.IntegerField(default=0)),
+                ('followers', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'creator stats',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.12 on 2026-10-18 22:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0023_creator_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='others_count',
+            field=models.PositiveIntegerField(default=0, help_text='Further actors coalesced into this notification (see users/notifications.py)'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.12 on 2026-10-18 22:04
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_unread_counts(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    Notification = apps.get_model('users', 'Notification')
+    DappPointEvent = apps.get_model('users', 'DappPointEvent')
+
+    def unread_of(model, user_field):
+        return Coalesce(Subquery(
+            model.objects.filter(**{user_field: OuterRef('pk'), 'is_read': False}).order_by()
+            .values(user_field).annotate(n=Count('pk')).values('n')[:1]
+        ), 0)
+
+    User.objects.update(
+        unread_notification_count=unread_of(Notification, 'recipient'),
+        unread_dap_event_count=unread_of(DappPointEvent, 'user'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0024_notification_others_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='unread_dap_event_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='unread_notification_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_unread_counts, migrations.RunPython.noop),
+    ]
@@ -92,6 +92,15 @@ class User(AbstractUser):
     # True once stacks_address is cryptographically verified at signup
     wallet_verified = models.BooleanField(default=False)
 
+    # Stored counters, maintained by users.follows (reconcile_follow_counts repairs drift)
+    follower_count = models.IntegerField(default=0)
+    following_count = models.IntegerField(default=0)
+    # Maintained by users.unread (reconcile_unread_counts repairs drift)
+    unread_notification_count = models.IntegerField(default=0)
+    unread_dap_event_count = models.IntegerField(default=0)
+    # Carried in issued JWTs; bumped on deactivation to revoke them (users.authentication)
+    token_version = models.PositiveIntegerField(default=0)
+
     # The Stacks address derived from the key used to sign messages via
     # stx_signMessage. This is NOT the same as stacks_address (STX spending
     # key) — Leather signs messages with the app/data key, which has a
@@ -110,6 +119,7 @@ class User(AbstractUser):
         indexes = [
             models.Index(fields=['role', '-date_joined']),
             models.Index(fields=['is_verified']),
+            models.Index(fields=['role', '-follower_count']),
         ]
     
     def __str__(self):
@@ -120,16 +130,6 @@ class User(AbstractUser):
         """Check if user has creator role"""
         return self.role == 'creator'
     
-    @property
-    def follower_count(self):
-        """Number of users following this user"""
-        return self.followers.count()
-    
-    @property
-    def following_count(self):
-        """Number of users this user is following"""
-        return self.following.count()
-    
     def get_liked_shows(self):
         """
         Return all shows this user has liked.
@@ -167,8 +167,8 @@ class Like(models.Model):
         ordering = ['-created_at']
         unique_together = ['user', 'content_type', 'object_id']
         indexes = [
-            models.Index(fields=['content_type', 'object_id']),
-            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['content_type', 'object_id', '-created_at', '-id']),
+            models.Index(fields=['user', '-created_at', '-id']),
         ]
     
     def __str__(self):
@@ -207,18 +207,20 @@ class Comment(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['content_type', 'object_id', '-created_at']),
-            models.Index(fields=['user', '-created_at']),
-            models.Index(fields=['parent']),
+            models.Index(fields=['content_type', 'object_id', '-created_at', '-id']),
+            models.Index(fields=['user', '-created_at', '-id']),
+            # Reply previews and the replies cursor: newest replies per parent
+            models.Index(fields=['parent', '-created_at', '-id']),
+            # Top-level comments of one object, newest first
+            models.Index(
+                fields=['content_type', 'object_id', '-created_at', '-id'],
+                condition=models.Q(parent__isnull=True),
+                name='users_comment_roots_idx',
+            ),
         ]
     
     def __str__(self):
         return f"{self.user.username}: {self.text[:50]}"
-    
-    @property
-    def reply_count(self):
-        """Number of replies to this comment"""
-        return self.replies.count()
 
 
 class Follow(models.Model):
@@ -297,6 +299,10 @@ class Notification(models.Model):
     )
     object_id = models.PositiveIntegerField(null=True, blank=True)
     content_object = GenericForeignKey('content_type', 'object_id')
+    others_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Further actors coalesced into this notification (see users/notifications.py)"
+    )
     
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -304,7 +310,7 @@ class Notification(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['recipient', '-created_at']),
+            models.Index(fields=['recipient', '-created_at', '-id']),
             models.Index(fields=['recipient', 'is_read']),
         ]
     
@@ -482,3 +488,75 @@ class DappPointEvent(models.Model):
 
     def __str__(self):
         return f"{self.user.username} +{self.points}pts ({self.action})"
+
+
+class DapRewardGrant(models.Model):
+    """
+    Outbox row for a DAP credit reward (see users/dap_rewards.py).
+
+    Request handlers only insert a 'pending' row; users.tasks.drain_dap_rewards
+    registers and mints in batches. One-time rewards are enforced by the
+    conditional unique constraint rather than a check-then-insert.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('minted', 'Minted'),
+        ('failed', 'Failed'),
+    ]
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='dap_reward_grants'
+    )
+    reward_key = models.CharField(max_length=50)
+    one_time = models.BooleanField(default=True)
+    stacks_address = models.CharField(max_length=255)
+    amount = models.IntegerField()
+    description = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.CharField(max_length=255, blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    minted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'reward_key'],
+                condition=models.Q(one_time=True),
+                name='users_dap_reward_one_time',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} {self.reward_key} ({self.status})"
+
+
+class CreatorStats(models.Model):
+    """
+    Engagement totals for one creator, served by GET /api/users/<id>/stats/
+    (see users/creator_stats.py). Kept current by signals and reconciled
+    nightly by users.tasks.reconcile_creator_stats.
+    """
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name='creator_stats'
+    )
+    # Shows carry no view counter yet; reserved so the payload shape is stable
+    views = models.IntegerField(default=0)
+    shares = models.IntegerField(default=0)
+    likes = models.IntegerField(default=0)
+    comments = models.IntegerField(default=0)
+    shows = models.IntegerField(default=0)
+    events = models.IntegerField(default=0)
+    followers = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'creator stats'
+
+    def __str__(self):
+        return f"{self.user.username} stats"
@@ -0,0 +1,196 @@
+"""
+Queued, coalesced like / comment notifications.
+
+The Like and Comment signals (users.signals) only call enqueue() with ids:
+no owner lookup and no INSERT on the request path. Events reach
+users.tasks.deliver_notifications, which resolves owners per content type
+in one query each and writes with bulk_create / bulk_update.
+
+With Redis (NOTIFY_REDIS_URL, falling back to REDIS_URL) events are buffered
+in a list and the first event of a burst schedules one flush
+NOTIFY_FLUSH_DELAY seconds later, so a burst is delivered as one batch; a
+beat run every minute drains anything a lost flush left behind. Without
+Redis each event is sent to the worker on its own.
+
+Coalescing: events for the same (recipient, type, target) become one
+notification whose ``actor`` is the latest actor and ``others_count`` the
+number of further actors ("alice and 14 others liked your show"). A batch
+also folds into a matching unread notification younger than
+NOTIFY_COALESCE_WINDOW seconds instead of adding a row.
+"""
+import os
+import json
+import logging
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import unread
+from .models import Comment, Notification
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_REDIS_URL = lambda: os.environ.get('NOTIFY_REDIS_URL') or os.environ.get('REDIS_URL')
+NOTIFY_FLUSH_DELAY = lambda: int(os.environ.get('NOTIFY_FLUSH_DELAY', 5))
+NOTIFY_COALESCE_WINDOW = lambda: int(os.environ.get('NOTIFY_COALESCE_WINDOW', 15 * 60))
+
+BUFFER_KEY = 'notifications:pending'
+# Target owner, checked in this order (Show.creator, Post/News.author, Event.organizer)
+OWNER_FIELDS = ('creator', 'author', 'organizer')
+
+_buffer = {'url': None, 'buffer': None}
+
+
+class RedisNotificationBuffer:
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url):
+        import redis
+        return cls(redis.Redis.from_url(url))
+
+    def push(self, event):
+        """Append ``event``; returns the buffer length after the push."""
+        return self.client.rpush(BUFFER_KEY, json.dumps(event))
+
+    def drain(self):
+        pipe = self.client.pipeline()
+        pipe.lrange(BUFFER_KEY, 0, -1)
+        pipe.delete(BUFFER_KEY)
+        raw, _ = pipe.execute()
+        return [json.loads(item) for item in raw]
+
+
+def get_buffer():
+    """The Redis event buffer, or None when no Redis is configured."""
+    url = NOTIFY_REDIS_URL()
+    if not url:
+        return None
+    if _buffer['url'] != url:
+        _buffer['buffer'] = RedisNotificationBuffer.from_url(url)
+        _buffer['url'] = url
+    return _buffer['buffer']
+
+
+def event_for(instance, notification_type):
+    """The queued form of a Like/Comment: ids only."""
+    return {
+        'type': notification_type,
+        'actor_id': instance.user_id,
+        'content_type_id': instance.content_type_id,
+        'object_id': instance.object_id,
+        'parent_id': getattr(instance, 'parent_id', None),
+    }
+
+
+def enqueue(event):
+    """Queue ``event`` once the current transaction commits; deliver inline if Redis and the broker are down."""
+    from .tasks import deliver_notifications
+
+    def send():
+        try:
+            buffer = get_buffer()
+            if buffer is None:
+                deliver_notifications.apply_async(args=[[event]], retry=False)
+            elif buffer.push(event) == 1:
+                deliver_notifications.apply_async(countdown=NOTIFY_FLUSH_DELAY(), retry=False)
+        except Exception as e:
+            logger.warning(f"[notifications] could not queue {event['type']} event, delivering inline: {e}")
+            deliver([event])
+    transaction.on_commit(send)
+
+
+def drain():
+    buffer = get_buffer()
+    return buffer.drain() if buffer is not None else []
+
+
+def _owner_field(model):
+    names = {field.name for field in model._meta.get_fields()}
+    return next((name for name in OWNER_FIELDS if name in names), None)
+
+
+def _recipients(events):
+    """{(content_type_id, object_id) or ('reply', parent_id): recipient id}, one query per model."""
+    targets = {}
+    for event in events:
+        if event['type'] != 'comment_reply':
+            targets.setdefault(event['content_type_id'], set()).add(event['object_id'])
+
+    owners = {}
+    for content_type_id, object_ids in targets.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        field = model and _owner_field(model)
+        if field:
+            for pk, owner_id in model.objects.filter(pk__in=object_ids).values_list('pk', f'{field}_id'):
+                owners[(content_type_id, pk)] = owner_id
+
+    parent_ids = {event['parent_id'] for event in events if event['type'] == 'comment_reply'}
+    if parent_ids:
+        for pk, user_id in Comment.objects.filter(pk__in=parent_ids).values_list('pk', 'user_id'):
+            owners[('reply', pk)] = user_id
+    return owners
+
+
+def deliver(events):
+    """Write notifications for ``events``, coalescing per recipient and target. Returns rows touched."""
+    if not events:
+        return 0
+    owners = _recipients(events)
+
+    # (recipient, type, content_type, object) -> distinct actor ids, oldest first
+    groups = OrderedDict()
+    for event in events:
+        if event['type'] == 'comment_reply':
+            recipient_id = owners.get(('reply', event['parent_id']))
+        else:
+            recipient_id = owners.get((event['content_type_id'], event['object_id']))
+        if recipient_id is None or recipient_id == event['actor_id']:
+            continue  # target gone, or own content
+        key = (recipient_id, event['type'], event['content_type_id'], event['object_id'])
+        actors = groups.setdefault(key, [])
+        if event['actor_id'] in actors:
+            actors.remove(event['actor_id'])
+        actors.append(event['actor_id'])
+    if not groups:
+        return 0
+
+    since = timezone.now() - timedelta(seconds=NOTIFY_COALESCE_WINDOW())
+    match = Q()
+    for recipient_id, notification_type, content_type_id, object_id in groups:
+        match |= Q(recipient_id=recipient_id, notification_type=notification_type,
+                   content_type_id=content_type_id, object_id=object_id)
+    existing = {}
+    for notification in Notification.objects.filter(match, is_read=False, created_at__gte=since).order_by('created_at'):
+        key = (notification.recipient_id, notification.notification_type,
+               notification.content_type_id, notification.object_id)
+        existing[key] = notification  # newest wins
+
+    created, updated = [], []
+    for key, actors in groups.items():
+        recipient_id, notification_type, content_type_id, object_id = key
+        notification = existing.get(key)
+        if notification is None:
+            created.append(Notification(
+                recipient_id=recipient_id, actor_id=actors[-1], notification_type=notification_type,
+                content_type_id=content_type_id, object_id=object_id, others_count=len(actors) - 1,
+            ))
+            continue
+        # The previous actor becomes one of the others. Earlier others are not
+        # stored, so one of them acting again counts twice.
+        new_actors = [actor for actor in actors if actor != notification.actor_id]
+        if new_actors:
+            notification.others_count += len(new_actors)
+            notification.actor_id = actors[-1]
+            updated.append(notification)
+
+    with transaction.atomic():
+        Notification.objects.bulk_create(created)
+        Notification.objects.bulk_update(updated, ['actor', 'others_count'])
+        unread.notifications_created(created)
+    return len(created) + len(updated)
@@ -0,0 +1,179 @@
+"""
+Retention for tables that only ever grow.
+
+Each RetentionPolicy names a model and the rows that may go. run_policy()
+deletes them in primary-key ranges of RETENTION_CHUNK_SIZE rows, one short
+transaction per range with RETENTION_CHUNK_SLEEP seconds between ranges, so
+no single statement holds locks or produces WAL for the whole backlog.
+
+Policies with ``archive=True`` write each range to a gzipped JSONL file under
+RETENTION_ARCHIVE_DIR before deleting it (nothing is deleted if the write
+fails); with no directory configured they only delete.
+
+Progress (rows deleted / archived, ranges done, last pk) is logged per range
+and kept in the cache under ``retention:<policy>`` for the admin to poll.
+users.tasks.run_retention runs every policy nightly via Celery Beat; for a
+one-off run:
+
+    python manage.py run_retention [--policy notifications] [--dry-run]
+"""
+import os
+import gzip
+import json
+import time
+import logging
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+RETENTION_CHUNK_SIZE = lambda: int(os.environ.get('RETENTION_CHUNK_SIZE', 2000))
+RETENTION_CHUNK_SLEEP = lambda: float(os.environ.get('RETENTION_CHUNK_SLEEP', 0.5))
+RETENTION_ARCHIVE_DIR = lambda: os.environ.get('RETENTION_ARCHIVE_DIR', '')
+
+PROGRESS_CACHE_KEY = 'retention:{}'
+PROGRESS_TTL = 7 * 24 * 3600
+
+
+class RetentionPolicy:
+    """
+    ``eligible`` returns the queryset of rows that may be deleted now.
+    ``days`` is the default age limit, overridable with RETENTION_<NAME>_DAYS.
+    """
+
+    def __init__(self, name, model, eligible, days=None, archive=False):
+        self.name = name
+        self.model = model
+        self.eligible = eligible
+        self.default_days = days
+        self.archive = archive
+
+    @property
+    def days(self):
+        return int(os.environ.get(f'RETENTION_{self.name.upper()}_DAYS', self.default_days or 0))
+
+    def cutoff(self):
+        return timezone.now() - timedelta(days=self.days)
+
+    def queryset(self):
+        from django.apps import apps
+        return self.eligible(self, apps.get_model(self.model).objects.all())
+
+
+def _read_notifications(policy, queryset):
+    # Unread notifications stay: users.unread counts them
+    return queryset.filter(is_read=True, created_at__lt=policy.cutoff())
+
+
+def _old_point_events(policy, queryset):
+    return queryset.filter(is_read=True, created_at__lt=policy.cutoff())
+
+
+def _orphaned_likes(policy, queryset):
+    """Likes whose target no longer exists (deleted behind the GenericRelation cascade)."""
+    from django.contrib.contenttypes.models import ContentType
+    orphaned = Q()
+    for content_type in ContentType.objects.filter(
+        pk__in=queryset.order_by().values('content_type_id').distinct()
+    ):
+        model = content_type.model_class()
+        if model is None:
+            orphaned |= Q(content_type=content_type)
+        else:
+            orphaned |= Q(content_type=content_type) & ~Exists(
+                model.objects.filter(pk=OuterRef('object_id'))
+            )
+    return queryset.filter(orphaned) if orphaned else queryset.none()
+
+
+POLICIES = {
+    policy.name: policy for policy in [
+        RetentionPolicy('notifications', 'users.Notification', _read_notifications, days=30),
+        RetentionPolicy('dap_point_events', 'users.DappPointEvent', _old_point_events, days=365, archive=True),
+        RetentionPolicy('orphaned_likes', 'users.Like', _orphaned_likes, archive=True),
+    ]
+}
+
+
+def _archive_path(policy, started_at):
+    directory = Path(RETENTION_ARCHIVE_DIR()) / policy.name
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"{started_at:%Y%m%dT%H%M%S}.jsonl.gz"
+
+
+def _save_progress(policy, progress):
+    cache.set(PROGRESS_CACHE_KEY.format(policy.name), progress, PROGRESS_TTL)
+
+
+def get_progress(name):
+    return cache.get(PROGRESS_CACHE_KEY.format(name))
+
+
+def run_policy(policy, dry_run=False, chunk_size=None, sleep=None):
+    """Apply ``policy`` range by range; returns the progress dict."""
+    chunk_size = chunk_size or RETENTION_CHUNK_SIZE()
+    sleep = RETENTION_CHUNK_SLEEP() if sleep is None else sleep
+    started_at = timezone.now()
+    progress = {
+        'policy': policy.name, 'started_at': started_at.isoformat(), 'finished_at': None,
+        'deleted': 0, 'archived': 0, 'chunks': 0, 'last_pk': None, 'archive_file': None,
+    }
+    archive_path = None
+    if policy.archive and RETENTION_ARCHIVE_DIR() and not dry_run:
+        archive_path = _archive_path(policy, started_at)
+        progress['archive_file'] = str(archive_path)
+
+    eligible = policy.queryset()
+    last_pk = None
+    while True:
+        batch = eligible if last_pk is None else eligible.filter(pk__gt=last_pk)
+        pks = list(batch.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            break
+        # Re-check eligibility inside the range: rows may have changed since
+        chunk = eligible.filter(pk__gte=pks[0], pk__lte=pks[-1])
+        if dry_run:
+            progress['deleted'] += len(pks)
+        else:
+            with transaction.atomic():
+                if archive_path is not None:
+                    rows = list(chunk.order_by('pk').values())
+                    with gzip.open(archive_path, 'at', encoding='utf-8') as archive:
+                        for row in rows:
+                            archive.write(json.dumps(row, cls=DjangoJSONEncoder) + '\n')
+                    progress['archived'] += len(rows)
+                progress['deleted'] += chunk.delete()[1].get(policy.model, 0)
+        last_pk = pks[-1]
+        progress['chunks'] += 1
+        progress['last_pk'] = last_pk
+        _save_progress(policy, progress)
+        logger.info(
+            f"[retention] {policy.name}: chunk {progress['chunks']} up to pk {last_pk}, "
+            f"{progress['deleted']} deleted, {progress['archived']} archived"
+        )
+        if len(pks) < chunk_size:
+            break
+        if sleep:
+            time.sleep(sleep)
+
+    progress['finished_at'] = timezone.now().isoformat()
+    _save_progress(policy, progress)
+    return progress
+
+
+def run_all(names=None, dry_run=False):
+    """Run the named policies (all by default); returns {name: progress}."""
+    results = {}
+    for name in names or POLICIES:
+        try:
+            results[name] = run_policy(POLICIES[name], dry_run=dry_run)
+        except Exception as e:
+            logger.warning(f"[retention] {name} failed: {e}")
+            results[name] = {'policy': name, 'error': str(e)}
+    return results
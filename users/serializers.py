@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from django.db import models
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from .models import Like, Comment, Follow, Notification, RTMPDestination, Subscription
@@ -7,6 +8,18 @@ from django.contrib.contenttypes.models import ContentType
 User = get_user_model()
 
 
+def with_community_slug(queryset):
+    """
+    Annotate ``founded_community_slug`` on a User queryset so a page of
+    UserSerializer rows resolves community_slug without a query per user.
+    """
+    from communities.models import Membership
+    return queryset.annotate(founded_community_slug=models.Subquery(
+        Membership.objects.filter(user=models.OuterRef('pk'), role='founder')
+        .order_by('joined_at', 'pk').values('community__slug')[:1]
+    ))
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Public user profile serializer — no PII."""
     follower_count = serializers.IntegerField(read_only=True)
@@ -15,6 +28,8 @@ class UserSerializer(serializers.ModelSerializer):
     community_slug = serializers.SerializerMethodField()
 
     def get_community_slug(self, obj):
+        if hasattr(obj, 'founded_community_slug'):
+            return obj.founded_community_slug
         from communities.models import Membership
         m = Membership.objects.filter(user=obj, role='founder').select_related('community').first()
         return m.community.slug if m else None
@@ -130,28 +145,58 @@ class LikeSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at']
 
 
+class CommentListSerializer(serializers.ListSerializer):
+    """Loads the reply previews of every top-level comment on the page in one query."""
+
+    def to_representation(self, data):
+        from .comment_tree import attach_reply_previews
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        attach_reply_previews([obj for obj in items if obj.parent_id is None])
+        return super().to_representation(items)
+
+
 class CommentSerializer(serializers.ModelSerializer):
-    """Serializer for comments with nested reply support"""
+    """
+    Serializer for comments with nested reply support.
+    Expects reply_count to be annotated (see users.comment_tree).
+    """
     user = UserListSerializer(read_only=True)
     reply_count = serializers.IntegerField(read_only=True)
     replies = serializers.SerializerMethodField()
+    more_replies = serializers.SerializerMethodField()
     
     class Meta:
         model = Comment
+        list_serializer_class = CommentListSerializer
         fields = [
             'id', 'user', 'text', 'parent',
             'content_type', 'object_id',
             'created_at', 'updated_at',
-            'reply_count', 'replies'
+            'reply_count', 'replies', 'more_replies'
         ]
         read_only_fields = ['created_at', 'updated_at']
+
+    def _preview(self, obj):
+        from .comment_tree import attach_reply_previews
+        if obj.parent_id is not None:
+            return []
+        attach_reply_previews([obj])
+        return obj._reply_preview
     
     def get_replies(self, obj):
-        """Get nested replies (one level deep)"""
-        if obj.parent is None:
-            replies = obj.replies.all()[:5]  # Limit to 5 most recent
-            return CommentSerializer(replies, many=True, context=self.context).data
-        return []
+        """Newest replies of a top-level comment (one level deep)"""
+        return CommentSerializer(self._preview(obj), many=True, context=self.context).data
+
+    def get_more_replies(self, obj):
+        """Cursor link to the replies after the preview, or None"""
+        preview = self._preview(obj)
+        request = self.context.get('request')
+        if not preview or obj.reply_count <= len(preview) or request is None:
+            return None
+        from rest_framework.reverse import reverse
+        from api.pagination import CreatedAtCursorPagination
+        url = reverse('comment-replies', args=[obj.pk], request=request)
+        return CreatedAtCursorPagination().next_link_after(url, preview)
 
 
 class CommentCreateSerializer(serializers.ModelSerializer):
@@ -380,15 +425,34 @@ class NotificationSerializer(serializers.ModelSerializer):
     content_type_name = serializers.SerializerMethodField()
     show_slug = serializers.SerializerMethodField()
     show_title = serializers.SerializerMethodField()
+    summary = serializers.SerializerMethodField()
     
     class Meta:
         model = Notification
         fields = [
             'id', 'recipient', 'actor', 'notification_type',
             'content_type', 'object_id', 'content_type_name',
-            'show_slug', 'show_title', 'is_read', 'created_at'
+            'show_slug', 'show_title', 'others_count', 'summary', 'is_read', 'created_at'
         ]
-        read_only_fields = ['id', 'recipient', 'actor', 'created_at']
+        read_only_fields = ['id', 'recipient', 'actor', 'others_count', 'created_at']
+
+    SUMMARY_VERBS = {
+        'like': 'liked your {target}',
+        'comment': 'commented on your {target}',
+        'comment_reply': 'replied to your comment',
+        'follow': 'followed you',
+    }
+
+    def get_summary(self, obj):
+        """e.g. "alice and 14 others liked your show"; None for types without a verb"""
+        verb = self.SUMMARY_VERBS.get(obj.notification_type)
+        if not verb:
+            return None
+        who = obj.actor.username
+        if obj.others_count:
+            who += f" and {obj.others_count} other{'s' if obj.others_count > 1 else ''}"
+        target = obj.content_type.model if obj.content_type_id else 'content'
+        return f"{who} {verb.format(target=target)}"
     
     def get_content_type_name(self, obj):
         """Return the model name of the content type (e.g., 'show', 'post', 'event')"""
@@ -1,91 +1,175 @@
 """
 Django signals for creating notifications on user interactions.
 """
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.contrib.contenttypes.models import ContentType
-from .models import Like, Comment, Notification
-
-
-def get_content_owner(content_object):
-    """
-    Get the owner of a content object, checking common field names:
-    - creator (Show)
-    - author (Post)
-    - organizer (Event)
-    Returns the owner user or None.
-    """
-    for attr in ('creator', 'author', 'organizer'):
-        owner = getattr(content_object, attr, None)
-        if owner is not None:
-            return owner
-    return None
+from .models import Like, Comment, Follow, Notification, DappPointEvent
+from . import authentication, creator_stats, follows, notifications, unread
 
 
 @receiver(post_save, sender=Like)
 def create_like_notification(sender, instance, created, **kwargs):
-    """Create notification when someone likes content"""
+    """Queue a notification for the liked content's owner (delivered by users.notifications)"""
     if created:
-        try:
-            # Instance is the Like object
-            content_object = instance.content_object
-            if not content_object:
-                print(f"DEBUG: No content_object found for Like ID {instance.id}")
-                return
-
-            recipient = get_content_owner(content_object)
-            
-            # Don't notify if liking own content
-            if recipient and recipient != instance.user:
-                Notification.objects.create(
-                    recipient=recipient,
-                    actor=instance.user,
-                    notification_type='like',
-                    content_type=instance.content_type,
-                    object_id=instance.object_id
-                )
-        except Exception as e:
-            # Log error but don't crash the request
-            print(f"Error creating like notification: {str(e)}")
+        notifications.enqueue(notifications.event_for(instance, 'like'))
 
 
 @receiver(post_save, sender=Comment)
 def create_comment_notification(sender, instance, created, **kwargs):
-    """Create notification when someone comments on content or replies to a comment"""
+    """Queue a notification for the content owner, or the parent's author for a reply"""
     if created:
-        try:
-            # 1. Handle notification for replies
-            if instance.parent:
-                if instance.parent.user != instance.user:
-                    Notification.objects.create(
-                        recipient=instance.parent.user,
-                        actor=instance.user,
-                        notification_type='comment_reply',
-                        content_type=instance.content_type,
-                        object_id=instance.object_id
-                    )
-                return
-
-            # 2. Handle notification for top-level comments
-            content_object = instance.content_object
-            if not content_object:
-                print(f"DEBUG: No content_object found for Comment ID {instance.id}")
-                return
-
-            recipient = get_content_owner(content_object)
-            
-            # Don't notify if commenting on own content
-            if recipient and recipient != instance.user:
-                Notification.objects.create(
-                    recipient=recipient,
-                    actor=instance.user,
-                    notification_type='comment',
-                    content_type=instance.content_type,
-                    object_id=instance.object_id
-                )
-        except Exception as e:
-            # Log error but don't crash the request
-            print(f"Error creating comment notification: {str(e)}")
+        notification_type = 'comment_reply' if instance.parent_id else 'comment'
+        notifications.enqueue(notifications.event_for(instance, notification_type))
+
+
+# ---------------------------------------------------------------------------
+# Stored follower / following counters (users.follows)
+# ---------------------------------------------------------------------------
+
+@receiver(post_save, sender=Follow)
+def count_follow(sender, instance, created, **kwargs):
+    if created:
+        follows.bump(instance.follower_id, instance.following_id, 1)
+
+
+@receiver(post_delete, sender=Follow)
+def uncount_follow(sender, instance, **kwargs):
+    follows.bump(instance.follower_id, instance.following_id, -1)
+
+
+# ---------------------------------------------------------------------------
+# Stored unread counters (users.unread)
+# ---------------------------------------------------------------------------
+
+@receiver(post_save, sender=Notification)
+def count_unread_notification(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        unread.bump(instance.recipient_id, unread.NOTIFICATIONS, 1)
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_unread_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        unread.bump(instance.recipient_id, unread.NOTIFICATIONS, -1)
+
+
+@receiver(post_save, sender=DappPointEvent)
+def count_unread_dap_event(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        unread.bump(instance.user_id, unread.DAP_EVENTS, 1)
+
+
+@receiver(post_delete, sender=DappPointEvent)
+def uncount_unread_dap_event(sender, instance, **kwargs):
+    if not instance.is_read:
+        unread.bump(instance.user_id, unread.DAP_EVENTS, -1)
+
+
+# ---------------------------------------------------------------------------
+# Stored like_count / comment_count on Show, Post, News and Event
+# ---------------------------------------------------------------------------
+
+# (app_label, model) of every Like/Comment target with stored counters
+COUNTED_MODELS = {('shows', 'show'), ('posts', 'post'), ('news', 'news'), ('events', 'event')}
+
+
+def bump_engagement_count(instance, field, delta):
+    """F() update of ``field`` on the object a Like/Comment points at."""
+    ct = ContentType.objects.get_for_id(instance.content_type_id)
+    if (ct.app_label, ct.model) not in COUNTED_MODELS:
+        return
+    ct.model_class().objects.filter(pk=instance.object_id).update(**{field: F(field) + delta})
+    if (ct.app_label, ct.model) == ('shows', 'show'):
+        creator_stats.bump_show_creator(instance.object_id, **{STATS_FIELDS[field]: delta})
+
+
+# Stored counter -> users.CreatorStats field, for Likes/Comments on shows
+STATS_FIELDS = {'like_count': 'likes', 'comment_count': 'comments'}
+
+
+@receiver(post_save, sender=Like)
+def count_like(sender, instance, created, **kwargs):
+    if created:
+        bump_engagement_count(instance, 'like_count', 1)
+
+
+@receiver(post_delete, sender=Like)
+def uncount_like(sender, instance, **kwargs):
+    bump_engagement_count(instance, 'like_count', -1)
+
+
+@receiver(post_save, sender=Comment)
+def count_comment(sender, instance, created, **kwargs):
+    if created:
+        bump_engagement_count(instance, 'comment_count', 1)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_comment(sender, instance, **kwargs):
+    bump_engagement_count(instance, 'comment_count', -1)
+
+
+# ---------------------------------------------------------------------------
+# CreatorStats show / event totals
+# ---------------------------------------------------------------------------
+
+@receiver(post_save, sender='shows.Show')
+def count_show(sender, instance, created, **kwargs):
+    if created:
+        creator_stats.bump(instance.creator_id, shows=1)
+
+
+@receiver(post_delete, sender='shows.Show')
+def uncount_show(sender, instance, **kwargs):
+    creator_stats.bump(instance.creator_id, shows=-1, shares=-instance.share_count)
+
+
+@receiver(post_save, sender='events.Event')
+def count_event(sender, instance, created, **kwargs):
+    if created:
+        creator_stats.bump(instance.organizer_id, events=1)
+
+
+@receiver(post_delete, sender='events.Event')
+def uncount_event(sender, instance, **kwargs):
+    creator_stats.bump(instance.organizer_id, events=-1)
+
+
+# ---------------------------------------------------------------------------
+# Cached JWT users (users.authentication)
+# ---------------------------------------------------------------------------
+
+@receiver(pre_save, sender='users.User')
+def note_deactivation(sender, instance, **kwargs):
+    """Flag an active -> inactive save so post_save can revoke the user's tokens."""
+    instance._deactivating = bool(
+        instance.pk and not instance.is_active
+        and sender.objects.filter(pk=instance.pk, is_active=True).exists()
+    )
+
+
+@receiver(post_save, sender='users.User')
+def drop_cached_user(sender, instance, created, **kwargs):
+    authentication.invalidate_user(instance)
+    if getattr(instance, '_deactivating', False):
+        sender.objects.filter(pk=instance.pk).update(token_version=F('token_version') + 1)
+        instance.token_version += 1
+        instance._deactivating = False
+
+
+@receiver(m2m_changed, sender='users.User_groups')
+@receiver(m2m_changed, sender='users.User_user_permissions')
+def drop_cached_user_on_permission_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            authentication.invalidate_user(instance)
+    elif action == 'pre_clear':
+        # A group / permission losing all its users; pk_set is not given
+        authentication.invalidate_users(instance.user_set.values('pk'))
+    elif action in ('post_add', 'post_remove'):
+        authentication.invalidate_users(pk_set)
 
 
 # ---------------------------------------------------------------------------
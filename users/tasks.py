@@ -0,0 +1,62 @@
+from celery import shared_task
+
+from . import creator_stats, follows, notifications, retention, unread
+from .dap_rewards import drain_pending_rewards
+
+
+@shared_task
+def drain_dap_rewards():
+    """
+    Mint queued DAP credit rewards (DapRewardGrant outbox).
+    Runs every minute via Celery Beat.
+    """
+    return drain_pending_rewards()
+
+
+@shared_task
+def reconcile_follow_counts():
+    """
+    Recount drifted follower / following counters.
+    Runs nightly via Celery Beat.
+    """
+    return follows.reconcile_follow_counts()
+
+
+@shared_task
+def reconcile_creator_stats():
+    """
+    Recount drifted CreatorStats rows.
+    Runs nightly via Celery Beat.
+    """
+    return creator_stats.reconcile_creator_stats()
+
+
+@shared_task
+def deliver_notifications(events=None):
+    """
+    Write queued like/comment notifications (users.notifications).
+    Called with ``events`` when there is no Redis buffer. Otherwise drains
+    the buffer: scheduled by the first event of a burst, and every minute
+    via Celery Beat.
+    """
+    if events is None:
+        events = notifications.drain()
+    return notifications.deliver(events)
+
+
+@shared_task
+def reconcile_unread_counts():
+    """
+    Recount drifted unread notification / DAP event counters.
+    Runs nightly via Celery Beat.
+    """
+    return unread.reconcile_unread_counts()
+
+
+@shared_task
+def run_retention(names=None):
+    """
+    Delete (and optionally archive) rows past their retention policy, in chunks.
+    Runs nightly via Celery Beat.
+    """
+    return retention.run_all(names)
@@ -0,0 +1,19 @@
+"""
+In-process stand-in for users.notifications.RedisNotificationBuffer, for tests:
+
+    with mock.patch('users.notifications.get_buffer', return_value=InMemoryNotificationBuffer()):
+        ...
+"""
+
+
+class InMemoryNotificationBuffer:
+    def __init__(self):
+        self.events = []
+
+    def push(self, event):
+        self.events.append(event)
+        return len(self.events)
+
+    def drain(self):
+        events, self.events = self.events, []
+        return events
@@ -1,3 +1,611 @@
+from unittest import mock
+
+from django.core.management import call_command
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .dap_rewards import issue_dap_reward, drain_pending_rewards
+from .models import User, DapRewardGrant, DappPointEvent, Follow, Like, Comment, Notification
+
+
+@mock.patch.dict('os.environ', {'DAP_SERVICE_URL': 'http://dap.test'})
+class DapRewardOutboxTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='alice', stacks_address='SP000ALICE')
+
+    def test_one_time_reward_is_queued_once(self):
+        self.assertTrue(issue_dap_reward(self.user, 'welcome_bonus'))
+        self.assertFalse(issue_dap_reward(self.user, 'welcome_bonus'))
+        self.assertEqual(DapRewardGrant.objects.filter(user=self.user).count(), 1)
+
+    @mock.patch('users.dap_rewards._dap_register', return_value=True)
+    @mock.patch('users.dap_rewards._dap_mint', return_value=True)
+    def test_drain_registers_once_and_mints_each_grant(self, mint, register):
+        issue_dap_reward(self.user, 'welcome_bonus')
+        issue_dap_reward(self.user, 'creator_upgrade')
+
+        summary = drain_pending_rewards()
+
+        self.assertEqual(summary['minted'], 2)
+        register.assert_called_once_with('SP000ALICE')
+        welcome, creator = DapRewardGrant.objects.order_by('pk')
+        self.assertEqual(mint.call_args_list, [
+            mock.call('SP000ALICE', 1000, 'Welcome bonus', welcome.pk),
+            mock.call('SP000ALICE', 1000, 'Creator upgrade bonus', creator.pk),
+        ])
+        self.assertEqual(DappPointEvent.objects.filter(user=self.user).count(), 2)
+        self.assertFalse(DapRewardGrant.objects.filter(status='pending').exists())
+
+    @mock.patch('users.dap_rewards._dap_mint', return_value=True)
+    def test_address_taken_over_after_lease_expiry_is_not_minted_again(self, mint):
+        from django.utils import timezone
+        bob = User.objects.create(username='bob', stacks_address='SP000BOB')
+        issue_dap_reward(self.user, 'welcome_bonus')
+        issue_dap_reward(bob, 'welcome_bonus')
+
+        def slow_register(address):
+            # While this worker is busy, its lease runs out and another run re-leases everything left
+            DapRewardGrant.objects.filter(status='pending').exclude(stacks_address=address).update(
+                next_attempt_at=timezone.now()
+            )
+            return True
+
+        with mock.patch('users.dap_rewards._dap_register', side_effect=slow_register):
+            summary = drain_pending_rewards()
+
+        self.assertEqual(summary['minted'], 1)
+        self.assertEqual(mint.call_count, 1)
+        self.assertEqual(DapRewardGrant.objects.filter(status='pending').count(), 1)
+        self.assertEqual(DappPointEvent.objects.count(), 1)
+
+    @mock.patch('users.dap_rewards._dap_register', return_value=True)
+    @mock.patch('users.dap_rewards._dap_mint', return_value=False)
+    def test_failed_mint_is_retried_later(self, mint, register):
+        issue_dap_reward(self.user, 'welcome_bonus')
+
+        summary = drain_pending_rewards()
+
+        self.assertEqual(summary['retrying'], 1)
+        grant = DapRewardGrant.objects.get(user=self.user)
+        self.assertEqual(grant.status, 'pending')
+        self.assertEqual(grant.attempts, 1)
+        # Backed off, so an immediate second drain does nothing
+        self.assertEqual(drain_pending_rewards()['retrying'], 0)
+
+
+class FollowCounterTests(TestCase):
+    def setUp(self):
+        self.fan = User.objects.create(username='fan')
+        self.star = User.objects.create(username='star', role='creator')
+        self.client = APIClient()
+        self.client.force_authenticate(self.fan)
+
+    def _toggle(self):
+        return self.client.post('/api/follows/toggle/', {'following_id': self.star.pk}, format='json')
+
+    def test_toggle_moves_both_counters(self):
+        self.assertEqual(self._toggle().status_code, 201)
+        self.star.refresh_from_db(); self.fan.refresh_from_db()
+        self.assertEqual((self.star.follower_count, self.fan.following_count), (1, 1))
+
+        self.assertEqual(self._toggle().data['status'], 'unfollowed')
+        self.star.refresh_from_db(); self.fan.refresh_from_db()
+        self.assertEqual((self.star.follower_count, self.fan.following_count), (0, 0))
+
+    def test_cascade_delete_moves_counters(self):
+        self._toggle()
+        User.objects.create(username='other').following.create(following=self.star)
+        User.objects.get(username='other').delete()
+        self.star.refresh_from_db()
+        self.assertEqual(self.star.follower_count, 1)
+
+    def test_reconcile_repairs_drift(self):
+        Follow.objects.bulk_create([Follow(follower=self.fan, following=self.star)])  # sends no signals
+
+        call_command('reconcile_follow_counts', stdout=mock.MagicMock())
+
+        self.star.refresh_from_db(); self.fan.refresh_from_db()
+        self.assertEqual((self.star.follower_count, self.fan.following_count), (1, 1))
+
+    def test_users_can_be_ordered_by_follower_count(self):
+        self._toggle()
+
+        resp = self.client.get('/api/users/', {'ordering': '-follower_count', 'role': 'creator'})
+
+        self.assertEqual(resp.data['results'][0]['id'], self.star.pk)
+        self.assertEqual(resp.data['results'][0]['follower_count'], 1)
+
+
+class EngagementCounterTests(TestCase):
+    def setUp(self):
+        from posts.models import Post
+        from django.contrib.contenttypes.models import ContentType
+
+        self.author = User.objects.create(username='poster')
+        self.reader = User.objects.create(username='reader')
+        self.post = Post.objects.create(author=self.author, content='hello')
+        self.ct = ContentType.objects.get_for_model(Post)
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def test_like_toggle_and_comments_move_counters(self):
+        body = {'content_type': self.ct.pk, 'object_id': self.post.pk}
+        self.client.post('/api/likes/toggle/', body, format='json')
+        resp = self.client.post('/api/comments/', {**body, 'text': 'nice'}, format='json')
+        self.assertEqual(resp.status_code, 201)
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count), (1, 1))
+
+        self.client.post('/api/likes/toggle/', body, format='json')
+        Comment.objects.get(object_id=self.post.pk).delete()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count), (0, 0))
+
+    def test_update_counts_recomputes_drifted_rows(self):
+        Like.objects.create(user=self.reader, content_type=self.ct, object_id=self.post.pk)
+        type(self.post).objects.filter(pk=self.post.pk).update(like_count=7, comment_count=3)
+
+        call_command('update_counts', '--model', 'posts.post', stdout=mock.MagicMock())
+
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count), (1, 0))
+
+
+class CommentTreeTests(TestCase):
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from posts.models import Post
+        from django.contrib.contenttypes.models import ContentType
+
+        self.author = User.objects.create(username='poster')
+        post = Post.objects.create(author=self.author, content='hello')
+        self.params = {'content_type': ContentType.objects.get_for_model(Post).pk, 'object_id': post.pk}
+        start = timezone.now() - timedelta(days=1)
+
+        def comment(minute, parent=None):
+            c = Comment.objects.create(
+                user=self.author, text=f'c{minute}', parent=parent,
+                content_type_id=self.params['content_type'], object_id=self.params['object_id'],
+            )
+            Comment.objects.filter(pk=c.pk).update(created_at=start + timedelta(minutes=minute))
+            return c
+
+        self.roots = [comment(i) for i in range(3)]
+        self.busy = self.roots[0]
+        self.replies = [comment(10 + i, parent=self.busy) for i in range(8)]  # newest last
+        comment(30, parent=self.roots[1])
+        self.client = APIClient()
+
+    def test_roots_carry_reply_preview_and_counts_in_constant_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get('/api/comments/', {**self.params, 'top_level': 'true'})
+        self.assertEqual(resp.status_code, 200)
+        # page, reply previews (cursor pages run no COUNT)
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+        rows = {row['id']: row for row in resp.data['results']}
+        busy = rows[self.busy.pk]
+        self.assertEqual(busy['reply_count'], 8)
+        self.assertEqual([r['id'] for r in busy['replies']], [r.pk for r in reversed(self.replies[3:])])
+        self.assertIsNotNone(busy['more_replies'])
+        self.assertEqual(rows[self.roots[1].pk]['reply_count'], 1)
+        self.assertIsNone(rows[self.roots[1].pk]['more_replies'])
+        self.assertEqual(rows[self.roots[2].pk]['replies'], [])
+
+    def test_more_replies_cursor_continues_after_preview(self):
+        resp = self.client.get('/api/comments/', {**self.params, 'top_level': 'true'})
+        busy = next(row for row in resp.data['results'] if row['id'] == self.busy.pk)
+
+        resp = self.client.get(busy['more_replies'])
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([r['id'] for r in resp.data['results']], [r.pk for r in reversed(self.replies[:3])])
+        self.assertIsNone(resp.data['next'])
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.me = User.objects.create(username='me')
+        actor = User.objects.create(username='actor')
+        self.notes = [
+            Notification.objects.create(recipient=self.me, actor=actor, notification_type='follow')
+            for _ in range(5)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.me)
+
+    def test_cursor_walk_visits_every_row_once_newest_first(self):
+        seen, url = [], '/api/notifications/?page_size=2'
+        while url:
+            resp = self.client.get(url)
+            self.assertNotIn('count', resp.data)
+            seen += [row['id'] for row in resp.data['results']]
+            url = resp.data['next']
+        self.assertEqual(seen, [n.pk for n in reversed(self.notes)])
+
+    def test_legacy_page_numbers_still_work(self):
+        resp = self.client.get('/api/notifications/', {'pagination': 'legacy'})
+        self.assertEqual(resp.data['count'], 5)
+
+        resp = self.client.get('/api/notifications/', {'page': 1})
+        self.assertEqual(resp.data['count'], 5)
+
+
+class CommunitySlugTests(TestCase):
+    def setUp(self):
+        from communities.models import Community, Membership
+        self.reader = User.objects.create(username='reader')
+        self.founders = []
+        for i in range(4):
+            founder = User.objects.create(username=f'founder{i}', role='creator')
+            community = Community.objects.create(name=f'C{i}', slug=f'c{i}', created_by=founder)
+            Membership.objects.create(user=founder, community=community, role='founder')
+            Follow.objects.create(follower=self.reader, following=founder)
+            self.founders.append(founder)
+        self.client = APIClient()
+
+    def test_following_resolves_slugs_in_bulk(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        counts = []
+        for page_size in (1, 4):
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(f'/api/users/{self.reader.pk}/following/', {'page_size': page_size})
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(
+            {row['username']: row['community_slug'] for row in resp.data['results']},
+            {f'founder{i}': f'c{i}' for i in range(4)},
+        )
+
+    def test_profile_without_community(self):
+        resp = self.client.get(f'/api/users/{self.reader.pk}/')
+        self.assertIsNone(resp.data['community_slug'])
+        resp = self.client.get('/api/users/by-username/founder2/')
+        self.assertEqual(resp.data['community_slug'], 'c2')
+
+
+class CreatorStatsTests(TestCase):
+    def setUp(self):
+        from shows.models import Show
+        self.creator = User.objects.create(username='creator', role='creator')
+        self.fan = User.objects.create(username='fan')
+        self.shows = [
+            Show.objects.create(title=f'S{i}', slug=f's{i}', creator=self.creator, status='published')
+            for i in range(3)
+        ]
+        self.client = APIClient()
+
+    def _stats(self):
+        resp = self.client.get(f'/api/users/{self.creator.pk}/stats/')
+        self.assertEqual(resp.status_code, 200)
+        return resp.data
+
+    def test_first_read_computes_then_signals_keep_it_current(self):
+        from events.models import Event
+        from .follows import follow_user
+        from .models import CreatorStats
+
+        Like.objects.create(user=self.fan, content_object=self.shows[0])
+        self.assertEqual(self._stats()['total_likes'], 1)
+        self.assertTrue(CreatorStats.objects.filter(user=self.creator).exists())
+
+        like = Like.objects.create(user=self.fan, content_object=self.shows[1])
+        Comment.objects.create(user=self.fan, content_object=self.shows[2], text='nice')
+        follow_user(self.fan, self.creator.pk)
+        self.client.post(f'/api/shows/{self.shows[0].slug}/track_share/')
+        Event.objects.create(
+            title='Meetup', description='x', organizer=self.creator,
+            start_datetime='2030-01-01T10:00:00Z', end_datetime='2030-01-01T11:00:00Z',
+        )
+        like.delete()
+
+        self.assertEqual(self._stats(), {
+            'total_views': 0, 'total_shares': 1, 'total_likes': 1, 'total_comments': 1,
+            'follower_count': 1, 'following_count': 0, 'show_count': 3, 'event_count': 1,
+        })
+
+    def test_stats_read_is_constant(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for show in self.shows:
+            Like.objects.create(user=self.fan, content_object=show)
+        self._stats()
+        with CaptureQueriesContext(connection) as ctx:
+            self._stats()
+        # user, stats row
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+    def test_reconcile_repairs_drift(self):
+        from .creator_stats import reconcile_creator_stats
+        from .models import CreatorStats
+
+        self._stats()
+        CreatorStats.objects.filter(user=self.creator).update(shows=99, likes=7)
+        self.assertEqual(reconcile_creator_stats(dry_run=True), 1)
+        self.assertEqual(reconcile_creator_stats(), 1)
+        self.assertEqual(self._stats()['show_count'], 3)
+        self.assertEqual(self._stats()['total_likes'], 0)
+        self.assertEqual(reconcile_creator_stats(), 0)
+
+
+class NotificationPipelineTests(TestCase):
+    def setUp(self):
+        from shows.models import Show
+        from .testing import InMemoryNotificationBuffer
+
+        self.buffer = InMemoryNotificationBuffer()
+        patcher = mock.patch('users.notifications.get_buffer', return_value=self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.flushes = mock.patch('users.tasks.deliver_notifications.apply_async').start()
+        self.addCleanup(mock.patch.stopall)
+
+        self.host = User.objects.create(username='host', role='creator')
+        self.show = Show.objects.create(title='Show', slug='show', creator=self.host, status='published')
+        self.fans = [User.objects.create(username=f'fan{i}') for i in range(15)]
+
+    def _flush(self):
+        from .tasks import deliver_notifications
+        return deliver_notifications()
+
+    def test_burst_is_coalesced_into_one_notification(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for fan in self.fans:
+                Like.objects.create(user=fan, content_object=self.show)
+        self.assertEqual(Notification.objects.count(), 0)
+        self.assertEqual(self.flushes.call_count, 1)  # only the first event schedules a flush
+
+        self._flush()
+        notification = Notification.objects.get()
+        self.assertEqual(notification.recipient, self.host)
+        self.assertEqual(notification.actor, self.fans[-1])
+        self.assertEqual(notification.others_count, 14)
+
+        client = APIClient()
+        client.force_authenticate(self.host)
+        row = client.get('/api/notifications/').data['results'][0]
+        self.assertEqual(row['summary'], 'fan14 and 14 others liked your show')
+
+    def test_later_events_fold_into_unread_notification(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(user=self.fans[0], content_object=self.show)
+        self._flush()
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(user=self.fans[1], content_object=self.show)
+            Like.objects.create(user=self.fans[0], content_object=self.fans[0])  # no owner field: dropped
+        self._flush()
+
+        notification = Notification.objects.get()
+        self.assertEqual((notification.actor, notification.others_count), (self.fans[1], 1))
+
+    def test_comments_and_replies(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            root = Comment.objects.create(user=self.fans[0], content_object=self.show, text='hi')
+            Comment.objects.create(user=self.host, content_object=self.show, text='own show', parent=root)
+            Comment.objects.create(user=self.host, content_object=self.show, text='own show')
+        self._flush()
+
+        self.assertEqual(
+            sorted(Notification.objects.values_list('recipient__username', 'notification_type')),
+            [('fan0', 'comment_reply'), ('host', 'comment')],
+        )
+
+
+class UnreadCounterTests(TestCase):
+    def setUp(self):
+        self.me = User.objects.create(username='me')
+        self.actor = User.objects.create(username='actor')
+        self.client = APIClient()
+        self.client.force_authenticate(self.me)
+
+    def _counts(self):
+        self.me.refresh_from_db()
+        self.client.force_authenticate(self.me)
+        resp = self.client.get('/api/notifications/unread-count/')
+        self.assertEqual(resp.status_code, 200)
+        return resp.data['notifications'], resp.data['dap_events']
+
+    def test_counters_follow_creation_and_reads(self):
+        notes = [
+            Notification.objects.create(recipient=self.me, actor=self.actor, notification_type='follow')
+            for _ in range(3)
+        ]
+        DappPointEvent.objects.create(user=self.me, action='tip_received', points=5)
+        self.assertEqual(self._counts(), (3, 1))
+
+        self.client.post(f'/api/notifications/{notes[0].pk}/mark_read/')
+        self.client.post(f'/api/notifications/{notes[0].pk}/mark_read/')
+        self.assertEqual(self._counts(), (2, 1))
+
+        notes[1].delete()
+        self.assertEqual(self._counts(), (1, 1))
+
+        self.client.post('/api/notifications/mark_all_read/')
+        self.client.post('/api/users/dap-notifications-mark-read/')
+        self.assertEqual(self._counts(), (0, 0))
+
+    def test_mark_all_read_keeps_concurrent_inserts_counted(self):
+        from .unread import NOTIFICATIONS, bump, reset_notifications
+        Notification.objects.create(recipient=self.me, actor=self.actor, notification_type='follow')
+        # A delivery that has bumped the counter but whose row the reset's UPDATE does not see
+        bump(self.me.pk, NOTIFICATIONS, 1)
+        self.assertEqual(reset_notifications(self.me), 1)
+        self.assertEqual(self._counts(), (1, 0))
+
+    def test_poll_is_one_row_read_and_reconcile_repairs_drift(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .unread import reconcile_unread_counts
+
+        Notification.objects.create(recipient=self.me, actor=self.actor, notification_type='follow')
+        Notification.objects.filter(recipient=self.me).update(is_read=True)  # behind the counters' back
+        self.assertEqual(reconcile_unread_counts(dry_run=True), 1)
+        self.assertEqual(reconcile_unread_counts(), 1)
+
+        self.me.refresh_from_db()
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get('/api/notifications/unread-count/')
+        # The two stored counters by primary key, no COUNT
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('COUNT(', ctx.captured_queries[0]['sql'].upper())
+        self.assertEqual(resp.data['notifications'], 0)
+
+
+class RetentionTests(TestCase):
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        self.me = User.objects.create(username='me')
+        self.actor = User.objects.create(username='actor')
+        self.long_ago = timezone.now() - timedelta(days=400)
+
+    def _notify(self, n, **fields):
+        ids = [
+            Notification.objects.create(recipient=self.me, actor=self.actor, notification_type='follow').pk
+            for _ in range(n)
+        ]
+        Notification.objects.filter(pk__in=ids).update(**fields)
+        return ids
+
+    def test_notifications_deleted_in_chunks(self):
+        from .retention import POLICIES, get_progress, run_policy
+
+        old_read = self._notify(5, is_read=True, created_at=self.long_ago)
+        old_unread = self._notify(1, created_at=self.long_ago)
+        recent_read = self._notify(1, is_read=True)
+
+        self.assertEqual(run_policy(POLICIES['notifications'], dry_run=True)['deleted'], 5)
+        progress = run_policy(POLICIES['notifications'], chunk_size=2, sleep=0)
+
+        self.assertEqual((progress['deleted'], progress['chunks']), (5, 3))
+        self.assertEqual(progress['last_pk'], old_read[-1])
+        self.assertEqual(get_progress('notifications')['deleted'], 5)
+        self.assertEqual(sorted(Notification.objects.values_list('pk', flat=True)), old_unread + recent_read)
+
+    def test_archive_before_delete(self):
+        import gzip
+        import json
+        import tempfile
+        from .retention import POLICIES, run_policy
+
+        DappPointEvent.objects.create(user=self.me, action='tip_received', points=5, is_read=True)
+        DappPointEvent.objects.update(created_at=self.long_ago)
+        kept = DappPointEvent.objects.create(user=self.me, action='tip_received', points=7, is_read=True)
+
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.dict('os.environ', {'RETENTION_ARCHIVE_DIR': directory}):
+            progress = run_policy(POLICIES['dap_point_events'], sleep=0)
+            with gzip.open(progress['archive_file'], 'rt') as archive:
+                rows = [json.loads(line) for line in archive]
+
+        self.assertEqual((progress['archived'], progress['deleted']), (1, 1))
+        self.assertEqual(rows[0]['points'], 5)
+        self.assertEqual(list(DappPointEvent.objects.values_list('pk', flat=True)), [kept.pk])
+
+    def test_orphaned_likes(self):
+        from django.contrib.contenttypes.models import ContentType
+        from posts.models import Post
+        from .retention import POLICIES, run_policy
+
+        post = Post.objects.create(author=self.actor, content='hi')
+        live = Like.objects.create(user=self.me, content_object=post)
+        Like.objects.create(user=self.me, content_type=ContentType.objects.get_for_model(Post), object_id=post.pk + 1000)
+
+        self.assertEqual(run_policy(POLICIES['orphaned_likes'], sleep=0)['deleted'], 1)
+        self.assertEqual(list(Like.objects.values_list('pk', flat=True)), [live.pk])
+
+
+class SignatureFastPathTests(TestCase):
+    def setUp(self):
+        from coincurve import PrivateKey
+        from . import crypto_utils
+        self.crypto = crypto_utils
+        self.key = PrivateKey(bytes(range(1, 33)))
+        self.message = 'Sign this message to authenticate with DeOrganized'
+        self.address = crypto_utils.derive_stacks_address(self.key.public_key.format(compressed=True))
+        self.signature = self.key.sign_recoverable(crypto_utils._hash_stacks_message(self.message), hasher=None)
+
+    def test_valid_signature_verifies_with_and_without_recovery_id(self):
+        self.assertTrue(self.crypto.verify_stacks_signature(self.address, self.message, '0x' + self.signature.hex()))
+        self.assertTrue(self.crypto.verify_stacks_signature(self.address, self.message, '0x' + self.signature[:64].hex()))
+        self.assertFalse(self.crypto.verify_stacks_signature(self.address, self.message + '!', '0x' + self.signature.hex()))
+        self.assertEqual(
+            self.crypto.recover_signing_address(self.message, '0x' + self.signature.hex()), self.address
+        )
+
+    def test_addresses_are_cached_per_key(self):
+        public_key = self.key.public_key.format(compressed=True)
+        self.crypto.stacks_addresses.cache_clear()
+        mainnet, testnet = self.crypto.stacks_addresses(public_key)
+        self.crypto.stacks_addresses(public_key)
+        self.assertEqual(self.crypto.stacks_addresses.cache_info().hits, 1)
+        self.assertEqual(mainnet, self.address)
+        self.assertEqual(testnet, self.crypto.derive_stacks_address(public_key, testnet=True))
+        self.assertTrue(testnet.startswith('ST'))
+
+    def test_c32_round_trip_keeps_leading_zeros(self):
+        for data in (b'\x00\x00\x01', bytes(range(25)), b'\xff' * 7):
+            self.assertEqual(self.crypto.c32_decode(self.crypto.c32_encode(data))[-len(data):], data)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from .authentication import CachedJWTAuthentication, UserRefreshToken
+        cache.clear()
+        self.auth = CachedJWTAuthentication()
+        self.user = User.objects.create_user(username='jwt', password='x')
+        self.access = UserRefreshToken.for_user(self.user).access_token
+
+    def test_second_resolution_skips_the_database(self):
+        self.assertEqual(self.auth.get_user(self.access), self.user)
+        with self.assertNumQueries(0):
+            cached = self.auth.get_user(self.access)
+        self.assertEqual(cached.pk, self.user.pk)
+        self.assertEqual(cached.username, 'jwt')
+
+    def test_save_and_group_change_invalidate(self):
+        from django.contrib.auth.models import Group
+        self.auth.get_user(self.access)
+        User.objects.get(pk=self.user.pk).save(update_fields=['bio'])
+        with self.assertNumQueries(1):
+            self.auth.get_user(self.access)
+        Group.objects.create(name='mods').user_set.add(self.user)
+        with self.assertNumQueries(1):
+            self.auth.get_user(self.access)
+
+    def test_deactivation_revokes_outstanding_tokens(self):
+        from rest_framework_simplejwt.exceptions import AuthenticationFailed
+        self.auth.get_user(self.access)
+        self.user.is_active = False
+        self.user.save()
+        self.user.is_active = True
+        self.user.save()
+        self.assertEqual(User.objects.get(pk=self.user.pk).token_version, 1)
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.access)
+
+    def test_me_reflects_counter_updates_behind_the_cache(self):
+        from django.db.models import F
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+        client.get('/api/users/me/')
+        User.objects.filter(pk=self.user.pk).update(follower_count=F('follower_count') + 3, following_count=2)
+
+        resp = client.get('/api/users/me/')
+        self.assertEqual((resp.data['follower_count'], resp.data['following_count']), (3, 2))
 
-# Create your tests here.
+    @mock.patch.dict('os.environ', {'JWT_USER_CLAIMS': '1'})
+    def test_optional_user_claims(self):
+        from .authentication import UserRefreshToken
+        access = UserRefreshToken.for_user(self.user).access_token
+        self.assertEqual((access['role'], access['groups'], access['is_staff']), ('user', [], False))
+        self.assertNotIn('role', self.access.payload)
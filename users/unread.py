@@ -0,0 +1,107 @@
+"""
+Stored unread counters behind GET /api/notifications/unread-count/.
+
+User.unread_notification_count and unread_dap_event_count move with F()
+updates wherever notifications and point events are written or read:
+
+    post_save / post_delete signals   Notification and DappPointEvent rows
+                                      saved or deleted one at a time
+    notifications_created() /         bulk_create paths (users.notifications,
+    dap_events_created()              users.dap_rewards), which send no signals
+    mark_notification_read()          NotificationViewSet.mark_read
+    reset_notifications() /           mark_all_read and
+    reset_dap_events()                dap_notifications_mark_read, minus
+                                      the rows actually marked
+
+so the endpoint reads the two stored counters from the database: one narrow
+row read, not request.user, which may come from the auth cache
+(users.authentication) and lag these F() updates.
+Decrements never go below 0. Drift from other paths (queryset.update() or
+delete() of unread rows, the admin) is repaired nightly by
+users.tasks.reconcile_unread_counts.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import DappPointEvent, Notification, User
+
+NOTIFICATIONS = 'unread_notification_count'
+DAP_EVENTS = 'unread_dap_event_count'
+
+
+def bump(user_id, field, delta):
+    value = F(field) + delta if delta > 0 else Greatest(F(field) + delta, 0)
+    User.objects.filter(pk=user_id).update(**{field: value})
+
+
+def _bump_each(user_ids, field):
+    for user_id, n in Counter(user_ids).items():
+        bump(user_id, field, n)
+
+
+def notifications_created(notifications):
+    """Count unread notifications inserted with bulk_create."""
+    _bump_each([n.recipient_id for n in notifications if not n.is_read], NOTIFICATIONS)
+
+
+def dap_events_created(events):
+    """Count unread point events inserted with bulk_create."""
+    _bump_each([e.user_id for e in events if not e.is_read], DAP_EVENTS)
+
+
+def mark_notification_read(notification):
+    """Mark one notification read; the counter only moves if it was unread."""
+    if Notification.objects.filter(pk=notification.pk, is_read=False).update(is_read=True):
+        bump(notification.recipient_id, NOTIFICATIONS, -1)
+    notification.is_read = True
+
+
+def reset_notifications(user):
+    """
+    Mark all of ``user``'s notifications read; returns how many were unread.
+    Subtracts what was marked rather than writing 0, so notifications
+    inserted concurrently stay counted.
+    """
+    with transaction.atomic():
+        count = Notification.objects.filter(recipient=user, is_read=False).update(is_read=True)
+        if count:
+            bump(user.pk, NOTIFICATIONS, -count)
+    return count
+
+
+def reset_dap_events(user):
+    """Mark all of ``user``'s point events read; returns how many were unread."""
+    with transaction.atomic():
+        count = DappPointEvent.objects.filter(user=user, is_read=False).update(is_read=True)
+        if count:
+            bump(user.pk, DAP_EVENTS, -count)
+    return count
+
+
+def _unread_of(model, user_field):
+    return Coalesce(Subquery(
+        model.objects.filter(**{user_field: OuterRef('pk'), 'is_read': False}).order_by()
+        .values(user_field).annotate(n=Count('pk')).values('n')[:1]
+    ), 0)
+
+
+def reconcile_unread_counts(dry_run=False):
+    """
+    Recount both counters for every user whose stored values drifted.
+    Set-based: one UPDATE over the drifted rows. Returns how many rows were off.
+    """
+    real = {
+        NOTIFICATIONS: _unread_of(Notification, 'recipient'),
+        DAP_EVENTS: _unread_of(DappPointEvent, 'user'),
+    }
+    drifted = User.objects.annotate(
+        real_notifications=real[NOTIFICATIONS], real_dap_events=real[DAP_EVENTS],
+    ).exclude(
+        **{NOTIFICATIONS: F('real_notifications'), DAP_EVENTS: F('real_dap_events')}
+    ).values('pk')
+    if dry_run:
+        return drifted.count()
+    return User.objects.filter(pk__in=Subquery(drifted)).update(**real)
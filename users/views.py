@@ -3,16 +3,19 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAuthenticatedOrReadOnly, IsAdminUser
 from rest_framework.throttling import AnonRateThrottle
-from rest_framework_simplejwt.tokens import RefreshToken
+from api.idempotency import idempotent
+from api.pagination import KeysetPagination, paginated_response
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from django.db.models import Count
 from django.core.cache import cache
 import uuid
 import time
+from .authentication import UserRefreshToken
 from .models import Like, Comment, Follow, Notification, RTMPDestination, Subscription, CreatorPlaylist
 from .serializers import (
-    UserSerializer, PrivateUserSerializer, UserListSerializer, UserRegistrationSerializer,
+    with_community_slug, UserSerializer, PrivateUserSerializer, UserListSerializer, UserRegistrationSerializer,
     UserUpdateSerializer,
     LikeSerializer, CommentSerializer, CommentCreateSerializer,
     FollowSerializer, CreatorProfileSerializer,
@@ -44,12 +47,11 @@ class UserViewSet(viewsets.ModelViewSet):
     - me: GET /api/users/me/
     """
     queryset = User.objects.all()
-    # Note: follower_count and following_count are provided by @property methods in the User model
-    # No need to annotate here as it would conflict with the properties
+    # follower_count / following_count are stored columns kept up to date by users.follows
     permission_classes = []  # Override global defaults, use get_permissions() instead
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['username', 'first_name', 'last_name']
-    ordering_fields = ['date_joined']  # Removed 'follower_count' since it's not an annotated field
+    ordering_fields = ['date_joined', 'follower_count']
     ordering = ['-date_joined']
     
     def get_throttles(self):
@@ -84,6 +86,8 @@ class UserViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            queryset = with_community_slug(queryset)
         
         # Filter by role
         role = self.request.query_params.get('role')
@@ -105,7 +109,7 @@ class UserViewSet(viewsets.ModelViewSet):
         user = serializer.save()
         
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         
         return Response({
             'user': UserSerializer(user).data,
@@ -141,7 +145,7 @@ class UserViewSet(viewsets.ModelViewSet):
                 pass
         
         if user:
-            refresh = RefreshToken.for_user(user)
+            refresh = UserRefreshToken.for_user(user)
             return Response({
                 'user': UserSerializer(user).data,
                 'tokens': {
@@ -158,7 +162,9 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def me(self, request):
         """Get current user's profile"""
-        serializer = self.get_serializer(request.user)
+        # Re-read: request.user may come from the auth cache, and the stored
+        # counters move with F() updates that do not invalidate it
+        serializer = self.get_serializer(User.objects.get(pk=request.user.pk))
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
@@ -175,55 +181,37 @@ class UserViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['get'])
     def stats(self, request, pk=None):
-        """Get aggregate stats for a creator"""
-        from shows.models import Show
-        from events.models import Event
-        
+        """Get aggregate stats for a creator (one CreatorStats row, see users/creator_stats.py)"""
+        from .creator_stats import stats_for
+
         user = self.get_object()
-        
-        # Aggregate counts
-        shows = Show.objects.filter(creator=user)
-        events = Event.objects.filter(organizer=user)
-        
-        # Engagement stats
-        # Assuming shows have likes/comments relation or using ContentType
-        total_likes = 0
-        total_comments = 0
-        total_views = 0
-        total_shares = 0
-        
-        for show in shows:
-            total_likes += show.likes.count()
-            total_comments += show.comments.count()
-            total_views += getattr(show, 'views_count', 0)
-            total_shares += getattr(show, 'share_count', 0)
-            
+        stats = stats_for(user)
         return Response({
-            'total_views': total_views,
-            'total_shares': total_shares,
-            'total_likes': total_likes,
-            'total_comments': total_comments,
-            'follower_count': user.follower_count,
+            'total_views': stats.views,
+            'total_shares': stats.shares,
+            'total_likes': stats.likes,
+            'total_comments': stats.comments,
+            'follower_count': stats.followers,
             'following_count': user.following_count,
-            'show_count': shows.count(),
-            'event_count': events.count(),
+            'show_count': stats.shows,
+            'event_count': stats.events,
         })
 
     @action(detail=False, methods=['get'], url_path='by-username/(?P<username>[^/.]+)')
     def fetch_by_username(self, request, username=None):
         """Fetch user profile by username"""
         from django.shortcuts import get_object_or_404
-        user = get_object_or_404(User, username=username)
+        user = get_object_or_404(with_community_slug(User.objects.all()), username=username)
         serializer = self.get_serializer(user)
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
     def liked_shows(self, request, pk=None):
-        """Get shows liked by this user"""
+        """Get shows liked by this user (paginated)"""
         user = self.get_object()
         # Import Show model here to avoid circular imports
         from shows.models import Show
-        from django.contrib.contenttypes.models import ContentType
+        from shows.views import ShowViewSet
         
         # Get Show ContentType
         show_content_type = ContentType.objects.get_for_model(Show)
@@ -233,25 +221,23 @@ class UserViewSet(viewsets.ModelViewSet):
             content_type=show_content_type
         ).values_list('object_id', flat=True)
         
-        # Get the actual shows
-        shows = Show.objects.filter(id__in=liked_show_ids)
+        # Get the actual shows, with the relations ShowSerializer renders loaded per page
+        shows = ShowViewSet.queryset.prefetch_related('episodes').filter(id__in=liked_show_ids)
         
         # Import ShowSerializer
         from shows.serializers import ShowSerializer
-        serializer = ShowSerializer(shows, many=True, context={'request': request})
-        return Response(serializer.data)
+        return paginated_response(self, shows, ShowSerializer)
     
     @action(detail=True, methods=['get'])
     def following(self, request, pk=None):
-        """Get users that this user is following"""
+        """Get users that this user is following, most recently followed first (paginated)"""
         user = self.get_object()
-        # Get all Follow objects where this user is the follower
-        following_users = User.objects.filter(
+        # (follower, following) is unique, so the join yields each user once
+        following_users = with_community_slug(User.objects.filter(
             followers__follower=user
-        ).distinct()
+        )).order_by('-followers__created_at', '-id')
         
-        serializer = UserSerializer(following_users, many=True, context={'request': request})
-        return Response(serializer.data)
+        return paginated_response(self, following_users, UserSerializer)
     
     # WALLET AUTHENTICATION ENDPOINTS
     # ============================================
@@ -338,7 +324,7 @@ class UserViewSet(viewsets.ModelViewSet):
                 logger.info(f"[wallet_login] Bound signing address {recovered} to user {user.username}")
 
             logger.info(f"Existing user: {user.username}")
-            refresh = RefreshToken.for_user(user)
+            refresh = UserRefreshToken.for_user(user)
             return Response({
                 'is_new': False,
                 'user': PrivateUserSerializer(user).data,
@@ -482,15 +468,15 @@ class UserViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Mint 1000 DAP welcome credits — outside transaction (non-fatal).
+        # Queue 1000 DAP welcome credits — minted by users.tasks.drain_dap_rewards (non-fatal).
         try:
             from .dap_rewards import issue_dap_reward
             issue_dap_reward(user, 'welcome_bonus', logger)
         except Exception as e:
-            logger.error(f"[dap_rewards] welcome_bonus mint failed (non-fatal): {e}")
+            logger.error(f"[dap_rewards] welcome_bonus queue failed (non-fatal): {e}")
 
         # Issue JWT tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
 
         return Response({
             'user': PrivateUserSerializer(user).data,
@@ -534,8 +520,8 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated], url_path='dap-notifications-mark-read')
     def dap_notifications_mark_read(self, request):
         """POST /api/users/dap-notifications-mark-read/ — mark all DAP notifications as read."""
-        from .models import DappPointEvent
-        DappPointEvent.objects.filter(user=request.user, is_read=False).update(is_read=True)
+        from .unread import reset_dap_events
+        reset_dap_events(request.user)
         return Response({'status': 'ok'})
 
     def update(self, request, *args, **kwargs):
@@ -565,7 +551,8 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def me(self, request):
         """Get current authenticated user's own profile (includes PII)."""
-        return Response(PrivateUserSerializer(request.user).data)
+        # Re-read: request.user may come from the auth cache (users.authentication)
+        return Response(PrivateUserSerializer(User.objects.get(pk=request.user.pk)).data)
 
     # ============================================
     # ADMIN DASHBOARD ENDPOINTS (Staff only)
@@ -576,66 +563,19 @@ class UserViewSet(viewsets.ModelViewSet):
         """
         Get platform overview stats for admin dashboard.
         GET /api/users/admin-stats/
-        Staff only.
+        Staff only. Reads the snapshot kept by api.platform_stats (refreshed every minute).
         """
-        from django.utils import timezone
-        from datetime import timedelta
-        from shows.models import Show
-        from news.models import News
-        from events.models import Event
-        from api.models import Feedback
-
-        now = timezone.now()
-        thirty_days_ago = now - timedelta(days=30)
-        seven_days_ago = now - timedelta(days=7)
-
-        # Core counts
-        total_users = User.objects.count()
-        total_creators = User.objects.filter(role='creator').count()
-        total_regular_users = User.objects.filter(role='user').count()
-        total_shows = Show.objects.count()
-        total_events = Event.objects.count()
-        total_news = News.objects.count()
-
-        # Recent activity
-        new_users_7d = User.objects.filter(date_joined__gte=seven_days_ago).count()
-        new_users_30d = User.objects.filter(date_joined__gte=thirty_days_ago).count()
-
-        # Engagement
-        total_likes = Like.objects.count()
-        total_comments = Comment.objects.count()
-        total_follows = Follow.objects.count()
-
-        # Feedback
-        total_feedback = Feedback.objects.count()
-        unresolved_feedback = Feedback.objects.filter(resolved=False).count()
-
-        # Recent signups (last 10)
-        recent_users = User.objects.order_by('-date_joined')[:10]
-        recent_users_data = UserListSerializer(recent_users, many=True, context={'request': request}).data
-
-        return Response({
-            'overview': {
-                'total_users': total_users,
-                'total_creators': total_creators,
-                'total_regular_users': total_regular_users,
-                'total_shows': total_shows,
-                'total_events': total_events,
-                'total_news': total_news,
-            },
-            'activity': {
-                'new_users_7d': new_users_7d,
-                'new_users_30d': new_users_30d,
-                'total_likes': total_likes,
-                'total_comments': total_comments,
-                'total_follows': total_follows,
-            },
-            'feedback': {
-                'total': total_feedback,
-                'unresolved': unresolved_feedback,
-            },
-            'recent_users': recent_users_data,
-        })
+        from api.platform_stats import get_snapshot
+
+        snapshot = get_snapshot()
+        stats = dict(snapshot['users'], generated_at=snapshot['generated_at'], estimated=snapshot['estimated'])
+        # The snapshot is built outside a request; make media URLs absolute here
+        stats['recent_users'] = [
+            dict(user, profile_picture=request.build_absolute_uri(user['profile_picture']))
+            if user['profile_picture'] else user
+            for user in stats['recent_users']
+        ]
+        return Response(stats)
 
     @action(detail=False, methods=['get'], permission_classes=[IsAdminUser], url_path='admin-users')
     def admin_users(self, request):
@@ -749,9 +689,12 @@ class LikeViewSet(viewsets.ModelViewSet):
     
     Custom actions:
     - toggle: POST /api/likes/toggle/
+
+    Cursor paginated on (created_at, id); ?pagination=legacy for page numbers.
     """
     queryset = Like.objects.select_related('user')
     serializer_class = LikeSerializer
+    pagination_class = KeysetPagination
     permission_classes = [IsAuthenticatedOrReadOnly]
     
     def get_queryset(self):
@@ -828,14 +771,17 @@ class LikeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        like, created = Like.objects.get_or_create(
-            user=request.user,
-            content_type=ct,
-            object_id=object_id
-        )
-        
+        # Counter updates (users.signals) commit together with the Like row
+        with transaction.atomic():
+            like, created = Like.objects.get_or_create(
+                user=request.user,
+                content_type=ct,
+                object_id=object_id
+            )
+            
+            if not created:
+                like.delete()
         if not created:
-            like.delete()
             return Response({'status': 'unliked'}, status=status.HTTP_200_OK)
         
         # Notification is automatically created by signal handler
@@ -856,8 +802,17 @@ class CommentViewSet(viewsets.ModelViewSet):
     Retrieve: GET /api/comments/{id}/
     Update: PUT/PATCH /api/comments/{id}/ (owner only)
     Delete: DELETE /api/comments/{id}/ (owner only)
+
+    Custom actions:
+    - replies: GET /api/comments/{id}/replies/?cursor=... (cursor paginated)
+
+    Top-level comments carry their newest replies and a ``more_replies``
+    cursor link; see users.comment_tree.
+
+    Cursor paginated on (created_at, id); ?pagination=legacy for page numbers.
     """
     queryset = Comment.objects.select_related('user')
+    pagination_class = KeysetPagination
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['created_at']
@@ -885,12 +840,29 @@ class CommentViewSet(viewsets.ModelViewSet):
         if self.request.query_params.get('top_level') == 'true':
             queryset = queryset.filter(parent__isnull=True)
         
-        return queryset
+        from .comment_tree import with_reply_count
+        return with_reply_count(queryset)
+
+    @action(detail=True, methods=['get'])
+    def replies(self, request, pk=None):
+        """Replies to a comment, newest first, paged by cursor"""
+        from api.pagination import CreatedAtCursorPagination
+        from .comment_tree import replies_of
+        comment = self.get_object()
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(replies_of([comment.pk]), request, view=self)
+        serializer = CommentSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
     
     def perform_create(self, serializer):
-        # Save comment - notification is automatically created by signal handler
-        # (see users/signals.py - create_comment_notification)
-        comment = serializer.save(user=self.request.user)
+        # Save comment - notification and comment_count are handled by signal
+        # handlers (see users/signals.py), inside the same transaction
+        with transaction.atomic():
+            comment = serializer.save(user=self.request.user)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
 
 
 class FollowViewSet(viewsets.ModelViewSet):
@@ -927,6 +899,10 @@ class FollowViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         serializer.save(follower=self.request.user)
+
+    def perform_destroy(self, instance):
+        from .follows import unfollow
+        unfollow(instance)
     
     @action(detail=False, methods=['post'])
     def toggle(self, request):
@@ -945,13 +921,11 @@ class FollowViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        follow, created = Follow.objects.get_or_create(
-            follower=request.user,
-            following_id=following_id
-        )
+        from .follows import follow_user, unfollow
+        follow, created = follow_user(request.user, following_id)
         
         if not created:
-            follow.delete()
+            unfollow(follow)
             return Response({'status': 'unfollowed'}, status=status.HTTP_200_OK)
         
         # Create notification for the user being followed
@@ -977,7 +951,7 @@ class FollowViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def followers(self, request):
-        """Get followers of a user"""
+        """Get followers of a user (paginated; ?export=json for your own)"""
         user_id = request.query_params.get('user_id')
         if not user_id:
             return Response(
@@ -986,12 +960,12 @@ class FollowViewSet(viewsets.ModelViewSet):
             )
         
         follows = self.get_queryset().filter(following_id=user_id)
-        serializer = self.get_serializer(follows, many=True)
-        return Response(serializer.data)
+        # Exporting a whole audience is limited to your own
+        return paginated_response(self, follows, exportable=str(request.user.pk) == user_id)
     
     @action(detail=False, methods=['get'])
     def following(self, request):
-        """Get users that a user is following"""
+        """Get users that a user is following (paginated; ?export=json for your own)"""
         user_id = request.query_params.get('user_id')
         if not user_id:
             return Response(
@@ -1000,8 +974,7 @@ class FollowViewSet(viewsets.ModelViewSet):
             )
         
         follows = self.get_queryset().filter(follower_id=user_id)
-        serializer = self.get_serializer(follows, many=True)
-        return Response(serializer.data)
+        return paginated_response(self, follows, exportable=str(request.user.pk) == user_id)
 
 
 class NotificationViewSet(viewsets.ModelViewSet):
@@ -1011,33 +984,56 @@ class NotificationViewSet(viewsets.ModelViewSet):
     List: GET /api/notifications/
     Mark Read: POST /api/notifications/{id}/mark_read/
     Mark All Read: POST /api/notifications/mark_all_read/
+    Unread Count: GET /api/notifications/unread-count/
+
+    Cursor paginated on (created_at, id); ?pagination=legacy for page numbers.
     """
     serializer_class = NotificationSerializer
+    pagination_class = KeysetPagination
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
         """Return notifications for the current user, ordered by newest first"""
         return Notification.objects.filter(
             recipient=self.request.user
-        ).select_related('actor', 'recipient')
+        ).select_related('actor', 'recipient', 'content_type')
     
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
         """Mark a single notification as read"""
-        notification = self.get_object()
-        notification.is_read = True
-        notification.save()
+        from .unread import mark_notification_read
+        mark_notification_read(self.get_object())
         return Response({'status': 'marked as read'})
     
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
         """Mark all notifications as read for the current user"""
-        count = self.get_queryset().filter(is_read=False).update(is_read=True)
+        from .unread import reset_notifications
+        count = reset_notifications(request.user)
         return Response({
             'status': 'all marked as read',
             'count': count
         })
 
+    @action(detail=False, methods=['get'], url_path='unread-count')
+    def unread_count(self, request):
+        """Unread notification and DAP event counts, read from the stored counters (cheap to poll)"""
+        # Read fresh: request.user may come from the auth cache (users.authentication)
+        counts = User.objects.filter(pk=request.user.pk).values(
+            'unread_notification_count', 'unread_dap_event_count'
+        ).get()
+        return Response({
+            'notifications': max(counts['unread_notification_count'], 0),
+            'dap_events': max(counts['unread_dap_event_count'], 0),
+        })
+
+    def perform_update(self, serializer):
+        from .unread import NOTIFICATIONS, bump
+        was_read = serializer.instance.is_read
+        notification = serializer.save()
+        if notification.is_read != was_read:
+            bump(notification.recipient_id, NOTIFICATIONS, -1 if notification.is_read else 1)
+
 
 class RTMPDestinationViewSet(viewsets.ModelViewSet):
     """
@@ -1165,6 +1161,7 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
         x402-gated: triggers wallet payment, then upgrades subscription.
         """
         from payments.decorators import x402_required
+        from payments.pricing import convert
         from django.conf import settings
         from payments.models import PaymentReceipt
 
@@ -1181,13 +1178,12 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
             return getattr(settings, 'PLATFORM_WALLET_ADDRESS', 'SP...')
 
         def get_amounts(req, **kw):
-            # Convert to micro-units (STX, USDCx, sBTC)
-            # sBTC: 1 USDCx ≈ 0.0000015 BTC → in satoshis (×100_000_000)
-            sbtc_per_usdcx = 0.0000015
+            # Convert to micro-units (STX, USDCx, sBTC); sBTC at the cached oracle rate
+            amount_usdcx = int(prices['usdcx'] * 1_000_000)
             return (
                 int(prices['stx'] * 1_000_000),
-                int(prices['usdcx'] * 1_000_000),
-                int(prices['usdcx'] * sbtc_per_usdcx * 100_000_000),
+                amount_usdcx,
+                convert(amount_usdcx, 'USDCX', 'SBTC'),
             )
 
         @x402_required(get_pay_to, get_amounts, description=f"Upgrade to {target_plan.title()} Plan")
@@ -1247,6 +1243,7 @@ class TipViewSet(viewsets.ViewSet):
         })
 
     @action(detail=True, methods=['post'], url_path='send')
+    @idempotent()
     def send(self, request, pk=None):
         """POST /api/tips/<creator_id>/send/ — x402-gated tip."""
         from payments.decorators import x402_required
@@ -16,7 +16,6 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from .serializers import (
     WalletNonceRequestSerializer,
@@ -24,6 +23,7 @@ from .serializers import (
     WalletUserSerializer
 )
 from .crypto_utils import verify_stacks_signature
+from .authentication import UserRefreshToken
 
 User = get_user_model()
 
@@ -191,7 +191,7 @@ class WalletAuthViewSet(viewsets.ViewSet):
         user.is_new = created
         
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         
         # Serialize user data
         user_serializer = WalletUserSerializer(user)